@@ -0,0 +1,70 @@
+"""Speed of registering a large generated library of autonomous functions.
+
+Registers a chain of functions one by one (decorating each function
+and running its runtime checks), and with pth.register_many()
+using 1 process and all CPUs. Caches are cleared before each run.
+Also reports the speedup of normalization and analysis alone,
+which is the part register_many() spreads over processes.
+
+    python benchmarks/bench_bulk_registration.py [n_functions]
+"""
+
+import os
+import sys
+import time
+
+import pythagoras as pth
+import pythagoras._03_autonomous_functions.names_usage_analyzer as analyzer
+from pythagoras._02_ordinary_functions import code_normalizer_implementation
+from pythagoras._02_ordinary_functions.normalized_source_cache import (
+    clear_normalized_source_cache)
+from pythagoras._04_idempotent_functions.bulk_registration import (
+    normalize_and_analyze, warm_up_caches)
+
+
+def build_library(n: int) -> list[str]:
+    sources = ["def f_0(x):\n    return x + 1\n"]
+    for i in range(1, n):
+        sources.append(f"def f_{i}(x):\n    y = x * 2\n"
+            + f"    for k in range(3):\n        y += k\n"
+            + f"    return f_{i-1}(x=y) + 1\n")
+    return sources
+
+
+def one_by_one(sources: list[str]) -> None:
+    functions = [pth.autonomous()(s) for s in sources]
+    for f in functions:
+        f.perform_runtime_checks()
+
+
+def measure(register, sources: list[str]) -> float:
+    clear_normalized_source_cache()
+    analyzer._names_analysis_cache.clear()
+    pth.default_island_name = "Samos"
+    pth.all_autonomous_functions = {"Samos": dict()}
+    start = time.time()
+    register(sources)
+    return time.time() - start
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    n_cpus = os.cpu_count() or 1
+    sources = build_library(n)
+    serial = measure(one_by_one, sources)
+    bulk = measure(lambda s: pth.register_many(s, n_processes=1), sources)
+    parallel = measure(
+        lambda s: pth.register_many(s, n_processes=n_cpus), sources)
+    mode = code_normalizer_implementation.normalization_mode
+    analysis_serial = measure(lambda s: normalize_and_analyze(s, mode), sources)
+    analysis_parallel = measure(
+        lambda s: warm_up_caches(s, n_processes=n_cpus), sources)
+    print(f"{n} functions, {n_cpus} CPUs")
+    print(f"one by one:                  {serial:.2f} s")
+    print(f"register_many, 1 process:    {bulk:.2f} s")
+    print(f"register_many, {n_cpus} processes: {parallel:.2f} s"
+        + f" (speedup {serial / parallel:.1f}x)")
+    print(f"normalization and analysis, 1 process:    {analysis_serial:.2f} s")
+    print(f"normalization and analysis, {n_cpus} processes:"
+        + f" {analysis_parallel:.2f} s"
+        + f" (speedup {analysis_serial / analysis_parallel:.1f}x)")
@@ -0,0 +1,61 @@
+"""Per-call overhead of autonomous and ordinary functions.
+
+For autonomous functions, runs fibonacci-style recursion, where every
+recursive call goes through the Pythagoras wrapper. For ordinary functions,
+calls a trivial function many times. Reports the average time per call.
+
+    python benchmarks/bench_function_call_overhead.py [N]
+"""
+
+import sys
+import tempfile
+import time
+
+import pythagoras as pth
+from pythagoras._07_mission_control.global_state_management import initialize
+
+
+def fibonacci(n: int) -> int:
+    if n in [0, 1]:
+        return n
+    else:
+        return fibonacci(n=n-1) + fibonacci(n=n-2)
+
+
+def increment(x: int) -> int:
+    return x + 1
+
+
+def count_fibonacci_calls(n: int) -> int:
+    if n in [0, 1]:
+        return 1
+    return 1 + count_fibonacci_calls(n-1) + count_fibonacci_calls(n-2)
+
+
+def measure_autonomous(n: int) -> float:
+    global fibonacci
+    plain_fibonacci = fibonacci
+    with tempfile.TemporaryDirectory() as base_dir:
+        with initialize(base_dir=base_dir, n_background_workers=0):
+            fibonacci = pth.autonomous()(plain_fibonacci)
+            start = time.time()
+            fibonacci(n=n)
+            duration = time.time() - start
+    fibonacci = plain_fibonacci
+    return duration / count_fibonacci_calls(n)
+
+
+def measure_ordinary(n_calls: int) -> float:
+    ordinary_increment = pth.ordinary()(increment)
+    start = time.time()
+    for i in range(n_calls):
+        ordinary_increment(x=i)
+    return (time.time() - start) / n_calls
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    n_calls = count_fibonacci_calls(n)
+    print(f"ordinary:   {measure_ordinary(n_calls) * 1e6:.1f} us per call")
+    print(f"autonomous: {measure_autonomous(n) * 1e6:.1f} us per call"
+        + f" ({n_calls} calls in fibonacci(n={n}))")
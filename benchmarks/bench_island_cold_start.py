@@ -0,0 +1,69 @@
+"""Cold-start time of a worker that deserializes an idempotent function.
+
+An island of N autonomous functions (a call chain) is created, and the
+idempotent function at the top of the chain is pickled. Fresh processes
+then recreate the island, either from augmented source code (the way it
+was done before island modules), or from the island module
+(first process generates it, later ones import cached bytecode).
+
+    python benchmarks/bench_island_cold_start.py [N]
+"""
+
+import pickle
+import sys
+import tempfile
+import time
+from multiprocessing import get_context
+
+import pythagoras as pth
+from pythagoras._07_mission_control.global_state_management import initialize
+
+
+def build_chain_sources(n: int) -> list[str]:
+    sources = ["def f_0(x):\n    return x + 1\n"]
+    for i in range(1, n):
+        sources.append(f"def f_{i}(x):\n    return f_{i-1}(x=x) + 1\n")
+    return sources
+
+
+def cold_start(base_dir, pickled_data, from_source, queue):
+    from pythagoras._04_idempotent_functions.process_augmented_func_src import (
+        process_augmented_func_src)
+    with initialize(base_dir=base_dir, n_background_workers=0):
+        start = time.time()
+        if from_source:
+            process_augmented_func_src(
+                pickle.loads(pickled_data)["augmented_fn_source_code"])
+        else:
+            pickle.loads(pickled_data)
+        queue.put(time.time() - start)
+
+
+def measure(base_dir, pickled_data, from_source):
+    ctx = get_context("spawn")
+    queue = ctx.Queue()
+    p = ctx.Process(target=cold_start
+        , args=(base_dir, pickled_data, from_source, queue))
+    p.start()
+    duration = queue.get()
+    p.join()
+    return duration
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with tempfile.TemporaryDirectory() as base_dir:
+        with initialize(base_dir=base_dir, n_background_workers=0):
+            sources = build_chain_sources(n)
+            for source in sources[:-1]:
+                pth.autonomous()(source)
+            top_fn = pth.idempotent()(sources[-1])
+            pickled_fn = pickle.dumps(top_fn)
+            pickled_state = pickle.dumps(top_fn.__getstate__())
+        from_source = measure(base_dir, pickled_state, True)
+        first = measure(base_dir, pickled_fn, False)
+        cached = measure(base_dir, pickled_fn, False)
+    print(f"island of {n} functions")
+    print(f"from augmented source:      {from_source:.3f} s")
+    print(f"island module, first worker: {first:.3f} s")
+    print(f"island module, cached:       {cached:.3f} s")
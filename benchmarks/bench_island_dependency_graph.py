@@ -0,0 +1,91 @@
+"""Scaling of transitive dependency computation for islands.
+
+Synthetic islands (chain, diamond and loop shapes, like in the call-graph
+tests) are built from direct references, and dependencies of all functions
+are computed with IslandDependencyGraph. For smaller islands, the naive
+fixed-point closure (used before) is measured as well.
+
+    python benchmarks/bench_island_dependency_graph.py [N]
+"""
+
+import sys
+import time
+
+from pythagoras._03_autonomous_functions.island_dependency_graph import (
+    IslandDependencyGraph)
+
+NAIVE_CLOSURE_MAX_SIZE = 2000
+
+
+def build_chain(n: int) -> dict[str, set[str]]:
+    """f_i calls f_{i-1}."""
+    return {f"f_{i}": ({f"f_{i-1}"} if i else set()) for i in range(n)}
+
+
+def build_diamonds(n: int) -> dict[str, set[str]]:
+    """Stacked diamonds: f_i calls two functions of the previous level."""
+    references = dict()
+    for i in range(n):
+        level, position = divmod(i, 2)
+        if level == 0:
+            references[f"f_{i}"] = set()
+        else:
+            previous = 2 * (level - 1)
+            references[f"f_{i}"] = {f"f_{previous}", f"f_{previous + 1}"}
+    return references
+
+
+def build_loop(n: int) -> dict[str, set[str]]:
+    """A chain, closed into a single cycle."""
+    references = build_chain(n)
+    references["f_0"] = {f"f_{n-1}"}
+    return references
+
+
+def naive_closure(references: dict[str, set[str]]) -> dict[str, set[str]]:
+    result = {name: {name} | refs for name, refs in references.items()}
+    for name in result:
+        dependencies_old = result[name]
+        while True:
+            dependencies_new = set(dependencies_old)
+            for referenced_name in dependencies_old:
+                dependencies_new |= result[referenced_name]
+            if len(dependencies_new) == len(dependencies_old):
+                break
+            dependencies_old = dependencies_new
+        result[name] = dependencies_new
+    return result
+
+
+def measure_graph(references: dict[str, set[str]]
+        , callers_first: bool = False) -> float:
+    names = list(references)
+    if callers_first:
+        names.reverse()
+    start = time.time()
+    graph = IslandDependencyGraph()
+    for name in names:
+        graph.add_function(name, references[name])
+    for name in names:
+        graph.get_dependencies(name)
+    return time.time() - start
+
+
+def measure_naive(references: dict[str, set[str]]) -> float:
+    start = time.time()
+    naive_closure(references)
+    return time.time() - start
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    for shape, builder in [("chain", build_chain)
+            , ("diamond", build_diamonds), ("loop", build_loop)]:
+        references = builder(n)
+        print(f"{shape}, {n} functions:"
+            + f" callees first {measure_graph(references):.2f} s,"
+            + f" callers first {measure_graph(references, True):.2f} s")
+        small_references = builder(NAIVE_CLOSURE_MAX_SIZE)
+        print(f"{shape}, {NAIVE_CLOSURE_MAX_SIZE} functions:"
+            + f" graph {measure_graph(small_references):.2f} s,"
+            + f" naive closure {measure_naive(small_references):.2f} s")
@@ -0,0 +1,61 @@
+"""Speed of function source normalization: autopep8-based vs AST-only.
+
+Normalizes top-level functions, found in Pythagoras' own modules
+(skipping the ones the normalizer does not support), in both modes (with the normalized source cache cleared),
+and reports the average time per function.
+
+    python benchmarks/bench_source_normalization.py
+"""
+
+import ast
+import os
+import time
+
+import pythagoras as pth
+from pythagoras._02_ordinary_functions.code_normalizer_implementation import (
+    __get_normalized_function_source__, set_normalization_mode)
+from pythagoras._02_ordinary_functions.normalized_source_cache import (
+    clear_normalized_source_cache)
+
+
+def collect_function_sources() -> list[str]:
+    package_dir = os.path.dirname(pth.__file__)
+    sources = []
+    for dir_path, _, file_names in os.walk(package_dir):
+        for file_name in sorted(file_names):
+            if not file_name.endswith(".py"):
+                continue
+            with open(os.path.join(dir_path, file_name)) as f:
+                module_source = f.read()
+            for node in ast.parse(module_source).body:
+                if isinstance(node, ast.FunctionDef) and not node.decorator_list:
+                    sources.append(ast.get_source_segment(module_source, node))
+    supported_sources = []
+    for source in sources:
+        try:
+            __get_normalized_function_source__(source)
+            supported_sources.append(source)
+        except Exception:
+            pass
+    return supported_sources
+
+
+def measure(mode: str, sources: list[str]) -> float:
+    set_normalization_mode(mode)
+    clear_normalized_source_cache()
+    start = time.time()
+    for source in sources:
+        __get_normalized_function_source__(source)
+    duration = (time.time() - start) / len(sources)
+    set_normalization_mode()
+    return duration
+
+
+if __name__ == "__main__":
+    sources = collect_function_sources()
+    compatible = measure("compatible", sources)
+    ast_only = measure("ast", sources)
+    print(f"{len(sources)} functions")
+    print(f"compatible (autopep8): {compatible * 1000:.2f} ms per function")
+    print(f"ast:                   {ast_only * 1000:.2f} ms per function")
+    print(f"speedup: {compatible / ast_only:.0f}x")
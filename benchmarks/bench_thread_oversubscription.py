@@ -0,0 +1,61 @@
+"""Effect of per-worker thread limits on a matrix-heavy sweep.
+
+Mimics background workers: each supervising process applies a CPU policy
+(or not), then spawns a subprocess that multiplies matrices.
+All workers run concurrently; the total wall-clock time is reported.
+
+    python benchmarks/bench_thread_oversubscription.py [N_WORKERS] [--pin]
+"""
+
+import sys
+import time
+from multiprocessing import get_context
+
+MATRIX_SIZE = 1000
+N_MULTIPLICATIONS = 20
+
+
+def multiply_matrices():
+    import numpy as np
+    rng = np.random.default_rng(42)
+    a = rng.random((MATRIX_SIZE, MATRIX_SIZE))
+    for _ in range(N_MULTIPLICATIONS):
+        a = a @ a
+        a /= np.abs(a).max()
+
+
+def supervisor(cpu_policy):
+    from pythagoras._06_swarming.cpu_allocation import apply_cpu_policy
+    if cpu_policy is not None:
+        apply_cpu_policy(**cpu_policy)
+    p = get_context("spawn").Process(target=multiply_matrices)
+    p.start()
+    p.join()
+
+
+def run_sweep(n_workers, cpu_policies):
+    ctx = get_context("spawn")
+    processes = [ctx.Process(target=supervisor, args=(cpu_policy,))
+        for cpu_policy in cpu_policies]
+    start = time.time()
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+    return time.time() - start
+
+
+if __name__ == "__main__":
+    from pythagoras._06_swarming.cpu_allocation import (
+        build_worker_cpu_policies, get_available_cpus)
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    n_cpus = len(get_available_cpus())
+    n_workers = int(args[0]) if args else max(2, n_cpus)
+    pin = "--pin" in sys.argv
+
+    unlimited = run_sweep(n_workers, [None] * n_workers)
+    limited = run_sweep(n_workers, build_worker_cpu_policies(n_workers, pin))
+    print(f"CPUs: {n_cpus}, workers: {n_workers}, pinned: {pin}")
+    print(f"no thread limits:   {unlimited:.2f} s")
+    print(f"with thread limits: {limited:.2f} s")
+    print(f"speedup: {unlimited / limited:.2f}x")
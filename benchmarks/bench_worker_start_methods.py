@@ -0,0 +1,39 @@
+"""Startup latency of worker subprocesses under different start methods.
+
+Each started process imports Pythagoras (as worker processes do),
+then exits. The average time from start() to join() is reported.
+
+    python benchmarks/bench_worker_start_methods.py [N_PROCESSES]
+"""
+
+import sys
+import time
+
+
+def import_pythagoras():
+    import pythagoras
+
+
+def measure_startup(start_method, n_processes):
+    from pythagoras._06_swarming.start_methods import (
+        set_worker_start_method, get_worker_context)
+    set_worker_start_method(start_method)
+    ctx = get_worker_context()
+    warmup = ctx.Process(target=import_pythagoras)
+    warmup.start() # for forkserver, also starts the server
+    warmup.join()
+    start = time.time()
+    for _ in range(n_processes):
+        p = ctx.Process(target=import_pythagoras)
+        p.start()
+        p.join()
+    return (time.time() - start) / n_processes
+
+
+if __name__ == "__main__":
+    n_processes = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    spawn = measure_startup("spawn", n_processes)
+    forkserver = measure_startup("forkserver", n_processes)
+    print(f"spawn:      {spawn * 1000:.0f} ms per process")
+    print(f"forkserver: {forkserver * 1000:.0f} ms per process")
+    print(f"speedup: {spawn / forkserver:.1f}x")
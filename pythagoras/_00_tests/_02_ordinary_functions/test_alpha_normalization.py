@@ -0,0 +1,119 @@
+from pythagoras._02_ordinary_functions.code_normalizer_implementation import (
+    __get_normalized_function_source__, set_normalization_mode)
+
+
+def get_alpha_normalized_source(a_func) -> str:
+    try:
+        set_normalization_mode("alpha")
+        return __get_normalized_function_source__(a_func)
+    finally:
+        set_normalization_mode()
+
+
+def f_original(x, n):
+    import os
+    import math
+    total = 0
+    for i in range(n):
+        total += x * i
+    return total + math.floor(len(os.sep))
+
+def f_renamed(x, n):
+    import math
+    import os
+    result = 0
+    for j in range(n):
+        result += x * j
+    return result + math.floor(len(os.sep))
+
+def f_different(x, n):
+    import math
+    import os
+    result = 0
+    for j in range(n):
+        result += x + j
+    return result + math.floor(len(os.sep))
+
+
+def test_alpha_equivalent_functions():
+    original = get_alpha_normalized_source(f_original)
+    renamed = get_alpha_normalized_source(f_renamed).replace(
+        "f_renamed", "f_original")
+    different = get_alpha_normalized_source(f_different).replace(
+        "f_different", "f_original")
+    assert original == renamed
+    assert original != different
+    assert get_alpha_normalized_source(original) == original
+    namespace = dict()
+    exec(original, namespace)
+    assert namespace["f_original"](x=2, n=3) == f_original(x=2, n=3)
+
+
+def f_with_class(n):
+    class Box:
+        size = n
+    value = Box.size
+    return value
+
+def f_with_locals(n):
+    value = n
+    return locals()["value"]
+
+
+def test_alpha_normalization_is_conservative():
+    with_class = get_alpha_normalized_source(f_with_class)
+    assert "size = n" in with_class
+    assert "v0 = Box.size" in with_class
+    with_locals = get_alpha_normalized_source(f_with_locals)
+    assert "value = n" in with_locals
+
+
+def f_with_shadowing_imports(items):
+    from shlex import join
+    from os.path import join
+    return join(*items)
+
+def f_with_sortable_imports(items):
+    from os.path import join
+    from os import sep
+    return join(*items) + sep
+
+
+def test_imports_binding_same_name_are_not_reordered():
+    shadowing = get_alpha_normalized_source(f_with_shadowing_imports)
+    assert shadowing.index("shlex") < shadowing.index("os.path")
+    namespace = dict()
+    exec(shadowing, namespace)
+    assert namespace["f_with_shadowing_imports"](items=["a", "b"]) == (
+        f_with_shadowing_imports(items=["a", "b"]))
+    sortable = get_alpha_normalized_source(f_with_sortable_imports)
+    assert sortable.index("from os import") < sortable.index("os.path")
+
+
+def x(a):
+    return a
+
+def f_with_comprehension(a):
+    s = [x for x in a]
+    return s + [x(a=1)]
+
+def f_with_nested_comprehensions(a):
+    total = 0
+    pairs = [(total, x) for x in a for total in range(x)]
+    return pairs, {x: total for x in a}, total
+
+
+def test_comprehension_targets_are_not_renamed():
+    with_comprehension = get_alpha_normalized_source(f_with_comprehension)
+    assert "[x for x in a]" in with_comprehension
+    assert "x(a=1)" in with_comprehension
+    namespace = dict(x=x)
+    exec(with_comprehension, namespace)
+    assert namespace["f_with_comprehension"](a=[1]) == (
+        f_with_comprehension(a=[1]))
+    nested = get_alpha_normalized_source(f_with_nested_comprehensions)
+    assert "[(total, x) for x in a for total in range(x)]" in nested
+    namespace = dict()
+    exec(nested, namespace)
+    assert namespace["f_with_nested_comprehensions"](a=[1, 2]) == (
+        f_with_nested_comprehensions(a=[1, 2]))
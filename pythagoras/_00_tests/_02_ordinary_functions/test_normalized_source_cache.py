@@ -0,0 +1,56 @@
+import pytest
+
+from pythagoras._02_ordinary_functions.code_normalizer_implementation import (
+    __get_normalized_function_source__, set_normalization_mode)
+from pythagoras._02_ordinary_functions.normalized_source_cache import (
+    get_normalized_source_cache_stats, clear_normalized_source_cache
+    , _get_persistent_key, NORMALIZER_VERSION)
+
+
+def sample_function(a:int, b:int) -> int:
+    """A docstring."""
+    # a comment
+    return a+b
+
+
+def test_normalized_source_cache():
+    clear_normalized_source_cache()
+    first = __get_normalized_function_source__(sample_function)
+    stats = get_normalized_source_cache_stats()
+    assert stats["n_lookups"] == 1
+    assert stats["hit_rate"] == 0
+
+    assert __get_normalized_function_source__(sample_function) == first
+    assert __get_normalized_function_source__(first) == first
+    stats = get_normalized_source_cache_stats()
+    assert stats["n_lookups"] == 3
+    assert stats["n_memory_hits"] == 2
+    assert stats["hit_rate"] == 2/3
+
+    clear_normalized_source_cache()
+    assert get_normalized_source_cache_stats()["n_lookups"] == 0
+    assert __get_normalized_function_source__(sample_function) == first
+
+
+def test_ast_normalization_mode():
+    compatible = __get_normalized_function_source__(sample_function)
+    try:
+        set_normalization_mode("ast")
+        ast_source = __get_normalized_function_source__(sample_function)
+        assert ast_source == "def sample_function(a, b):\n    return a + b\n"
+        assert __get_normalized_function_source__(ast_source) == ast_source
+    finally:
+        set_normalization_mode()
+    assert __get_normalized_function_source__(sample_function) == compatible
+    with pytest.raises(AssertionError):
+        set_normalization_mode("black")
+
+
+def test_persistent_keys_include_normalizer_version():
+    source = "def f(x):\n    return x\n"
+    for mode in ["compatible", "ast", "alpha"]:
+        key = _get_persistent_key(source, False, mode)
+        assert key[1].startswith(f"v{NORMALIZER_VERSION}")
+        assert key[2] == mode
+    assert "autopep8" in _get_persistent_key(source, False, "compatible")[1]
+    assert "autopep8" not in _get_persistent_key(source, False, "ast")[1]
@@ -17,3 +17,20 @@ def test_ordinary_function_with_recursion():
     f = OrdinaryFn(fibonacci)
     result = f(n=6)
     assert result == 8
+
+def test_ordinary_function_is_compiled_once():
+    f = OrdinaryFn(simple_function)
+    g = OrdinaryFn(simple_function)
+    assert f.compiled_fn is g.compiled_fn
+    assert f(a=2,b=3) == 5
+    assert f.compiled_fn is g.compiled_fn
+
+
+def appends_to_default(x, acc=[]):
+    acc.append(x)
+    return len(acc)
+
+def test_ordinary_function_calls_are_isolated():
+    f = OrdinaryFn(appends_to_default)
+    assert f(x=1) == 1
+    assert f(x=2) == 1
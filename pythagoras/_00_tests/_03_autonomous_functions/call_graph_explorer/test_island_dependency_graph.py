@@ -0,0 +1,38 @@
+from pythagoras._03_autonomous_functions.island_dependency_graph import (
+    IslandDependencyGraph)
+
+
+def test_incremental_chain():
+    graph = IslandDependencyGraph()
+    graph.add_function("a", {"a", "print"})
+    graph.add_function("b", {"b", "a"})
+    graph.add_function("c", {"c", "b"})
+    assert not graph.closures_are_stale
+    assert graph.get_dependencies("a") == {"a"}
+    assert graph.get_dependencies("c") == {"a", "b", "c"}
+
+
+def test_callers_before_callees():
+    graph = IslandDependencyGraph()
+    graph.add_function("c", {"c", "b"})
+    graph.add_function("b", {"b", "a"})
+    assert graph.closures_are_stale
+    assert graph.get_dependencies("c") == {"b", "c"}
+    graph.add_function("a", {"a"})
+    assert graph.get_dependencies("c") == {"a", "b", "c"}
+    assert graph.get_dependencies("a") == {"a"}
+
+
+def test_loops():
+    graph = IslandDependencyGraph()
+    graph.add_function("a", {"a", "d"})
+    graph.add_function("b", {"b", "a"})
+    graph.add_function("c", {"c", "a"})
+    graph.add_function("d", {"d", "b", "c"})
+    graph.add_function("e", {"e", "d"})
+    graph.add_function("x", {"x", "y"})
+    graph.add_function("y", {"y", "x"})
+    for name in "abcd":
+        assert graph.get_dependencies(name) == {"a", "b", "c", "d"}
+    assert graph.get_dependencies("e") == {"a", "b", "c", "d", "e"}
+    assert graph.get_dependencies("x") == {"x", "y"}
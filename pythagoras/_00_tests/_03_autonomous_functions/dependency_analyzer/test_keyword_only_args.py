@@ -0,0 +1,11 @@
+from pythagoras._03_autonomous_functions.names_usage_analyzer import *
+
+
+def keyword_only_args(x, /, y, *args, z=1, **kwargs):
+    return x + y + z
+
+def test_keyword_only_args():
+    assert keyword_only_args(1, 2) == 4
+    analyzer = analyze_names_in_function(keyword_only_args)["analyzer"]
+    assert analyzer.names.local == {"x", "y", "args", "z", "kwargs"}
+    assert analyzer.names.unclassified_deep == set()
@@ -0,0 +1,25 @@
+import ast
+
+from pythagoras._03_autonomous_functions.names_usage_analyzer import (
+    analyze_names_in_function)
+
+
+def sample_function(x):
+    import math
+    try:
+        y = math.sqrt(x)
+    except:
+        y = None
+    return helper(y=y)
+
+
+def test_names_analysis_cache():
+    first = analyze_names_in_function(sample_function)
+    first["analyzer"].names.unclassified_deep -= {"helper"}
+    second = analyze_names_in_function(sample_function)
+    assert second["analyzer"] is not first["analyzer"]
+    assert "helper" in second["analyzer"].names.unclassified_deep
+    assert second["analyzer"].names.imported == {"math"}
+    assert second["analyzer"].names.function == "sample_function"
+    assert second["normalized_source"] == first["normalized_source"]
+    assert isinstance(second["tree"], ast.Module)
@@ -0,0 +1,47 @@
+from pythagoras._03_autonomous_functions.autonomous_decorators import autonomous
+from pythagoras._07_mission_control.global_state_management import (
+    _force_initialize)
+
+import pythagoras as pth
+
+
+def fibonacci(n: int) -> int:
+    if n in [0, 1]:
+        return n
+    else:
+        return fibonacci(n=n-1) + fibonacci(n=n-2)
+
+def test_aut_compiled_fn(tmpdir):
+    with _force_initialize(base_dir=tmpdir,n_background_workers=0):
+        global fibonacci
+        fibonacci = autonomous()(fibonacci)
+        compiled_fn = fibonacci.compiled_fn
+        assert compiled_fn.__globals__["fibonacci"] is fibonacci
+        assert fibonacci(n=10) == 55
+        assert fibonacci.compiled_fn is compiled_fn
+        island = pth.all_autonomous_functions[fibonacci.island_name]
+        assert island[fibonacci.fn_name]._compiled_fn is compiled_fn
+
+
+def appends_to_default(x, acc=[]):
+    acc.append(x)
+    return len(acc)
+
+
+def test_calls_of_compiled_fn_are_isolated(tmpdir):
+    with _force_initialize(base_dir=tmpdir,n_background_workers=0):
+        f = autonomous()(appends_to_default)
+        assert f(x=1) == 1
+        assert f(x=2) == 1
+        assert f.compiled_fn.__defaults__ == ([],)
+
+
+def with_literal_defaults(x, n=-1, names=("a", "b"), *, flag=None):
+    return (x, n, names, flag)
+
+
+def test_keyword_only_arguments(tmpdir):
+    with _force_initialize(base_dir=tmpdir,n_background_workers=0):
+        f = autonomous()(with_literal_defaults)
+        assert f(x=1) == (1, -1, ("a", "b"), None)
+        assert f(x=2, flag=True) == (2, -1, ("a", "b"), True)
@@ -0,0 +1,43 @@
+from pythagoras._03_autonomous_functions.function_registry import (
+    lookup_registered_function)
+from pythagoras._07_mission_control.global_state_management import (
+    _force_initialize, _clean_global_state)
+import pythagoras as pth
+
+
+def increment(x):
+    return x + 1
+
+def double_increment(x):
+    return increment(x=increment(x=x))
+
+
+def test_function_registry(tmpdir):
+    with _force_initialize(tmpdir, n_background_workers=0):
+        pth.autonomous()(increment)
+        f = pth.idempotent()(double_increment)
+        assert f(x=1) == 3
+        registered = lookup_registered_function(f)
+        assert registered["static_checks_passed"]
+        assert registered["runtime_checks_passed"]
+        assert sorted(registered["dependencies"]) == [
+            "double_increment", "increment"]
+        assert registered["augmented_source_code"] == (
+            f.augmented_fn_source_code)
+        assert registered["fn_address"] == list(f.address.str_chain)
+
+    with _force_initialize(tmpdir, n_background_workers=0):
+        pth.autonomous()(increment)
+        f = pth.idempotent()(double_increment)
+        assert f.perform_runtime_checks()
+        assert f.dependencies == ["double_increment", "increment"]
+        assert f.address.str_chain == tuple(registered["fn_address"])
+        assert f(x=2) == 4
+
+    with _force_initialize(tmpdir, n_background_workers=0):
+        pth.autonomous()("def increment(x):\n    return x + 2\n")
+        f = pth.idempotent()(double_increment)
+        assert f(x=1) == 5
+        assert "x + 2" in f.augmented_fn_source_code
+        assert list(f.address.str_chain) != registered["fn_address"]
+    _clean_global_state()
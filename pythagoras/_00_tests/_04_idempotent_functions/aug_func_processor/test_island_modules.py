@@ -0,0 +1,84 @@
+import os
+import pickle
+import sys
+
+from pythagoras._04_idempotent_functions.island_modules import (
+    parse_augmented_source, build_island_module_source
+    , get_island_module_path, save_island_module, preload_island_modules)
+from pythagoras._07_mission_control.global_state_management import (
+    _clean_global_state, initialize)
+import pythagoras as pth
+
+augmented_src = """@pth.autonomous(island_name='Samos')
+def f_1(x):
+    return x + 1
+
+
+@pth.idempotent(
+\tisland_name='Samos')
+def f_2(x):
+    return f_1(x=x) * 2
+
+"""
+
+
+def test_parse_augmented_source():
+    functions = parse_augmented_source(augmented_src)
+    assert [f["fn_name"] for f in functions] == ["f_1", "f_2"]
+    assert functions[0]["decorator"] == "autonomous"
+    assert functions[1]["decorator_kwargs"] == dict(island_name="Samos")
+    assert functions[1]["fn_source_code"] == (
+        "def f_2(x):\n    return f_1(x=x) * 2\n")
+    assert functions[1]["dependencies"] == ["f_1", "f_2"]
+
+
+def test_build_island_module_source():
+    namespace = dict()
+    exec(build_island_module_source(augmented_src), namespace)
+    assert len(namespace["ISLAND_FUNCTIONS"]) == 2
+    assert namespace["_pth_tmp_f_1"](x=1) == 2
+
+
+def f_1(x):
+    return x + 1
+
+def f_2(x):
+    return f_1(x=x) * 2
+
+def test_island_module_roundtrip(tmpdir):
+    _clean_global_state()
+    initialize(tmpdir, n_background_workers=0)
+    pth.autonomous()(f_1)
+    data = pickle.dumps(pth.idempotent()(f_2))
+    pth.all_autonomous_functions = {pth.default_island_name: dict()}
+    new_f_2 = pickle.loads(data)
+    assert new_f_2(x=1) == 4
+    path = get_island_module_path(new_f_2.augmented_fn_source_code)
+    assert path.startswith(pth.base_dir)
+    _clean_global_state()
+
+
+def test_preloaded_island_module_is_reused(tmpdir):
+    _clean_global_state()
+    initialize(tmpdir, n_background_workers=0)
+    pth.autonomous()(f_1)
+    data = pickle.dumps(pth.idempotent()(f_2))
+    path = save_island_module(
+        pth.all_autonomous_functions[pth.default_island_name][
+            "f_2"].augmented_fn_source_code)
+    module_name = os.path.basename(path)[:-3]
+    try:
+        assert preload_island_modules(pth.base_dir) == [module_name]
+        preloaded_fn = sys.modules[module_name]._pth_tmp_f_1
+        pth.all_autonomous_functions = {pth.default_island_name: dict()}
+        new_f_2 = pickle.loads(data)
+        assert new_f_2(x=1) == 4
+        island = pth.all_autonomous_functions[pth.default_island_name]
+        assert island["f_1"]._compiled_fn is preloaded_fn
+    finally:
+        sys.modules.pop(module_name, None)
+        _clean_global_state()
+
+
+def test_preload_without_island_modules(tmpdir):
+    assert preload_island_modules(str(tmpdir)) == []
@@ -0,0 +1,94 @@
+import pickle
+
+from pythagoras._04_idempotent_functions.idempotent_func_address_context import (
+    _deserialized_functions, _get_deserialization_key)
+from pythagoras._07_mission_control.global_state_management import (
+    _force_initialize, _clean_global_state)
+import pythagoras as pth
+
+
+def increment(x):
+    return x + 1
+
+def double_increment(x):
+    return increment(x=increment(x=x))
+
+
+def test_deserialization_registry(tmpdir):
+    with _force_initialize(tmpdir, n_background_workers=0):
+        pth.autonomous()(increment)
+        data = pickle.dumps(pth.idempotent()(double_increment))
+        key = _get_deserialization_key(
+            pickle.loads(data).__getstate__())
+        assert key in _deserialized_functions
+        island = pth.all_autonomous_functions[pth.default_island_name]
+        assert _deserialized_functions[key] is island
+        f = pickle.loads(data)
+        assert f.augmented_code_checked
+        assert f(x=1) == 3
+
+    with _force_initialize(tmpdir, n_background_workers=0):
+        f = pickle.loads(data)
+        island = pth.all_autonomous_functions[pth.default_island_name]
+        assert _deserialized_functions[key] is island
+        assert "increment" in island
+        assert f(x=2) == 4
+    _clean_global_state()
+    assert len(_deserialized_functions) == 0
+
+
+def heavy_increment(x):
+    return x + 1
+
+def calls_heavy_increment(x):
+    return heavy_increment(x=x) * 2
+
+
+def test_resources_survive_deserialization(tmpdir):
+    with _force_initialize(tmpdir, n_background_workers=0):
+        heavy = pth.idempotent(n_cpu_cores=1, dag_mode=True)(heavy_increment)
+        assert "n_cpu_cores" not in heavy.decorator
+        assert "dag_mode" not in heavy.decorator
+        f = pth.idempotent(memory_gb=0.5, max_concurrency=2)(
+            calls_heavy_increment)
+        data = pickle.dumps(f)
+
+    with _force_initialize(tmpdir, n_background_workers=0):
+        f = pickle.loads(data)
+        assert f.resources.as_dict() == dict(memory_gb=0.5, max_concurrency=2)
+        island = pth.all_autonomous_functions[pth.default_island_name]
+        assert island["heavy_increment"].resources.as_dict() == dict(
+            n_cpu_cores=1)
+        assert island["heavy_increment"].dag_mode
+        assert f(x=1) == 4
+    _clean_global_state()
+
+
+def test_resources_do_not_change_addresses(tmpdir):
+    addresses = []
+    for i, resources in enumerate([dict(), dict(memory_gb=0.5)
+            , dict(memory_gb=2, max_concurrency=3, dag_mode=True)]):
+        with _force_initialize(tmpdir.mkdir(f"base_dir_{i}")
+                , n_background_workers=0):
+            f = pth.idempotent(**resources)(heavy_increment)
+            addresses.append(f.address)
+            assert f.address.get().resources.as_dict() == {
+                k: v for k, v in resources.items() if k != "dag_mode"}
+    assert addresses[0] == addresses[1] == addresses[2]
+    _clean_global_state()
+
+
+def test_states_without_scheduling_hints(tmpdir):
+    with _force_initialize(tmpdir, n_background_workers=0):
+        f = pth.idempotent()(heavy_increment)
+        state = f.__getstate__()
+        assert len(state) == 8
+        assert "scheduling_hints" not in state
+        data = pickle.dumps(f)
+
+    with _force_initialize(tmpdir, n_background_workers=0):
+        f = pickle.loads(data)
+        assert f.resources.is_empty
+        assert not f.dag_mode
+        assert f(x=1) == 2
+    _clean_global_state()
@@ -0,0 +1,43 @@
+import pytest
+from pythagoras._04_idempotent_functions.execution_resources import (
+    ExecutionResources)
+
+
+def test_empty_resources():
+    resources = ExecutionResources()
+    assert resources.is_empty
+    assert not resources.has_concurrency_limits
+    assert resources.fit_current_node()
+    assert resources.concurrency_allows(1000, 1000)
+    assert ExecutionResources.from_dict(None).is_empty
+    assert ExecutionResources.from_dict(True).is_empty
+
+
+def test_resources_round_trip():
+    resources = ExecutionResources(memory_gb=2, max_concurrency=3)
+    assert not resources.is_empty
+    assert resources.has_concurrency_limits
+    assert resources.as_dict() == dict(memory_gb=2, max_concurrency=3)
+    restored = ExecutionResources.from_dict(resources.as_dict())
+    assert restored.as_dict() == resources.as_dict()
+
+
+def test_resources_fit():
+    assert ExecutionResources(memory_gb=0.001).fit_current_node()
+    assert not ExecutionResources(memory_gb=10**9).fit_current_node()
+    assert not ExecutionResources(n_cpu_cores=10**6).fit_current_node()
+
+
+def test_concurrency_limits():
+    resources = ExecutionResources(
+        max_concurrency=4, max_concurrency_per_node=2)
+    assert resources.concurrency_allows(3, 1)
+    assert not resources.concurrency_allows(4, 1)
+    assert not resources.concurrency_allows(3, 2)
+
+
+def test_bad_resources():
+    with pytest.raises(AssertionError):
+        ExecutionResources(memory_gb=-1)
+    with pytest.raises(AssertionError):
+        ExecutionResources(max_concurrency=0)
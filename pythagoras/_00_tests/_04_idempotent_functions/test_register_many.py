@@ -0,0 +1,65 @@
+import pytest
+
+from pythagoras._02_ordinary_functions import code_normalizer_implementation
+from pythagoras._02_ordinary_functions.normalized_source_cache import (
+    lookup_normalized_source)
+from pythagoras._04_idempotent_functions.bulk_registration import (
+    warm_up_caches)
+from pythagoras._07_mission_control.global_state_management import (
+    _force_initialize, _clean_global_state)
+import pythagoras as pth
+
+
+def increment(x):
+    return x + 1
+
+def double_increment(x):
+    return increment(x=increment(x=x))
+
+def is_ok():
+    return True
+
+def checked_increment(x):
+    return increment(x=x)
+
+def uses_missing_function(x):
+    return missing_function(x=x)
+
+
+@pytest.mark.parametrize("n_processes", [1, 2])
+def test_register_many(tmpdir, n_processes):
+    with _force_initialize(tmpdir, n_background_workers=0):
+        functions = pth.register_many([
+            double_increment
+            , increment
+            , (pth.strictly_autonomous(), is_ok)
+            , "def triple_increment(x):\n    return increment(x=double_increment(x=x))\n"
+            ], n_processes=n_processes)
+        assert [f.fn_name for f in functions] == [
+            "double_increment", "increment", "is_ok", "triple_increment"]
+        island = pth.all_autonomous_functions[pth.default_island_name]
+        assert island["triple_increment"].dependencies == [
+            "double_increment", "increment", "triple_increment"]
+        assert functions[0](x=1) == 3
+        assert functions[3](x=1) == 4
+        f = pth.register_many(
+            [(pth.idempotent(validators=["is_ok"]), checked_increment)])[0]
+        assert f(x=2) == 3
+    _clean_global_state()
+
+
+def test_register_many_incomplete_island(tmpdir):
+    with _force_initialize(tmpdir, n_background_workers=0):
+        with pytest.raises(Exception):
+            pth.register_many([uses_missing_function])
+    _clean_global_state()
+
+
+def test_no_warm_up_in_one_process(tmpdir):
+    with _force_initialize(tmpdir, n_background_workers=0):
+        code = "def never_warmed_up(x):\n    return x + 41\n"
+        warm_up_caches([code], n_processes=1)
+        warm_up_caches([code])
+        mode = code_normalizer_implementation.normalization_mode
+        assert lookup_normalized_source(code, True, mode) is None
+    _clean_global_state()
@@ -0,0 +1,45 @@
+from pythagoras._06_swarming.autoscaler import (
+    decide_n_workers, get_autoscaling_delay, AUTOSCALING_PERIOD
+    , MAX_AUTOSCALING_BACKOFF)
+
+
+def decide(**kwargs):
+    params = dict(n_workers=2, min_n_workers=1, max_n_workers=16
+        , queue_depth=0, cpu_load=0.1, memory_load=0.3, cpu_count=16
+        , median_task_duration=None)
+    params.update(kwargs)
+    return decide_n_workers(**params)
+
+
+def test_empty_queue_shrinks_to_min():
+    assert decide(queue_depth=0) == 1
+    assert decide(n_workers=1, queue_depth=0) == 1
+
+
+def test_deep_queue_grows_at_most_twice():
+    assert decide(queue_depth=1000) == 4
+    assert decide(n_workers=12, queue_depth=1000) == 16
+    assert decide(n_workers=0, min_n_workers=0, queue_depth=5) == 1
+
+
+def test_short_tasks_do_not_need_more_workers():
+    assert decide(queue_depth=10, median_task_duration=0.01) == 2
+    assert decide(queue_depth=10, median_task_duration=60) == 4
+
+
+def test_overloaded_node_shrinks():
+    assert decide(n_workers=4, queue_depth=1000, cpu_load=1.5) == 3
+    assert decide(n_workers=4, queue_depth=1000, memory_load=0.95) == 3
+    assert decide(n_workers=4, queue_depth=1000, cpu_load=0.95) == 4
+
+
+def test_spare_cores_limit_growth():
+    assert decide(n_workers=8, queue_depth=1000
+        , cpu_load=0.8, cpu_count=16) == 9
+
+
+def test_failures_back_off_up_to_a_limit():
+    assert get_autoscaling_delay(0) == AUTOSCALING_PERIOD
+    assert get_autoscaling_delay(1) == 2 * AUTOSCALING_PERIOD
+    assert get_autoscaling_delay(2) == 4 * AUTOSCALING_PERIOD
+    assert get_autoscaling_delay(100) == MAX_AUTOSCALING_BACKOFF
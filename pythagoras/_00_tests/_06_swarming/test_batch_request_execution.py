@@ -0,0 +1,61 @@
+from copy import deepcopy
+from pythagoras._06_swarming.background_workers import (
+    process_random_execution_request, choose_batch_size, MAX_BATCH_SIZE)
+from pythagoras._04_idempotent_functions.idempotent_func_address_context import (
+    _claimed_execution_sessions)
+from pythagoras._07_mission_control.global_state_management import (
+    _clean_global_state, _force_initialize)
+import pythagoras as pth
+
+
+def test_choose_batch_size():
+    assert choose_batch_size(None) == 1
+    assert choose_batch_size(100.0) == 1
+    assert choose_batch_size(0.5) == 4
+    assert choose_batch_size(0.0001) == MAX_BATCH_SIZE
+    assert choose_batch_size(0) == MAX_BATCH_SIZE
+
+
+def test_batch_request_execution(tmpdir):
+
+    with pth.initialize(tmpdir, n_background_workers=0):
+
+        @pth.idempotent()
+        def f(n):
+            return 5*n
+
+        addresses = f.swarm_list([dict(n=i) for i in range(10)])
+
+        init_params = deepcopy(pth.initialization_parameters)
+        init_params["runtime_id"] = None
+
+    assert process_random_execution_request(init_params, max_batch_size=10)
+    assert len(_claimed_execution_sessions) == 0
+
+    for i, address in enumerate(addresses):
+        address._invalidate_cache()
+        assert address.ready
+        assert address.get() == 5*i
+        assert len(address.execution_attempts) == 1
+        assert not address.execution_requested
+    _clean_global_state()
+
+
+def test_unused_claims_are_released(tmpdir):
+    with _force_initialize(tmpdir, n_background_workers=0):
+
+        @pth.idempotent()
+        def g(n):
+            return n
+
+        address = g.swarm(n=1)
+        g(n=1)
+        pth.IdempotentFnExecutionContext.claim_execution_attempts([address])
+        assert g(n=1) == 1
+        assert tuple(address.str_chain) in _claimed_execution_sessions
+        pth.IdempotentFnExecutionContext.release_claimed_execution_attempts(
+            [address])
+        assert len(_claimed_execution_sessions) == 0
+        pth.IdempotentFnExecutionContext.claim_execution_attempts([address])
+    _clean_global_state()
+    assert len(_claimed_execution_sessions) == 0
@@ -0,0 +1,121 @@
+import os
+import stat
+import threading
+import time
+
+from pythagoras._06_swarming import coordinator
+from pythagoras._04_idempotent_functions.idempotent_decorator import idempotent
+from pythagoras._06_swarming.background_workers import (
+    find_addresses_needing_execution)
+from pythagoras._06_swarming.coordinator import (
+    CoordinatorState, CoordinatorServer, CoordinatorClient
+    , REGISTRATION_KEY, get_routable_host, reset_coordinator_discovery
+    , get_coordinator_authkey)
+from pythagoras._07_mission_control.global_state_management import (
+    _force_initialize)
+
+import pythagoras as pth
+
+
+def test_coordinator_state():
+    state = CoordinatorState()
+    assert state.submit([("f_Samos", "a"), ("f_Samos", "b")]) == 2
+    assert state.submit([("f_Samos", "a")]) == 0
+    assert state.get_pending() == [("f_Samos", "a"), ("f_Samos", "b")]
+    assert state.get_pending(1, offset=1) == [("f_Samos", "b")]
+    assert state.lease([("f_Samos", "a")], "w1") == [("f_Samos", "a")]
+    assert state.lease([("f_Samos", "a")], "w2") == []
+    assert state.get_pending() == [("f_Samos", "b")]
+    state.finish([("f_Samos", "a")])
+    assert state.wait_for_result(("f_Samos", "a"), 0.01)
+    assert not state.wait_for_result(("f_Samos", "b"), 0.01)
+    state.resync([("f_Samos", "c")])
+    assert state.get_pending() == [("f_Samos", "c")]
+    assert state.stats()["n_pending"] == 1
+
+
+def test_coordinator_wait_for_work():
+    state = CoordinatorState()
+    assert not state.wait_for_work(0.01)
+    threading.Timer(0.1, state.submit, args=([("g", "x")],)).start()
+    start = time.time()
+    assert state.wait_for_work(5)
+    assert time.time() - start < 2
+
+
+def test_coordinator_server(tmpdir):
+    for address in [os.path.join(str(tmpdir), "c.sock"), "127.0.0.1:0"]:
+        server = CoordinatorServer(address)
+        server.start()
+        client = CoordinatorClient(server.registration_record)
+        assert client.call("submit", [("f_Samos", "a")]) == 1
+        assert client.call("get_pending", None) == [("f_Samos", "a")]
+        threading.Timer(0.1, server.state.finish, args=([("f_Samos", "a")],)
+            ).start()
+        assert client.call("wait_for_result", ("f_Samos", "a"), 5)
+        assert client.call("stats")["n_pending"] == 0
+        client.close()
+        server.stop()
+
+
+def test_coordinator_advertised_address():
+    server = CoordinatorServer("0.0.0.0:0")
+    port = server.listener.address[1]
+    assert server.registration_record["address"] == [
+        get_routable_host(), port]
+    server.listener.close()
+
+    server = CoordinatorServer("0.0.0.0:0"
+        , advertise_address="pth-head.example.com")
+    port = server.listener.address[1]
+    assert server.registration_record["address"] == [
+        "pth-head.example.com", port]
+    server.listener.close()
+
+    server = CoordinatorServer("0.0.0.0:0"
+        , advertise_address="pth-head.example.com:7077")
+    assert server.registration_record["address"] == [
+        "pth-head.example.com", 7077]
+    server.listener.close()
+
+
+def huge(x):
+    return x
+
+
+def small(x):
+    return x
+
+
+def test_queue_scan_pages_through_coordinator(tmpdir):
+    global huge, small
+    with _force_initialize(tmpdir, n_background_workers=0):
+        huge = idempotent(n_cpu_cores=10**6)(huge)
+        small = idempotent()(small)
+        server = CoordinatorServer(os.path.join(str(tmpdir), "c.sock"))
+        server.start()
+        pth.compute_nodes.json[REGISTRATION_KEY] = server.registration_record
+        reset_coordinator_discovery()
+        try:
+            addrs = huge.swarm_list([dict(x=i) for i in range(100)])
+            addrs.append(small.swarm(x=0))
+            server.state.submit(addrs)
+            assert find_addresses_needing_execution(1) == [addrs[-1]]
+        finally:
+            pth.compute_nodes.json.delete_if_exists(REGISTRATION_KEY)
+            reset_coordinator_discovery()
+            server.stop()
+
+
+def test_authkey_is_not_published(tmpdir, monkeypatch):
+    authkey_path = os.path.join(str(tmpdir), "keys", "authkey")
+    monkeypatch.setattr(coordinator, "AUTHKEY_PATH", authkey_path)
+    server = CoordinatorServer(os.path.join(str(tmpdir), "c.sock"))
+    assert "authkey" not in server.registration_record
+    assert stat.S_IMODE(os.stat(authkey_path).st_mode) == 0o600
+    assert server.authkey == get_coordinator_authkey()
+    server.start()
+    client = CoordinatorClient(server.registration_record)
+    assert client.call("submit", [("f_Samos", "a")]) == 1
+    client.close()
+    server.stop()
@@ -0,0 +1,27 @@
+from pythagoras._06_swarming.cpu_allocation import (
+    choose_n_threads_per_worker, choose_cpu_sets, build_worker_cpu_policies)
+
+
+def test_choose_n_threads_per_worker():
+    assert choose_n_threads_per_worker(16, 4) == 4
+    assert choose_n_threads_per_worker(16, 3) == 5
+    assert choose_n_threads_per_worker(2, 8) == 1
+    assert choose_n_threads_per_worker(8, 0) == 8
+
+
+def test_choose_cpu_sets():
+    assert choose_cpu_sets([0, 1, 2, 3], 2) == [[0, 1], [2, 3]]
+    assert choose_cpu_sets([0, 1, 2, 3, 4], 2) == [[0, 1, 2], [3, 4]]
+    assert choose_cpu_sets([0, 1], 3) == [[0], [1], [0]]
+    cpu_sets = choose_cpu_sets(list(range(10)), 4)
+    assert sum(len(s) for s in cpu_sets) == 10
+    assert len(set(sum(cpu_sets, []))) == 10
+
+
+def test_build_worker_cpu_policies():
+    policies = build_worker_cpu_policies(3)
+    assert len(policies) == 3
+    assert all(p["n_threads"] >= 1 for p in policies)
+    assert all("cpu_set" not in p for p in policies)
+    pinned = build_worker_cpu_policies(3, pin_workers=True)
+    assert all(len(p["cpu_set"]) >= 1 for p in pinned)
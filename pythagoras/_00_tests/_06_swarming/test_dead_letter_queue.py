@@ -0,0 +1,69 @@
+import pytest
+
+from pythagoras._04_idempotent_functions.idempotent_decorator import idempotent
+from pythagoras._04_idempotent_functions.idempotent_func_address_context import (
+    MAX_EXECUTION_ATTEMPTS)
+from pythagoras._06_swarming.background_workers import (
+    find_addresses_needing_execution)
+from pythagoras._07_mission_control.global_state_management import (
+    _force_initialize)
+
+import pythagoras as pth
+
+
+def always_fails(x):
+    return x / 0
+
+
+def test_dead_letter_queue(tmpdir):
+    global always_fails
+    with _force_initialize(tmpdir, n_background_workers=0):
+        always_fails = idempotent()(always_fails)
+        addr = always_fails.swarm(x=1)
+        for i in range(MAX_EXECUTION_ATTEMPTS + 1):
+            with pytest.raises(ZeroDivisionError):
+                addr.execute()
+
+        assert not addr.needs_execution
+        assert addr.attempts_are_exhausted
+        assert addr.execution_requested
+        assert len(pth.dead_letter_queue) == 0
+        assert find_addresses_needing_execution() == []
+        assert len(pth.execution_requests) == 0
+        assert len(pth.dead_letter_queue) == 1
+        summary = pth.dead_letter_queue[addr]
+        assert summary["fn_name"] == "always_fails"
+        assert summary["n_attempts"] == MAX_EXECUTION_ATTEMPTS + 1
+
+        with pytest.raises(ZeroDivisionError):
+            always_fails(x=1)
+        assert len(pth.execution_requests) == 0
+        assert addr.is_dead_lettered
+        with pytest.raises(pth.RequestIsDeadLettered):
+            addr.get()
+        with pytest.raises(pth.RequestIsDeadLettered):
+            always_fails.swarm(x=1)
+        assert len(pth.execution_requests) == 0
+
+        assert pth.requeue_dead_letters(fn_name="something_else") == 0
+        assert pth.requeue_dead_letters() == 1
+        assert len(pth.dead_letter_queue) == 0
+        assert addr.execution_requested
+        assert addr.needs_execution
+
+        for i in range(MAX_EXECUTION_ATTEMPTS + 1):
+            with pytest.raises(ZeroDivisionError):
+                addr.execute()
+        assert not addr.needs_execution
+        find_addresses_needing_execution()
+        assert addr.is_dead_lettered
+        assert pth.requeue_dead_letter(addr)
+        assert not pth.requeue_dead_letter(addr)
+        assert addr.needs_execution
+
+        for i in range(MAX_EXECUTION_ATTEMPTS + 1):
+            with pytest.raises(ZeroDivisionError):
+                addr.execute()
+        find_addresses_needing_execution()
+        assert pth.purge_dead_letters(fn_name="always_fails") == 1
+        assert len(pth.dead_letter_queue) == 0
@@ -0,0 +1,74 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+import psutil
+import pytest
+
+from pythagoras._04_idempotent_functions.execution_resources import (
+    ExecutionResources)
+from pythagoras._06_swarming.execution_limits import (
+    ExecutionLimitsGuard, get_process_memory_gb, start_new_process_group
+    , kill_process_tree)
+
+
+def test_limits_in_resources():
+    resources = ExecutionResources(time_limit=10, memory_limit_gb=2)
+    assert not resources.is_empty
+    assert not resources.has_concurrency_limits
+    assert resources.as_dict() == dict(time_limit=10, memory_limit_gb=2)
+
+
+def test_limits_guard():
+    pid = os.getpid()
+    assert get_process_memory_gb(pid) > 0
+
+    guard = ExecutionLimitsGuard()
+    assert guard.find_violation(pid) is None
+
+    guard.start_task(["f_Samos", "abc"], dict(time_limit=0.1))
+    assert guard.find_violation(pid) is None
+    time.sleep(0.2)
+    assert "time limit" in guard.find_violation(pid)
+
+    guard.start_task(["f_Samos", "abc"], dict(memory_limit_gb=10**-6))
+    assert "Memory limit" in guard.find_violation(pid)
+
+    guard.start_task(["f_Samos", "abc"], dict(memory_limit_gb=10**6))
+    assert guard.find_violation(pid) is None
+
+
+def start_grandchild(pid_queue):
+    start_new_process_group()
+    grandchild = subprocess.Popen(
+        [sys.executable, "-c", "import time; time.sleep(60)"])
+    pid_queue.put(grandchild.pid)
+    grandchild.wait()
+
+
+def is_gone(pid: int) -> bool:
+    try:
+        return psutil.Process(pid).status() == psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return True
+
+
+@pytest.mark.skipif(not hasattr(os, "killpg")
+    , reason="process groups are not available on this platform")
+def test_kill_process_tree():
+    ctx = multiprocessing.get_context("spawn")
+    pid_queue = ctx.SimpleQueue()
+    p = ctx.Process(target=start_grandchild, args=(pid_queue,))
+    p.start()
+    grandchild_pid = pid_queue.get()
+    assert os.getpgid(p.pid) == p.pid
+    assert os.getpgid(grandchild_pid) == p.pid
+    kill_process_tree(p)
+    p.join()
+    for _ in range(50):
+        if is_gone(grandchild_pid):
+            break
+        time.sleep(0.1)
+    assert is_gone(grandchild_pid)
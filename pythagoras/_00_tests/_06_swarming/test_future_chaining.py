@@ -0,0 +1,41 @@
+from pythagoras._04_idempotent_functions.idempotent_decorator import idempotent
+from pythagoras._07_mission_control.global_state_management import (
+    _force_initialize)
+
+import pythagoras as pth
+
+
+def add_one(x):
+    return x + 1
+
+
+def double(x):
+    return 2 * x
+
+
+def test_future_chaining(tmpdir):
+    global add_one, double
+    with _force_initialize(tmpdir, n_background_workers=0):
+        add_one = idempotent()(add_one)
+        double = idempotent()(double)
+        first = add_one.swarm(x=1)
+        second = double.swarm(x=first)
+        third = add_one.swarm(x=second)
+        assert second.waits_for_other_requests
+        assert not second.needs_execution
+        assert second.execution_request["waiting_for"] == [
+            list(first.str_chain)]
+        assert third.get(timeout=60) == 5
+        assert second.get() == 4
+
+
+def test_future_chaining_with_workers(tmpdir):
+    global add_one, double
+    with _force_initialize(tmpdir, n_background_workers=0):
+        add_one = idempotent()(add_one)
+        double = idempotent()(double)
+        addr = double.swarm(x=add_one.get_address(x=10))
+
+    with _force_initialize(tmpdir, n_background_workers=2):
+        addr._invalidate_cache()
+        assert addr.get(timeout=120) == 22
@@ -0,0 +1,112 @@
+import queue
+import time
+from pythagoras._06_swarming import heartbeats
+from pythagoras._06_swarming.background_workers import read_executor_messages
+from pythagoras._06_swarming.execution_limits import ExecutionLimitsGuard
+from pythagoras._06_swarming.heartbeats import (
+    HeartbeatWriter, get_live_heartbeats)
+from pythagoras._06_swarming.worker_stats import WorkerStats
+from pythagoras._07_mission_control.global_state_management import (
+    _force_initialize)
+import pythagoras as pth
+
+
+def test_session_heartbeat(tmpdir):
+    with _force_initialize(tmpdir, n_background_workers=0):
+        live_heartbeats = get_live_heartbeats()
+        assert len(live_heartbeats) == 1
+        records = list(live_heartbeats.values())[0]
+        assert [r["role"] for r in records] == ["session"]
+        assert records[0]["runtime_id"] == pth.runtime_id
+        assert heartbeats.current_heartbeat_id is not None
+    assert heartbeats.current_heartbeat_id is None
+
+
+def test_abandoned_attempt_is_reclaimable(tmpdir):
+    with _force_initialize(tmpdir, n_background_workers=0):
+
+        @pth.idempotent()
+        def f(n):
+            return n
+
+        address = f.swarm(n=1)
+        session_heartbeat_id = heartbeats.current_heartbeat_id
+        worker_heartbeat = HeartbeatWriter(role="worker")
+        worker_heartbeat.beat(current_tasks=[])
+        heartbeats.current_heartbeat_id = worker_heartbeat.heartbeat_id
+
+        pth.IdempotentFnExecutionContext.claim_execution_attempts([address])
+        assert not address.needs_execution
+        assert address.execution_in_progress
+
+        time.sleep(1.1)
+        worker_heartbeat.beat(current_tasks=[list(address.str_chain)])
+        assert not address.needs_execution
+
+        time.sleep(1.1)
+        worker_heartbeat.beat(current_tasks=[])
+        assert address.needs_execution
+        assert not address.execution_in_progress
+
+        heartbeats.current_heartbeat_id = session_heartbeat_id
+
+
+def test_nested_attempts_are_listed_by_worker(tmpdir):
+    with _force_initialize(tmpdir, n_background_workers=0):
+
+        @pth.idempotent()
+        def g(n):
+            return n
+
+        address = g.get_address(n=1)
+        session_heartbeat_id = heartbeats.current_heartbeat_id
+        worker_heartbeat = HeartbeatWriter(role="worker")
+        heartbeats.current_heartbeat_id = worker_heartbeat.heartbeat_id
+        reported_tasks = []
+        heartbeats.task_listener = reported_tasks.append
+        try:
+            context = pth.IdempotentFnExecutionContext(address)
+            context.register_execution_attempt()
+            assert reported_tasks == [list(address.str_chain)]
+            time.sleep(1.1)
+            worker_heartbeat.beat(current_tasks=reported_tasks)
+            assert address.execution_in_progress
+        finally:
+            heartbeats.task_listener = None
+            heartbeats.current_heartbeat_id = session_heartbeat_id
+
+
+def test_unreported_claims_are_not_abandoned(tmpdir):
+    with _force_initialize(tmpdir, n_background_workers=0):
+
+        @pth.idempotent()
+        def h(n):
+            return n
+
+        address = h.swarm(n=1)
+        session_heartbeat_id = heartbeats.current_heartbeat_id
+        worker_heartbeat = HeartbeatWriter(role="worker")
+        heartbeats.current_heartbeat_id = worker_heartbeat.heartbeat_id
+        try:
+            pth.IdempotentFnExecutionContext.claim_execution_attempts(
+                [address])
+            stats_queue = queue.SimpleQueue()
+            current_tasks, executed = read_executor_messages(
+                stats_queue, None, ExecutionLimitsGuard(), WorkerStats())
+            time.sleep(1.1)
+            worker_heartbeat.beat(current_tasks=current_tasks)
+            assert address.execution_in_progress
+
+            stats_queue.put(dict(claimed=[list(address.str_chain)]))
+            current_tasks, executed = read_executor_messages(
+                stats_queue, current_tasks, ExecutionLimitsGuard()
+                , WorkerStats())
+            assert current_tasks == [list(address.str_chain)]
+            assert not executed
+            time.sleep(1.1)
+            worker_heartbeat.beat(current_tasks=current_tasks)
+            assert address.execution_in_progress
+        finally:
+            (pth.IdempotentFnExecutionContext
+                .release_claimed_execution_attempts())
+            heartbeats.current_heartbeat_id = session_heartbeat_id
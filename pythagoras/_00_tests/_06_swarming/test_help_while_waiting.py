@@ -0,0 +1,76 @@
+import pytest
+
+from pythagoras._04_idempotent_functions.idempotent_decorator import idempotent
+from pythagoras._06_swarming import background_workers
+from pythagoras._07_mission_control.global_state_management import (
+    _force_initialize)
+
+import pythagoras as pth
+
+
+def isEven(n):
+    if n == 0:
+        return True
+    else:
+        return isOdd(n = n-1)
+
+
+def isOdd(n):
+    if n == 0:
+        return False
+    else:
+        return isEven(n = n-1)
+
+
+def test_get_without_background_workers(tmpdir):
+    global isEven, isOdd
+    with _force_initialize(tmpdir, n_background_workers=0):
+        isEven = idempotent()(isEven)
+        isOdd = idempotent()(isOdd)
+        addrs = isOdd.swarm_list([dict(n=i) for i in range(10)])
+        assert addrs[-1].get(timeout=60) == True
+        for i, addr in enumerate(addrs):
+            assert addr.get(timeout=60) == (i % 2 == 1)
+        assert len(pth.execution_requests) == 0
+
+
+def test_get_helps_with_dag_mode_dependencies(tmpdir):
+    global isEven, isOdd
+    with _force_initialize(tmpdir, n_background_workers=0):
+        isEven = idempotent(dag_mode=True)(isEven)
+        isOdd = idempotent(dag_mode=True)(isOdd)
+        addr = isEven.swarm(n=30)
+        assert addr.get(timeout=120, help_while_waiting=True) == True
+
+
+def square(x):
+    return x * x
+
+
+def test_workers_do_not_help_with_other_islands(tmpdir):
+    with _force_initialize(tmpdir, n_background_workers=0):
+        f = idempotent()(square)
+        addr = f.swarm(x=3)
+        background_workers.in_worker_process = True
+        background_workers.worker_island_names = ["Crete"]
+        with pytest.raises(TimeoutError):
+            addr.get(timeout=1)
+        with pytest.raises(TimeoutError):
+            addr.get(timeout=1, help_while_waiting=True)
+        assert not addr.ready
+        background_workers.worker_island_names = [pth.default_island_name]
+        assert addr.get(timeout=60, help_while_waiting=True) == 9
+    assert not background_workers.in_worker_process
+
+
+def always_fails(x):
+    raise ValueError(x)
+
+
+def test_get_raises_if_the_request_fails(tmpdir):
+    with _force_initialize(tmpdir, n_background_workers=0):
+        f = idempotent()(always_fails)
+        addr = f.swarm(x=1)
+        with pytest.raises(ValueError):
+            addr.get(timeout=60)
+        assert addr.count_execution_attempts() == 1
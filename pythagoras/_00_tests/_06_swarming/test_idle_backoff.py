@@ -0,0 +1,29 @@
+from pythagoras._06_swarming.wakeup_signals import IdleBackoff
+from pythagoras._06_swarming.worker_stats import WorkerStats
+
+
+def test_idle_backoff_grows_and_resets():
+    backoff = IdleBackoff(min_delay=0.1, max_delay=1.0, factor=2.0)
+    delays = [backoff.next_delay() for _ in range(8)]
+    assert 0.08 < delays[0] < 0.12
+    assert delays[1] > delays[0]
+    assert max(delays) <= 1.1
+    assert delays[-1] > 0.8
+    backoff.reset()
+    assert backoff.next_delay() < 0.12
+
+
+def test_worker_stats():
+    stats = WorkerStats()
+    assert stats.idle_iops == 0
+    stats.register_idle_period(0.5, woken_up=False)
+    stats.register_idle_period(1.5, woken_up=True)
+    stats.register_task(pickup_latency=0.2)
+    stats.register_task(pickup_latency=0.4)
+    stats.register_task(pickup_latency=None)
+    summary = stats.as_dict()
+    assert summary["n_tasks"] == 3
+    assert summary["n_idle_scans"] == 2
+    assert summary["n_wakeups"] == 1
+    assert summary["idle_iops"] == 1.0
+    assert summary["max_pickup_latency"] == 0.4
@@ -0,0 +1,63 @@
+import time
+
+from pythagoras._06_swarming.background_workers import (
+    find_addresses_needing_execution, find_excess_claims)
+from pythagoras._07_mission_control.global_state_management import (
+    _force_initialize)
+import pythagoras as pth
+
+
+def test_memory_requirements(tmpdir):
+    with _force_initialize(tmpdir, n_background_workers=0):
+
+        @pth.idempotent(memory_gb=10**9)
+        def huge(n):
+            return n
+
+        @pth.idempotent(memory_gb=0.001)
+        def tiny(n):
+            return n
+
+        huge.swarm(n=1)
+        tiny_address = tiny.swarm(n=1)
+        assert find_addresses_needing_execution() == [tiny_address]
+
+
+def test_concurrency_limits(tmpdir):
+    with _force_initialize(tmpdir, n_background_workers=0):
+
+        @pth.idempotent(max_concurrency=1)
+        def f(n):
+            return n
+
+        addresses = f.swarm_list([dict(n=1), dict(n=2)])
+        assert len(find_addresses_needing_execution()) == 2
+
+        pth.IdempotentFnExecutionContext.claim_execution_attempts(
+            addresses[:1])
+        assert addresses[0].execution_in_progress
+        assert find_addresses_needing_execution() == []
+
+
+def test_simultaneous_claims(tmpdir):
+    with _force_initialize(tmpdir, n_background_workers=0):
+
+        @pth.idempotent(max_concurrency=1)
+        def g(n):
+            return n
+
+        addresses = g.swarm_list([dict(n=1), dict(n=2)])
+        assert len(find_addresses_needing_execution()) == 2
+        for an_address in addresses:
+            pth.IdempotentFnExecutionContext.claim_execution_attempts(
+                [an_address])
+            time.sleep(0.05)
+        assert find_excess_claims(addresses[:1]) == []
+        assert find_excess_claims(addresses) == addresses[1:]
+
+        pth.IdempotentFnExecutionContext.withdraw_claimed_execution_attempts(
+            addresses[1:])
+        assert addresses[0].execution_in_progress
+        assert not addresses[1].execution_in_progress
+        assert addresses[1].needs_execution
+        pth.IdempotentFnExecutionContext.release_claimed_execution_attempts()
@@ -0,0 +1,70 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+from pythagoras._06_swarming.background_workers import (
+    prefix_matches_islands, address_matches_islands)
+from pythagoras._07_mission_control.global_state_management import (
+    _force_initialize)
+from pythagoras.worker import main
+import pythagoras as pth
+
+
+def test_prefix_matches_islands():
+    assert prefix_matches_islands("fibonacci_Samos", None)
+    assert prefix_matches_islands("fibonacci_Samos", ["Samos"])
+    assert prefix_matches_islands("fibonacci_Samos", ["Crete", "Samos"])
+    assert not prefix_matches_islands("fibonacci_Samos", ["Crete"])
+
+
+def triple(x):
+    return 3 * x
+
+def test_address_matches_islands(tmpdir):
+    with _force_initialize(tmpdir, n_background_workers=0):
+        f = pth.idempotent(island_name="my_os")(triple)
+        address = f.get_address(x=1)
+        assert prefix_matches_islands(address.prefix, ["os"])
+        assert not address_matches_islands(address, ["os"])
+        assert address_matches_islands(address, ["my_os"])
+        assert address_matches_islands(address, ["Crete", "my_os"])
+        assert address_matches_islands(address, None)
+
+
+def test_worker_cli_requires_base_dir():
+    with pytest.raises(SystemExit):
+        main([])
+
+
+def slow_double(x):
+    import time
+    time.sleep(5)
+    return 2 * x
+
+
+def test_ctrl_c_lets_workers_finish_their_tasks(tmpdir):
+    global slow_double
+    with _force_initialize(tmpdir, n_background_workers=0):
+        slow_double = pth.idempotent()(slow_double)
+        address = slow_double.swarm(x=21)
+        worker = subprocess.Popen([sys.executable, "-m", "pythagoras.worker"
+            , "--base-dir", str(tmpdir)], start_new_session=True)
+        try:
+            start_time = time.time()
+            while not len(address.execution_attempts):
+                assert time.time() - start_time < 120
+                assert worker.poll() is None
+                time.sleep(0.2)
+            time.sleep(1)
+            os.killpg(worker.pid, signal.SIGINT) # like Ctrl-C in a terminal
+            assert worker.wait(timeout=120) == 0
+        finally:
+            if worker.poll() is None:
+                os.killpg(worker.pid, signal.SIGKILL)
+        assert address.ready
+        assert len(address.crashes) == 0
+        assert address.get() == 42
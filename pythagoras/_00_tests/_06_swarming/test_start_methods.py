@@ -0,0 +1,55 @@
+import multiprocessing
+import threading
+
+import pytest
+
+from pythagoras._06_swarming import start_methods
+from pythagoras._06_swarming.background_workers import background_worker
+from pythagoras._06_swarming.start_methods import (
+    set_worker_start_method, get_worker_context, get_worker_start_settings)
+from pythagoras._07_mission_control.global_state_management import (
+    _clean_global_state)
+
+
+def test_default_start_method():
+    set_worker_start_method()
+    assert get_worker_context().get_start_method() == "spawn"
+    assert get_worker_start_settings() == dict(
+        start_method="spawn", preload_modules=[])
+
+
+@pytest.mark.skipif("forkserver" not in multiprocessing.get_all_start_methods()
+    , reason="forkserver is not available on this platform")
+def test_forkserver_start_method():
+    try:
+        set_worker_start_method("forkserver", ["json", "pythagoras", "json"])
+        assert start_methods.preloaded_modules == ["pythagoras", "json"]
+        assert get_worker_context().get_start_method() == "forkserver"
+        assert get_worker_start_settings() == dict(
+            start_method="forkserver", preload_modules=["json"])
+    finally:
+        set_worker_start_method()
+
+
+def test_unsupported_start_method():
+    with pytest.raises(AssertionError):
+        set_worker_start_method("fork")
+    assert start_methods.worker_start_method == "spawn"
+
+
+@pytest.mark.skipif("forkserver" not in multiprocessing.get_all_start_methods()
+    , reason="forkserver is not available on this platform")
+def test_worker_keeps_its_start_method(tmpdir):
+    _clean_global_state()
+    stop_event = threading.Event()
+    stop_event.set()
+    try:
+        background_worker(dict(base_dir=str(tmpdir))
+            , stop_event=stop_event
+            , start_settings=dict(
+                start_method="forkserver", preload_modules=["json"]))
+        assert get_worker_context().get_start_method() == "forkserver"
+        assert start_methods.preloaded_modules == ["pythagoras", "json"]
+    finally:
+        _clean_global_state()
+    assert start_methods.worker_start_method == "spawn"
@@ -0,0 +1,99 @@
+import time
+
+from pythagoras._04_idempotent_functions.idempotent_decorator import idempotent
+from pythagoras._04_idempotent_functions.idempotent_func_address_context import (
+    IdempotentFnExecutionContext, MAX_EXECUTION_ATTEMPTS)
+from pythagoras._06_swarming.background_workers import (
+    find_excess_speculative_claims)
+from pythagoras._06_swarming.stragglers import (
+    execution_is_straggling, register_execution_duration
+    , get_median_execution_duration, STRAGGLER_FACTOR, MIN_STRAGGLER_AGE
+    , DURATION_HISTORY_SIZE)
+from pythagoras._07_mission_control.global_state_management import (
+    _force_initialize)
+
+import pythagoras as pth
+
+
+def test_execution_is_straggling():
+    assert not execution_is_straggling(10_000, None)
+    assert not execution_is_straggling(MIN_STRAGGLER_AGE - 1, 0.1)
+    assert execution_is_straggling(MIN_STRAGGLER_AGE + 1, 0.1)
+    median = 2 * MIN_STRAGGLER_AGE
+    assert not execution_is_straggling(STRAGGLER_FACTOR * median - 1, median)
+    assert execution_is_straggling(STRAGGLER_FACTOR * median + 1, median)
+
+
+def slow_increment(x):
+    return x + 1
+
+
+def test_speculative_attempts_are_not_counted(tmpdir):
+    global slow_increment
+    with _force_initialize(tmpdir, n_background_workers=0):
+        slow_increment = idempotent()(slow_increment)
+        addr = slow_increment.swarm(x=1)
+        for i in range(MAX_EXECUTION_ATTEMPTS + 1):
+            IdempotentFnExecutionContext.claim_execution_attempts(
+                [addr], speculative=True)
+        IdempotentFnExecutionContext.release_claimed_execution_attempts()
+        assert len(addr.execution_attempts) == MAX_EXECUTION_ATTEMPTS + 1
+        assert addr.count_execution_attempts() == 0
+        assert not addr.attempts_are_exhausted
+        assert addr.execute() == 2
+
+
+def test_execution_durations_are_recorded_separately(tmpdir):
+    with _force_initialize(tmpdir, n_background_workers=0):
+        prefix = "some_prefix"
+        for duration in [100.0, 100.0] + [1.0] * (DURATION_HISTORY_SIZE - 2):
+            register_execution_duration(prefix, duration)
+            time.sleep(0.002)
+        for duration in [2.0, 3.0]:
+            register_execution_duration(prefix, duration)
+        history = pth.compute_nodes.json.get_subdict(
+            ["execution_durations", prefix])
+        assert len(history) == DURATION_HISTORY_SIZE + 2
+        assert get_median_execution_duration(prefix) == 1.0
+        assert len(history) == DURATION_HISTORY_SIZE
+        assert 100.0 not in [history[k] for k in history.keys()]
+
+
+def quick_increment(x):
+    return x + 1
+
+
+def test_executions_do_not_record_durations(tmpdir):
+    with _force_initialize(tmpdir, n_background_workers=0):
+        f = idempotent()(quick_increment)
+        assert f(x=10) == 11
+        assert len(pth.compute_nodes.json.get_subdict(
+            ["execution_durations"])) == 0
+
+
+def hanging_increment(x):
+    return x + 1
+
+
+def test_one_live_speculative_attempt(tmpdir):
+    with _force_initialize(tmpdir, n_background_workers=0):
+        f = idempotent()(hanging_increment)
+        addr = f.swarm(x=1)
+        IdempotentFnExecutionContext.claim_execution_attempts(
+            [addr], speculative=True)
+        assert addr.holds_earliest_speculative_attempt
+        assert find_excess_speculative_claims([addr]) == []
+        assert len(addr._live_speculative_attempts(
+            addr.execution_attempts)) == 1
+        assert not addr.is_straggling
+
+        time.sleep(0.01)
+        IdempotentFnExecutionContext.claim_execution_attempts(
+            [addr], speculative=True)
+        assert not addr.holds_earliest_speculative_attempt
+        assert find_excess_speculative_claims([addr]) == [addr]
+        IdempotentFnExecutionContext.withdraw_claimed_execution_attempts(
+            [addr])
+        assert len(addr._live_speculative_attempts(
+            addr.execution_attempts)) == 1
+        IdempotentFnExecutionContext.release_claimed_execution_attempts()
@@ -0,0 +1,145 @@
+import pytest
+
+from pythagoras._04_idempotent_functions.idempotent_decorator import idempotent
+from pythagoras._04_idempotent_functions.idempotent_func_address_context import (
+    MAX_EXECUTION_ATTEMPTS)
+from pythagoras._06_swarming.background_workers import (
+    find_addresses_needing_execution)
+from pythagoras._07_mission_control.global_state_management import (
+    _force_initialize)
+
+import pythagoras as pth
+
+
+def isEven(n):
+    if n == 0:
+        return True
+    else:
+        return isOdd(n = n-1)
+
+
+def isOdd(n):
+    if n == 0:
+        return False
+    else:
+        return isEven(n = n-1)
+
+
+def test_dag_mode_suspension(tmpdir):
+    global isEven, isOdd
+    with _force_initialize(tmpdir, n_background_workers=0):
+        isEven = idempotent(dag_mode=True)(isEven)
+        isOdd = idempotent()(isOdd)
+        addr = isEven.swarm(n=4)
+        assert addr.execution_request["dag_mode"]
+
+        assert not addr.execute_in_dag_mode()
+        assert not addr.ready
+        assert not addr.needs_execution
+        assert len(addr.crashes) == 0
+        child = isOdd.get_address(n=3)
+        assert child.execution_request["dag_mode"]
+        assert child.needs_execution
+
+        n_executions = 0
+        while not addr.ready:
+            for key in list(pth.execution_requests):
+                an_address = pth.IdempotentFnExecutionResultAddr.from_strings(
+                    prefix=key[0], hash_value=key[1], assert_readiness=False)
+                if an_address.needs_execution:
+                    an_address.execute_in_dag_mode()
+                    n_executions += 1
+            assert n_executions < 100
+        assert addr.get() == True
+        assert len(pth.execution_requests) == 0
+
+
+def test_dag_mode_swarming(tmpdir):
+    global isEven, isOdd
+    with _force_initialize(tmpdir, n_background_workers=0):
+        isEven = idempotent(dag_mode=True)(isEven)
+        isOdd = idempotent(dag_mode=True)(isOdd)
+        addr = isEven.swarm(n=20)
+
+    with _force_initialize(tmpdir, n_background_workers=3):
+        addr._invalidate_cache()
+        assert addr.get() == True
+
+
+def square(x):
+    return x * x
+
+
+def sum_of_squares(n):
+    squares = [square(x=i) for i in range(n)]
+    return sum(squares)
+
+
+def test_dag_mode_fan_out(tmpdir):
+    global square, sum_of_squares
+    with _force_initialize(tmpdir, n_background_workers=0):
+        square = idempotent()(square)
+        sum_of_squares = idempotent(dag_mode=True)(sum_of_squares)
+        addr = sum_of_squares.swarm(n=10)
+
+        for i in range(10):
+            assert not addr.execute_in_dag_mode()
+            assert addr.execution_request["waiting_for"] == [
+                list(square.get_address(x=i).str_chain)]
+            assert len(addr.crashes) == 0
+            assert len(pth.execution_requests) == 2
+            assert not addr.needs_execution
+            assert square.get_address(x=i).execute() == i * i
+            assert addr.needs_execution
+        assert addr.execute_in_dag_mode()
+        assert addr.get() == 285
+
+
+def sums_results_as_numbers(n):
+    total = 0
+    for i in range(n):
+        total += square(x=i) + 0
+    return total
+
+
+def test_dag_mode_never_returns_missing_results(tmpdir):
+    global square, sums_results_as_numbers
+    with _force_initialize(tmpdir, n_background_workers=0):
+        square = idempotent()(square)
+        sums_results_as_numbers = idempotent(dag_mode=True)(
+            sums_results_as_numbers)
+        addr = sums_results_as_numbers.swarm(n=3)
+        assert not addr.execute_in_dag_mode()
+        assert len(addr.crashes) == 0
+        assert len(addr.execution_request["waiting_for"]) == 1
+
+
+def fails(x):
+    return x / 0
+
+
+def calls_failing_child(x):
+    return fails(x=x) + 1
+
+
+def test_dag_mode_dead_lettered_child(tmpdir):
+    global fails, calls_failing_child
+    with _force_initialize(tmpdir, n_background_workers=0):
+        fails = idempotent()(fails)
+        calls_failing_child = idempotent(dag_mode=True)(calls_failing_child)
+        addr = calls_failing_child.swarm(x=1)
+        assert not addr.execute_in_dag_mode()
+
+        child = fails.get_address(x=1)
+        for i in range(MAX_EXECUTION_ATTEMPTS + 1):
+            with pytest.raises(ZeroDivisionError):
+                child.execute()
+        find_addresses_needing_execution()
+        find_addresses_needing_execution()
+        assert child.is_dead_lettered
+        assert addr.is_dead_lettered
+        assert len(pth.execution_requests) == 0
+        summary = pth.dead_letter_queue[addr]
+        assert summary["reason"] == "waits_for_dead_letters"
+        with pytest.raises(pth.RequestIsDeadLettered):
+            addr.get()
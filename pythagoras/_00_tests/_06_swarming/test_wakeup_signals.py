@@ -0,0 +1,21 @@
+import time
+from pythagoras._06_swarming.wakeup_signals import (
+    WakeupSignalReceiver, send_wakeup_signal)
+from pythagoras._07_mission_control.global_state_management import (
+    _force_initialize)
+
+
+def test_wakeup_signal(tmpdir):
+    with _force_initialize(tmpdir, n_background_workers=0):
+        assert send_wakeup_signal() == 0
+        with WakeupSignalReceiver() as receiver:
+            if receiver.socket is None:
+                return # Unix domain sockets are not supported
+            start_time = time.time()
+            assert not receiver.wait(0.2)
+            assert time.time() - start_time >= 0.15
+            assert send_wakeup_signal() == 1
+            start_time = time.time()
+            assert receiver.wait(10)
+            assert time.time() - start_time < 5
+        assert send_wakeup_signal() == 0
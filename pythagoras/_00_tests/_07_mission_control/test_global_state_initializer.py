@@ -1,3 +1,5 @@
+import pytest
+
 import pythagoras as pth
 from pythagoras._07_mission_control.global_state_management import _clean_global_state
 
@@ -15,6 +17,8 @@ def test_local_initialization(tmp_path):
         assert pth.is_global_state_correct()
         assert pth.is_correctly_initialized()
         init_params["runtime_id"] = pth.runtime_id
+        init_params["persistent_source_cache"] = True
+        init_params["persistent_function_registry"] = True
         assert pth.initialization_parameters == init_params
         assert len(pth.value_store) == 0
         assert pth.default_island_name == "kuku"
@@ -60,4 +64,37 @@ def test_corrupt_island_name(tmp_path):
         pth.default_island_name = "new name"
         assert not pth.is_global_state_correct()
         assert not pth.is_correctly_initialized()
-        assert not pth.is_fully_unitialized()
\ No newline at end of file
+        assert not pth.is_fully_unitialized()
+
+
+def test_recorded_source_normalization(tmp_path):
+    _clean_global_state()
+    init_params = dict(
+        base_dir=tmp_path
+        , n_background_workers=0)
+
+    with pth.initialize(**init_params, source_normalization="ast"):
+        pass
+    _clean_global_state()
+    with pth.initialize(**init_params):
+        assert pth.compute_nodes.json[["source_normalization_mode"]] == "ast"
+    _clean_global_state()
+    with pytest.raises(AssertionError, match="source_normalization"):
+        pth.initialize(**init_params, source_normalization="compatible")
+    assert pth.is_fully_unitialized()
+    with pth.initialize(**init_params):
+        pass
+    _clean_global_state()
+
+
+def test_workers_inherit_persistent_cache_settings(tmp_path):
+    _clean_global_state()
+    with pth.initialize(base_dir=tmp_path, n_background_workers=0
+            , persistent_source_cache=False
+            , persistent_function_registry=False):
+        assert pth.source_cache is None
+        assert pth.function_registry is None
+        assert not pth.initialization_parameters["persistent_source_cache"]
+        assert not pth.initialization_parameters[
+            "persistent_function_registry"]
+    _clean_global_state()
@@ -30,7 +30,13 @@ def get_hash_signature(x:Any) -> str:
     return get_base32_hash_signature(x)[:max_signature_length]
 
 
+_node_signature: str | None = None
+
 def get_node_signature() -> str:
+    """Return a signature of the current node (computed once per process)."""
+    global _node_signature
+    if _node_signature is not None:
+        return _node_signature
     mac = uuid.getnode()
     system = platform.system()
     release = platform.release()
@@ -40,7 +46,8 @@ def get_node_signature() -> str:
     user = getpass.getuser()
     id_string = f"{mac}{system}{release}{version}"
     id_string += f"{machine}{processor}{user}"
-    return get_hash_signature(id_string)
+    _node_signature = get_hash_signature(id_string)
+    return _node_signature
 
 
 def get_random_signature() -> str:
@@ -0,0 +1,216 @@
+"""Alpha-equivalence canonicalization of function ASTs.
+
+Used by the "alpha" normalization mode. Two functions that differ only
+in names of their local variables, or in the order of consecutive
+import statements inside their bodies, get the same canonical form
+(and hence share addresses and cached results).
+
+Local variables are renamed to v0, v1, ... in order of their first binding.
+Renaming is conservative: parameters, keyword argument names, imported
+names, names of nested functions and classes, global / nonlocal names,
+builtins and any names used inside nested classes are never renamed.
+Names bound by comprehensions belong to their own scopes:
+they are not renamed inside these comprehensions.
+Functions that use locals(), vars(), eval() and similar introspection,
+or structural pattern matching, are not renamed at all.
+"""
+
+import ast
+import builtins
+
+
+INTROSPECTION_FUNCTIONS = {"locals", "vars", "globals", "eval", "exec", "dir"}
+
+CANONICAL_NAME_PREFIX = "v"
+
+
+class _LocalBindingsCollector(ast.NodeVisitor):
+    """Collect names bound in the function's own scope, in order."""
+    def __init__(self):
+        self.bound_names = []
+
+    def _bind(self, name: str) -> None:
+        if name not in self.bound_names:
+            self.bound_names.append(name)
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Store):
+            self._bind(node.id)
+
+    def visit_ExceptHandler(self, node):
+        if node.name is not None:
+            self._bind(node.name)
+        self.generic_visit(node)
+
+    def visit_FunctionDef(self, node):
+        pass
+
+    def visit_AsyncFunctionDef(self, node):
+        pass
+
+    def visit_Lambda(self, node):
+        pass
+
+    def visit_ClassDef(self, node):
+        pass
+
+    def visit_ListComp(self, node):
+        pass
+
+    def visit_SetComp(self, node):
+        pass
+
+    def visit_DictComp(self, node):
+        pass
+
+    def visit_GeneratorExp(self, node):
+        pass
+
+
+class _NamesRenamer(ast.NodeTransformer):
+    def __init__(self, new_names: dict[str, str]):
+        self.new_names = new_names
+
+    def visit_Name(self, node):
+        node.id = self.new_names.get(node.id, node.id)
+        return node
+
+    def visit_ExceptHandler(self, node):
+        if node.name is not None:
+            node.name = self.new_names.get(node.name, node.name)
+        self.generic_visit(node)
+        return node
+
+    def _visit_comprehension(self, node):
+        """Names, bound by a comprehension, are its own (not renamed)."""
+        bound_names = set()
+        for generator in node.generators:
+            for target_node in ast.walk(generator.target):
+                if isinstance(target_node, ast.Name):
+                    bound_names.add(target_node.id)
+        # The first iterable is evaluated in the enclosing scope
+        node.generators[0].iter = self.visit(node.generators[0].iter)
+        outer_names = self.new_names
+        self.new_names = {name: new_name for name, new_name
+            in outer_names.items() if name not in bound_names}
+        for field in ["elt", "key", "value"]:
+            if hasattr(node, field):
+                setattr(node, field, self.visit(getattr(node, field)))
+        for i, generator in enumerate(node.generators):
+            generator.target = self.visit(generator.target)
+            generator.ifs = [self.visit(cond) for cond in generator.ifs]
+            if i > 0:
+                generator.iter = self.visit(generator.iter)
+        self.new_names = outer_names
+        return node
+
+    visit_ListComp = _visit_comprehension
+    visit_SetComp = _visit_comprehension
+    visit_DictComp = _visit_comprehension
+    visit_GeneratorExp = _visit_comprehension
+
+
+def _find_non_renamable_names(tree: ast.AST) -> set[str]:
+    result = set(dir(builtins))
+    for node in ast.walk(tree):
+        if isinstance(node, ast.arg):
+            result.add(node.arg)
+        elif isinstance(node, ast.keyword) and node.arg is not None:
+            result.add(node.arg)
+        elif isinstance(node, ast.alias):
+            result.add(node.asname or node.name.split(".")[0])
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            result |= set(node.names)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            result.add(node.name)
+        elif isinstance(node, ast.ClassDef):
+            result.add(node.name)
+            for class_node in ast.walk(node):
+                if isinstance(class_node, ast.Name):
+                    result.add(class_node.id)
+    return result
+
+
+def _find_all_identifiers(tree: ast.AST) -> set[str]:
+    result = _find_non_renamable_names(tree)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            result.add(node.id)
+        elif isinstance(node, ast.ExceptHandler) and node.name is not None:
+            result.add(node.name)
+    return result
+
+
+def _uses_introspection(tree: ast.AST) -> bool:
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Match):
+            return True
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id in INTROSPECTION_FUNCTIONS):
+            return True
+    return False
+
+
+def _get_imported_names(aliases: list[ast.alias]) -> list[str]:
+    return [a.asname or a.name.split(".")[0] for a in aliases]
+
+
+def _can_be_reordered(aliases: list[ast.alias]) -> bool:
+    """Reordering is safe if no name is bound twice (and there is no *)."""
+    names = _get_imported_names(aliases)
+    return "*" not in names and len(names) == len(set(names))
+
+
+def sort_consecutive_imports(tree: ast.AST) -> None:
+    """Sort runs of consecutive import statements inside all blocks.
+
+    A run (or a statement) that binds the same name more than once
+    is left as written, since the last import of the name wins.
+    """
+    is_import = lambda stmt: isinstance(stmt, (ast.Import, ast.ImportFrom))
+    for node in ast.walk(tree):
+        if is_import(node) and _can_be_reordered(node.names):
+            node.names.sort(key=lambda a: (a.name, a.asname or ""))
+        for field in ["body", "orelse", "finalbody"]:
+            statements = getattr(node, field, None)
+            if not isinstance(statements, list):
+                continue
+            sorted_statements, run = [], []
+            for stmt in statements + [None]:
+                if stmt is not None and is_import(stmt):
+                    run.append(stmt)
+                    continue
+                if _can_be_reordered([a for i in run for a in i.names]):
+                    run = sorted(run, key=ast.unparse)
+                sorted_statements += run
+                run = []
+                if stmt is not None:
+                    sorted_statements.append(stmt)
+            setattr(node, field, sorted_statements)
+
+
+def rename_local_variables(tree: ast.Module) -> None:
+    """Rename local variables of the function to canonical names."""
+    function = tree.body[0]
+    assert isinstance(function, ast.FunctionDef)
+    if _uses_introspection(function):
+        return
+    collector = _LocalBindingsCollector()
+    for stmt in function.body:
+        collector.visit(stmt)
+    non_renamable = _find_non_renamable_names(function)
+    renamable = [n for n in collector.bound_names if n not in non_renamable]
+    taken_names = _find_all_identifiers(function) - set(renamable)
+    new_names, counter = dict(), 0
+    for name in renamable:
+        while CANONICAL_NAME_PREFIX + str(counter) in taken_names:
+            counter += 1
+        new_names[name] = CANONICAL_NAME_PREFIX + str(counter)
+        counter += 1
+    _NamesRenamer(new_names).visit(function)
+
+
+def canonicalize_function_ast(tree: ast.Module) -> None:
+    """Bring the function's AST to an alpha-equivalence canonical form."""
+    sort_consecutive_imports(tree)
+    rename_local_variables(tree)
@@ -13,6 +13,15 @@ exception for errors specific to function normalization.
 
 External libraries `ast`, and `autopep8` are used for
 parsing and formatting. Internal utilities from `pythagoras` are also utilized.
+
+Two normalization modes are supported. In the "compatible" mode (default),
+the cleaned AST is unparsed and then formatted with autopep8; this mode
+preserves normalized sources (and hence addresses) created by earlier
+versions of Pythagoras. In the "ast" mode, the canonical form is produced
+directly from the cleaned AST by ast.unparse, which is much faster.
+The opt-in "alpha" mode additionally renames local variables canonically
+and sorts in-body imports (see alpha_normalizer), so that functions which
+differ only cosmetically share addresses.
 """
 from __future__ import annotations
 import ast
@@ -23,9 +32,28 @@ import autopep8
 from pythagoras._02_ordinary_functions.function_name import get_function_name_from_source
 from pythagoras._99_misc_utils.long_infoname import get_long_infoname
 from pythagoras._02_ordinary_functions.assert_ordinarity import assert_ordinarity
+from pythagoras._02_ordinary_functions.alpha_normalizer import (
+    canonicalize_function_ast)
+from pythagoras._02_ordinary_functions.normalized_source_cache import (
+    lookup_normalized_source, store_normalized_source)
 import pythagoras as pth
 
 
+NORMALIZATION_MODES = ["compatible", "ast", "alpha"]
+NORMALIZATION_MODE_KEY = ["source_normalization_mode"]
+
+normalization_mode: str = "compatible"
+
+
+def set_normalization_mode(mode: str = "compatible") -> None:
+    """Choose how function sources are normalized in the current process."""
+    global normalization_mode
+    assert mode in NORMALIZATION_MODES, (
+        f"Unknown normalization mode {mode}, "
+        + f"supported modes are {NORMALIZATION_MODES}")
+    normalization_mode = mode
+
+
 def __get_normalized_function_source__(
         a_func:Callable|str
         , drop_pth_decorators:bool = False
@@ -35,6 +63,7 @@ def __get_normalized_function_source__(
     Remove all comments, docstrings, type annotations and empty lines;
     standardize code formatting based on PEP 8.
     If drop_pth_decorators == True, remove Pythagoras decorators.
+    Results are cached, see normalized_source_cache.
 
     Only regular functions are supported; methods and lambdas are not supported.
     """
@@ -50,6 +79,12 @@ def __get_normalized_function_source__(
     else:
         assert callable(a_func) or isinstance(a_func, str)
 
+    cached_result = lookup_normalized_source(
+        code, drop_pth_decorators, normalization_mode)
+    if cached_result is not None:
+        return cached_result
+    raw_code = code
+
     code_lines = code.splitlines()
 
     code_no_empty_lines = []
@@ -137,7 +172,15 @@ def __get_normalized_function_source__(
             node.body.append(ast.Pass())
         # TODO: compare with the source for ast.candidate_docstring()
 
+    if normalization_mode == "alpha":
+        canonicalize_function_ast(code_ast)
+
     result = ast.unparse(code_ast)
-    result = autopep8.fix_code(result)
+    if normalization_mode == "compatible":
+        result = autopep8.fix_code(result)
+    else:
+        result += "\n"
 
+    store_normalized_source(
+        raw_code, drop_pth_decorators, normalization_mode, result)
     return result
\ No newline at end of file
@@ -0,0 +1,96 @@
+"""Content-addressed cache of normalized function sources.
+
+Normalization (an AST round-trip plus autopep8) takes tens of milliseconds
+per function, and the same sources are normalized over and over:
+on every decoration, in every session and in every worker. The cache maps
+raw source code to its normalized form. It lives in memory and,
+if pth.source_cache is initialized, also under base_dir, so that it is
+shared across sessions and workers.
+
+A normalized source is also cached as its own normalized form,
+since normalization is idempotent. Sources, normalized in different
+modes, are cached separately.
+
+Persistent keys also include NORMALIZER_VERSION (and, in the "compatible"
+mode, the version of autopep8): after a change of the normalization
+logic, or an upgrade of autopep8, sources are normalized again.
+NORMALIZER_VERSION must be bumped whenever the normalized form
+of any source can change.
+"""
+
+import autopep8
+
+from pythagoras._01_foundational_objects.hash_and_random_signatures import (
+    get_hash_signature)
+
+import pythagoras as pth
+
+
+NORMALIZER_VERSION = 2
+NORMALIZED_SOURCES_KEY = "normalized_sources"
+
+_normalized_sources: dict[tuple[str, bool, str], str] = dict()
+
+_cache_stats = dict(n_lookups=0, n_memory_hits=0, n_persistent_hits=0)
+
+
+def _get_persistent_key(code: str, drop_pth_decorators: bool
+        , mode: str) -> list[str]:
+    suffix = "_d" if drop_pth_decorators else "_k"
+    normalizer = f"v{NORMALIZER_VERSION}"
+    if mode == "compatible":
+        normalizer += f"_autopep8_{autopep8.__version__}"
+    return [NORMALIZED_SOURCES_KEY, normalizer, mode
+        , get_hash_signature(code) + suffix]
+
+
+def lookup_normalized_source(code: str, drop_pth_decorators: bool
+        , mode: str) -> str | None:
+    """Return cached normalized form of code, or None."""
+    _cache_stats["n_lookups"] += 1
+    result = _normalized_sources.get((mode, drop_pth_decorators, code))
+    if result is not None:
+        _cache_stats["n_memory_hits"] += 1
+        return result
+    if pth.source_cache is None:
+        return None
+    try:
+        result = pth.source_cache[_get_persistent_key(
+            code, drop_pth_decorators, mode)]
+    except KeyError:
+        return None
+    _cache_stats["n_persistent_hits"] += 1
+    _normalized_sources[(mode, drop_pth_decorators, code)] = result
+    return result
+
+
+def store_normalized_source(code: str, drop_pth_decorators: bool
+        , mode: str, normalized_source: str) -> None:
+    for source in [code, normalized_source]:
+        _normalized_sources[(mode, drop_pth_decorators, source)] = (
+            normalized_source)
+        if pth.source_cache is None:
+            continue
+        key = _get_persistent_key(source, drop_pth_decorators, mode)
+        try:
+            if key not in pth.source_cache:
+                pth.source_cache[key] = normalized_source
+        except KeyError:
+            # immutable item, another process has just stored it
+            if key not in pth.source_cache:
+                raise
+
+
+def get_normalized_source_cache_stats() -> dict:
+    """Number of lookups and hits, plus the overall hit rate."""
+    stats = dict(_cache_stats)
+    n_hits = stats["n_memory_hits"] + stats["n_persistent_hits"]
+    stats["hit_rate"] = n_hits / max(stats["n_lookups"], 1)
+    return stats
+
+
+def clear_normalized_source_cache() -> None:
+    """Clear in-memory cache and statistics (not the persistent cache)."""
+    _normalized_sources.clear()
+    for key in _cache_stats:
+        _cache_stats[key] = 0
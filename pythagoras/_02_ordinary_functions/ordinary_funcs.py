@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import copy
+import types
 from typing import Callable
 
 
@@ -9,6 +11,39 @@ from pythagoras._02_ordinary_functions.code_normalizer_implementation import (
     __get_normalized_function_source__)
 
 
+_compiled_ordinary_functions: dict[str, Callable] = dict()
+
+
+def compile_function_source(fn_source_code: str, fn_name: str
+        , names_dict: dict) -> Callable:
+    """Compile a function's source code inside names_dict.
+
+    The function's definition is executed once, the resulting
+    function object (bound to names_dict as its globals) is returned.
+    """
+    code = compile(fn_source_code, f"<pythagoras:{fn_name}>", "exec")
+    exec(code, names_dict, names_dict)
+    return names_dict[fn_name]
+
+
+def make_fresh_function(compiled_fn: Callable) -> Callable:
+    """Copy a compiled function, together with its globals and defaults.
+
+    The copy shares the compiled code of the function, but gets its own
+    copy of the globals and of default values of arguments, as if the
+    function's definition was executed anew. So calls of Pythagoras
+    functions can not pass state to each other, e.g. via global
+    statements or mutable default values.
+    """
+    names_dict = dict(compiled_fn.__globals__)
+    fresh_fn = types.FunctionType(compiled_fn.__code__, names_dict
+        , compiled_fn.__name__, copy.deepcopy(compiled_fn.__defaults__)
+        , compiled_fn.__closure__)
+    fresh_fn.__kwdefaults__ = copy.deepcopy(compiled_fn.__kwdefaults__)
+    names_dict[compiled_fn.__name__] = fresh_fn
+    return fresh_fn
+
+
 class OrdinaryFn:
     fn_source_code:str
     fn_name:str
@@ -29,14 +64,22 @@ class OrdinaryFn:
         assert len(args) == 0, (f"Function {self.fn_name} can't"
             + " be called with positional arguments,"
             + " only keyword arguments are allowed.")
-        names_dict = dict(globals())
-        names_dict.update(locals())
-        names_dict["_pth_kwargs"] = kwargs
-        source_to_exec = self.fn_source_code
-        source_to_exec += f"\n_pth_result = {self.fn_name}(**_pth_kwargs)\n"
-        exec(source_to_exec, names_dict, names_dict)
-        result = names_dict["_pth_result"]
-        return result
+        return make_fresh_function(self.compiled_fn)(**kwargs)
+
+
+    @property
+    def compiled_fn(self) -> Callable:
+        """Function object, compiled once per source code.
+
+        It is a template: every call runs a fresh copy of it,
+        see make_fresh_function().
+        """
+        compiled_fn = _compiled_ordinary_functions.get(self.fn_source_code)
+        if compiled_fn is None:
+            compiled_fn = compile_function_source(
+                self.fn_source_code, self.fn_name, dict(globals()))
+            _compiled_ordinary_functions[self.fn_source_code] = compiled_fn
+        return compiled_fn
 
 
     @property
@@ -7,10 +7,14 @@ from pythagoras._01_foundational_objects.hash_and_random_signatures import (
     get_random_signature)
 
 from pythagoras._02_ordinary_functions.ordinary_funcs import (
-    OrdinaryFn)
+    OrdinaryFn, compile_function_source, make_fresh_function)
 
 from pythagoras._03_autonomous_functions.call_graph_explorer import (
-    explore_call_graph_deep)
+    get_island_dependency_graph)
+
+from pythagoras._03_autonomous_functions.function_registry import (
+    lookup_registered_function, update_registered_function
+    , get_function_signatures, functions_are_unchanged)
 
 from pythagoras._03_autonomous_functions.names_usage_analyzer import (
     analyze_names_in_function)
@@ -79,6 +83,10 @@ class AutonomousFn(OrdinaryFn):
             assert isinstance(island[name]._static_checks_passed, bool)
             return island[name]._static_checks_passed
 
+        if lookup_registered_function(self).get("static_checks_passed"):
+            self._static_checks_passed = True
+            return True
+
         analyzer = analyze_names_in_function(self.fn_source_code)
         normalized_source = analyzer["normalized_source"]
         analyzer = analyzer["analyzer"]
@@ -96,6 +104,7 @@ class AutonomousFn(OrdinaryFn):
                 + f" is not autonomous, it uses yield statements")
 
         self._static_checks_passed = True
+        update_registered_function(self, static_checks_passed=True)
         return True
 
     def perform_runtime_checks(self)-> bool:
@@ -106,6 +115,14 @@ class AutonomousFn(OrdinaryFn):
             assert isinstance(island[name]._runtime_checks_passed, bool)
             return island[name]._runtime_checks_passed
 
+        registered = lookup_registered_function(self)
+        if registered.get("runtime_checks_passed") and functions_are_unchanged(
+                self.island_name, registered["dependencies"]
+                , registered["external_names"]):
+            island[name]._dependencies = sorted(registered["dependencies"])
+            island[name]._runtime_checks_passed = True
+            return True
+
         analyzer = analyze_names_in_function(self.fn_source_code)
         normalized_source = analyzer["normalized_source"]
         analyzer = analyzer["analyzer"]
@@ -128,37 +145,52 @@ class AutonomousFn(OrdinaryFn):
             + f" objects {import_required}"
             + f" without importing them inside the function body")
 
-        all_functions_in_island = [f.fn_source_code for f in island.values()]
-        deep_dependencies = explore_call_graph_deep(all_functions_in_island)
-        dependencies = deep_dependencies[name]
+        graph = get_island_dependency_graph(self.island_name)
+        dependencies = graph.get_dependencies(name)
         assert isinstance(dependencies, set)
         assert len(dependencies) >= 1
         island[name]._dependencies = sorted(dependencies)
         island[name]._runtime_checks_passed = True
+        external_names = set()
+        for f_name in dependencies:
+            external_names |= graph.references[f_name] - dependencies
+        update_registered_function(self, runtime_checks_passed=True
+            , dependencies=get_function_signatures(
+                self.island_name, dependencies)
+            , external_names=sorted(external_names))
         return True
 
 
+    @property
+    def compiled_fn(self) -> Callable:
+        """Function object, compiled once per island function.
+
+        Its globals contain Pythagoras names and the island functions
+        it depends on, so recursive and cross-function calls
+        go through the island's wrappers.
+
+        It is a template: every call runs a fresh copy of it,
+        see make_fresh_function().
+        """
+        island = pth.all_autonomous_functions[self.island_name]
+        name = self.fn_name
+        if island[name]._compiled_fn is not None:
+            return island[name]._compiled_fn
+        assert self.perform_runtime_checks()
+        names_dict = retrieve_objs_available_inside_autonomous_functions()
+        for f_name in self.dependencies:
+            names_dict[f_name] = island[f_name]
+        tmp_name = "_pth_tmp_" + name
+        source_to_compile = self.fn_source_code.replace(
+            " "+name+"(", " "+tmp_name+"(",1)
+        island[name]._compiled_fn = compile_function_source(
+            source_to_compile, tmp_name, names_dict)
+        return island[name]._compiled_fn
+
+
     def execute(self, **kwargs) -> Any:
         try:
-            assert self.perform_runtime_checks()
-            names_dict = retrieve_objs_available_inside_autonomous_functions()
-            island = pth.all_autonomous_functions[self.island_name]
-            names_dict["_pth_kwargs"] = kwargs
-            if self.island_name is not None:
-                for f_name in self.dependencies:
-                    names_dict[f_name] = island[f_name]
-            else:
-                names_dict[self.fn_name] = island[self.fn_name]
-
-
-            tmp_name = "_pth_tmp_" + self.fn_name
-            source_to_exec = self.fn_source_code + "\n"
-            source_to_exec = source_to_exec.replace(
-                " "+self.fn_name+"(", " "+tmp_name+"(",1)
-            source_to_exec += f"\n_pth_result = {tmp_name}(**_pth_kwargs)\n"
-            exec(source_to_exec, names_dict, names_dict)
-            result = names_dict["_pth_result"]
-            return result
+            return make_fresh_function(self.compiled_fn)(**kwargs)
         except Exception as e:
             if self.__class__ == AutonomousFn:
                 exception_id = f"{self.fn_name}_{self.island_name}"
@@ -206,6 +238,7 @@ def register_autonomous_function(a_fn: AutonomousFn) -> None:
         island[fn_name]._static_checks_passed = None
         island[fn_name]._runtime_checks_passed = None
         island[fn_name]._dependencies = None
+        island[fn_name]._compiled_fn = None
     else:
         assert a_fn.fn_source_code == island[fn_name].fn_source_code, (
                 f"Function {fn_name} is already "
@@ -233,7 +266,10 @@ def register_autonomous_function(a_fn: AutonomousFn) -> None:
                    , "_runtime_checks_passed")
     assert hasattr(pth.all_autonomous_functions[a_fn.island_name][a_fn.fn_name]
                    , "_dependencies")
+    assert hasattr(pth.all_autonomous_functions[a_fn.island_name][a_fn.fn_name]
+                   , "_compiled_fn")
     if a_fn is not pth.all_autonomous_functions[a_fn.island_name][a_fn.fn_name]:
         assert not hasattr(a_fn, "_static_checks_passed")
         assert not hasattr(a_fn, "_runtime_checks_passed")
-        assert not hasattr(a_fn, "_dependencies")
\ No newline at end of file
+        assert not hasattr(a_fn, "_dependencies")
+        assert not hasattr(a_fn, "_compiled_fn")
\ No newline at end of file
@@ -2,6 +2,10 @@ from typing import List, Dict, Set, Union, Callable
 
 from pythagoras._03_autonomous_functions.names_usage_analyzer import (
     analyze_names_in_function)
+from pythagoras._03_autonomous_functions.island_dependency_graph import (
+    IslandDependencyGraph)
+
+import pythagoras as pth
 
 def get_referenced_names(function:Union[Callable,str])->Dict[str,Set[str]]:
     """ Discover all external names referenced from within a function.
@@ -80,19 +84,30 @@ def explore_call_graph_deep(all_funcs:List[Union[Callable,str]]) -> Dict[str, Se
         some_name's source code. Each set always contains
         at least 1 element (the some_name function itself).
     """
-    all_dependencies = explore_call_graph_shallow(all_funcs)
+    graph = IslandDependencyGraph()
+    for function in all_funcs:
+        for name, referenced_names in get_referenced_names(function).items():
+            graph.add_function(name, referenced_names)
 
-    all_function_names = set(all_dependencies)
+    return {name: graph.get_dependencies(name) for name in graph.names}
 
-    for function_name in all_function_names:
-        dependencies_old = all_dependencies[function_name]
-        while True:
-            dependencies_new = set(dependencies_old)
-            for referenced_name in dependencies_old:
-                dependencies_new |= all_dependencies[referenced_name]
-            if len(dependencies_new) == len(dependencies_old):
-                break
-            dependencies_old = set(dependencies_new)
-        all_dependencies[function_name] = dependencies_new
-
-    return all_dependencies
\ No newline at end of file
+
+_island_graphs: dict[str, IslandDependencyGraph] = dict()
+
+def get_island_dependency_graph(island_name: str) -> IslandDependencyGraph:
+    """ Get the dependency graph of an island, with all its functions.
+
+    The graph is kept between calls and is extended with functions
+    registered in the island since the previous call.
+    """
+    island = pth.all_autonomous_functions[island_name]
+    graph = _island_graphs.get(island_name)
+    if graph is None or graph.island is not island:
+        graph = IslandDependencyGraph(island)
+        _island_graphs[island_name] = graph
+    if len(graph) < len(island):
+        for name, function in island.items():
+            if name not in graph:
+                graph.add_function(name, get_referenced_names(
+                    function.fn_source_code)[name])
+    return graph
\ No newline at end of file
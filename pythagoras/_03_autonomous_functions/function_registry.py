@@ -0,0 +1,95 @@
+"""Persistent registry of verified functions, stored under base_dir.
+
+Every session and every worker checks each function it registers:
+static and runtime autonomicity checks, dependency analysis, assembly
+of augmented source code, hashing of the function to get its address.
+The registry records results of this work in pth.function_registry,
+keyed by the hash of the function's decorator and source code,
+so that other processes can trust them and skip the analysis.
+
+Keys also include the Pythagoras version and the names analyzer version:
+after an upgrade of either, all functions are verified again.
+Results that depend on other functions (dependencies, augmented
+source code, address) are only trusted if all these functions are
+still in the island, with the same source code, and no name that
+the function and its dependencies reference outside of them
+has become an island function since.
+"""
+
+from importlib import metadata
+
+from pythagoras._01_foundational_objects.hash_and_random_signatures import (
+    get_hash_signature)
+from pythagoras._03_autonomous_functions.names_usage_analyzer import (
+    ANALYZER_VERSION)
+
+import pythagoras as pth
+
+
+def get_pythagoras_version() -> str:
+    """Version of the installed Pythagoras package ("dev" for source trees)."""
+    try:
+        return metadata.version("pythagoras")
+    except metadata.PackageNotFoundError:
+        return "dev"
+
+
+PYTHAGORAS_VERSION = get_pythagoras_version()
+
+
+def get_function_signature(a_fn) -> str:
+    """Hash of the function's decorator and (normalized) source code."""
+    return get_hash_signature(a_fn.decorator + "\n" + a_fn.fn_source_code)
+
+
+def get_registry_key(a_fn) -> list[str]:
+    return [f"pythagoras_{PYTHAGORAS_VERSION}"
+        , f"analyzer_v{ANALYZER_VERSION}", get_function_signature(a_fn)]
+
+
+def lookup_registered_function(a_fn) -> dict:
+    """Verified metadata of a function, or an empty dict."""
+    if pth.function_registry is None:
+        return dict()
+    try:
+        return pth.function_registry[get_registry_key(a_fn)]
+    except KeyError:
+        return dict()
+
+
+def update_registered_function(a_fn, **metadata_items) -> None:
+    """Add (or overwrite) verified metadata of a function."""
+    if pth.function_registry is None:
+        return
+    key = get_registry_key(a_fn)
+    entry = lookup_registered_function(a_fn)
+    if all(entry.get(k) == v for k, v in metadata_items.items()):
+        return
+    entry.update(fn_name=a_fn.fn_name, island_name=a_fn.island_name)
+    entry.update(metadata_items)
+    pth.function_registry[key] = entry
+
+
+def get_function_signatures(island_name: str, fn_names) -> dict[str, str]:
+    island = pth.all_autonomous_functions[island_name]
+    return {name: get_function_signature(island[name])
+        for name in sorted(fn_names)}
+
+
+def functions_are_unchanged(island_name: str
+        , signatures: dict[str, str]
+        , external_names: list[str] | None = None) -> bool:
+    """Check if recorded functions are still in the island, as they were.
+
+    Also checks that none of external_names refers to an island function.
+    """
+    island = pth.all_autonomous_functions[island_name]
+    for name, signature in signatures.items():
+        if name not in island:
+            return False
+        if get_function_signature(island[name]) != signature:
+            return False
+    for name in external_names or []:
+        if name in island:
+            return False
+    return True
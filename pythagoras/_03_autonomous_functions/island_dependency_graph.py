@@ -0,0 +1,118 @@
+"""Call graph of an island, with incrementally maintained dependencies.
+
+Each function of an island is a node, its edges go to the functions
+it references. Transitive dependencies (closures) are stored as bitsets.
+
+When a function is added and no existing function references it yet
+(the usual case: callees are defined before callers), its closure is
+the union of closures of the functions it references, and nothing else
+changes. Otherwise, cycles may appear and existing closures may grow,
+so all closures are recomputed (lazily, on the next lookup) from
+strongly connected components: closures of components are built over
+the condensation DAG in reverse topological order.
+"""
+
+
+class IslandDependencyGraph:
+    """Direct and transitive dependencies between functions of an island."""
+    def __init__(self, island: dict | None = None):
+        self.island = island
+        self.names: list[str] = []
+        self.positions: dict[str, int] = dict()
+        self.references: dict[str, set[str]] = dict()
+        self.referenced_by: dict[str, set[str]] = dict()
+        self.closures: dict[str, int] = dict()
+        self.closures_are_stale = False
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.positions
+
+    def add_function(self, name: str, referenced_names: set[str]) -> None:
+        """Add a function with names it references (directly)."""
+        assert name not in self.positions
+        self.positions[name] = len(self.names)
+        self.names.append(name)
+        self.references[name] = set(referenced_names) - {name}
+        for referenced_name in self.references[name]:
+            self.referenced_by.setdefault(referenced_name, set()).add(name)
+        if self.closures_are_stale:
+            return
+        if len(self.referenced_by.get(name, set())):
+            self.closures_are_stale = True
+            return
+        closure = 1 << self.positions[name]
+        for dependency in self._get_successors(name):
+            closure |= self.closures[dependency]
+        self.closures[name] = closure
+
+    def get_dependencies(self, name: str) -> set[str]:
+        """All functions, directly or indirectly referenced by name,
+        plus the function itself."""
+        if self.closures_are_stale:
+            self._rebuild_closures()
+        bits = bin(self.closures[name])[:1:-1]
+        return {self.names[i] for i, bit in enumerate(bits) if bit == "1"}
+
+    def _get_successors(self, name: str) -> list[str]:
+        return [n for n in self.references[name] if n in self.positions]
+
+    def _rebuild_closures(self) -> None:
+        """Recompute all closures, using Tarjan's algorithm for SCCs."""
+        closures = dict()
+        order = dict()
+        lowlinks = dict()
+        stack, on_stack = [], set()
+        for root in self.names:
+            if root in order:
+                continue
+            order[root] = lowlinks[root] = len(order)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self._get_successors(root)))]
+            while work:
+                node, successors = work[-1]
+                for successor in successors:
+                    if successor not in order:
+                        order[successor] = lowlinks[successor] = len(order)
+                        stack.append(successor)
+                        on_stack.add(successor)
+                        work.append(
+                            (successor, iter(self._get_successors(successor))))
+                        break
+                    elif successor in on_stack:
+                        lowlinks[node] = min(lowlinks[node], order[successor])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlinks[parent] = min(lowlinks[parent], lowlinks[node])
+                    if lowlinks[node] == order[node]:
+                        self._close_component(node, stack, on_stack, closures)
+        self.closures = closures
+        self.closures_are_stale = False
+
+    def _close_component(self, root: str, stack: list[str]
+            , on_stack: set[str], closures: dict[str, int]) -> None:
+        """Pop a strongly connected component and compute its closure.
+
+        Components, reachable from it, have already been closed.
+        """
+        component = []
+        while True:
+            name = stack.pop()
+            on_stack.discard(name)
+            component.append(name)
+            if name == root:
+                break
+        closure = 0
+        for name in component:
+            closure |= 1 << self.positions[name]
+        for name in component:
+            for successor in self._get_successors(name):
+                if successor in closures:
+                    closure |= closures[successor]
+        for name in component:
+            closures[name] = closure
@@ -4,8 +4,20 @@ from typing import Callable, Union
 from pythagoras._02_ordinary_functions.code_normalizer import (
     get_normalized_function_source)
 
+from pythagoras._01_foundational_objects.hash_and_random_signatures import (
+    get_hash_signature)
 from pythagoras._99_misc_utils.id_examiner import is_reserved_identifier
 
+import pythagoras as pth
+
+
+ANALYZER_VERSION = 2
+NAMES_ANALYSIS_KEY = "names_analysis"
+
+NAMES_SETS = ["explicitly_global_unbound_deep"
+    , "explicitly_nonlocal_unbound_deep", "local", "imported"
+    , "unclassified_deep", "accessible"]
+
 class NamesUsedInFunction:
     def __init__(self):
         self.function = None # name of the function
@@ -37,7 +49,8 @@ class NamesUsageAnalyzer(ast.NodeVisitor):
         if self.func_nesting_level == 0:
             self.names.function = node.name
             self.func_nesting_level += 1
-            for arg in node.args.args:
+            for arg in (node.args.posonlyargs + node.args.args
+                    + node.args.kwonlyargs):
                 self.names.local |= {arg.arg}
             if node.args.vararg:
                 self.names.local |= {node.args.vararg.arg}
@@ -159,6 +172,74 @@ class NamesUsageAnalyzer(ast.NodeVisitor):
         self.names.accessible |= globals
         self.generic_visit(node)
 
+def convert_analyzer_to_dict(analyzer: NamesUsageAnalyzer) -> dict:
+    """Convert analysis results into a json-compatible dict."""
+    result = dict(function=analyzer.names.function
+        , imported_packages_deep=sorted(
+            analyzer.imported_packages_deep, key=str)
+        , n_yelds=analyzer.n_yelds)
+    for set_name in NAMES_SETS:
+        result[set_name] = sorted(getattr(analyzer.names, set_name), key=str)
+    return result
+
+
+def convert_dict_to_analyzer(d: dict) -> NamesUsageAnalyzer:
+    """Recreate analysis results (with fresh sets) from a dict."""
+    analyzer = NamesUsageAnalyzer()
+    analyzer.names.function = d["function"]
+    analyzer.imported_packages_deep = set(d["imported_packages_deep"])
+    analyzer.n_yelds = d["n_yelds"]
+    for set_name in NAMES_SETS:
+        setattr(analyzer.names, set_name, set(d[set_name]))
+    return analyzer
+
+
+class NamesAnalysisResult(dict):
+    """Results of analyze_names_in_function().
+
+    The AST of the function is parsed on first access.
+    """
+    def __missing__(self, key):
+        if key != "tree":
+            raise KeyError(key)
+        self["tree"] = ast.parse(self["normalized_source"])
+        return self["tree"]
+
+
+_names_analysis_cache: dict[str, dict] = dict()
+
+
+def _get_persistent_key(normalized_source: str) -> list[str]:
+    return [NAMES_ANALYSIS_KEY, f"v{ANALYZER_VERSION}"
+        , get_hash_signature(normalized_source)]
+
+
+def lookup_names_analysis(normalized_source: str) -> dict | None:
+    result = _names_analysis_cache.get(normalized_source)
+    if result is not None or pth.source_cache is None:
+        return result
+    try:
+        result = pth.source_cache[_get_persistent_key(normalized_source)]
+    except KeyError:
+        return None
+    _names_analysis_cache[normalized_source] = result
+    return result
+
+
+def store_names_analysis(normalized_source: str, analysis: dict) -> None:
+    _names_analysis_cache[normalized_source] = analysis
+    if pth.source_cache is None:
+        return
+    key = _get_persistent_key(normalized_source)
+    try:
+        if key not in pth.source_cache:
+            pth.source_cache[key] = analysis
+    except KeyError:
+        # immutable item, another process has just stored it
+        if key not in pth.source_cache:
+            raise
+
+
 def analyze_names_in_function(
         a_func: Union[Callable,str]
         ):
@@ -167,10 +248,19 @@ def analyze_names_in_function(
     It returns an instance of NamesUsageAnalyzer class,
     which contains all the data needed to analyze
     names, used by the function.
+
+    Results are memoized per normalized source code, in memory
+    and (if pth.source_cache is initialized) under base_dir.
     """
 
     normalized_source = get_normalized_function_source(a_func)
 
+    cached_analysis = lookup_names_analysis(normalized_source)
+    if cached_analysis is not None:
+        return NamesAnalysisResult(
+            analyzer=convert_dict_to_analyzer(cached_analysis)
+            , normalized_source=normalized_source)
+
     lines, line_num = normalized_source.splitlines(), 0
     while lines[line_num].startswith("@"):
         line_num+=1
@@ -192,6 +282,7 @@ def analyze_names_in_function(
             + f" The following code is not allowed: {normalized_source}")
     analyzer = NamesUsageAnalyzer()
     analyzer.visit(tree)
-    result = dict(tree=tree, analyzer=analyzer
+    store_names_analysis(normalized_source, convert_analyzer_to_dict(analyzer))
+    result = NamesAnalysisResult(tree=tree, analyzer=analyzer
         , normalized_source=normalized_source)
     return result
\ No newline at end of file
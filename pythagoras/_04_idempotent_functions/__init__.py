@@ -50,3 +50,5 @@ from pythagoras._04_idempotent_functions.idempotent_decorator import (
 from pythagoras._04_idempotent_functions.idempotency_checks import (
     is_idempotent)
 
+from pythagoras._04_idempotent_functions.bulk_registration import (
+    register_many)
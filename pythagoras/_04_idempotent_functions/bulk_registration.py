@@ -0,0 +1,131 @@
+"""Registration of many functions at once.
+
+Normalization and names analysis of a function take tens of milliseconds,
+and decorators run them serially, one function at a time.
+register_many() runs them for a whole batch of functions in a pool
+of processes, puts the results into the normalized sources cache and
+the names analysis cache, and then decorates the functions
+(which now only hits the caches). Runtime checks of all the new
+functions are performed at the end, when the islands are complete,
+so the dependency graph of every island is built only once.
+
+Starting a process that imports Pythagoras takes seconds,
+so small batches skip the pool and are simply decorated
+in the current process.
+"""
+
+from __future__ import annotations
+
+import inspect
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+
+from pythagoras._02_ordinary_functions import code_normalizer_implementation
+from pythagoras._02_ordinary_functions.assert_ordinarity import (
+    assert_ordinarity)
+from pythagoras._02_ordinary_functions.code_normalizer_implementation import (
+    __get_normalized_function_source__, set_normalization_mode)
+from pythagoras._02_ordinary_functions.normalized_source_cache import (
+    lookup_normalized_source, store_normalized_source)
+from pythagoras._03_autonomous_functions.autonomous_decorators import (
+    autonomous)
+from pythagoras._03_autonomous_functions.autonomous_funcs import AutonomousFn
+from pythagoras._03_autonomous_functions.names_usage_analyzer import (
+    analyze_names_in_function, convert_analyzer_to_dict
+    , lookup_names_analysis, store_names_analysis)
+from pythagoras._06_swarming.start_methods import get_worker_context
+
+
+MIN_FUNCTIONS_PER_PROCESS = 500
+
+
+def normalize_and_analyze(codes: list[str], mode: str) -> list[tuple]:
+    """Normalize and analyze source code of functions.
+
+    Returns (normalized source, names analysis dict) for every function.
+    """
+    if code_normalizer_implementation.normalization_mode != mode:
+        set_normalization_mode(mode)
+    results = []
+    for code in codes:
+        normalized_source = __get_normalized_function_source__(
+            code, drop_pth_decorators=True)
+        analyzer = analyze_names_in_function(normalized_source)["analyzer"]
+        results.append((normalized_source, convert_analyzer_to_dict(analyzer)))
+    return results
+
+
+def _get_code(a_func: Callable | str) -> str:
+    if isinstance(a_func, str):
+        return a_func
+    assert_ordinarity(a_func)
+    return inspect.getsource(a_func)
+
+
+def _is_cached(code: str, mode: str) -> bool:
+    normalized_source = lookup_normalized_source(code, True, mode)
+    if normalized_source is None:
+        return False
+    return lookup_names_analysis(normalized_source) is not None
+
+
+def warm_up_caches(codes: list[str], n_processes: int | None = None) -> None:
+    """Normalize and analyze functions, which are not cached yet, in a pool.
+
+    Does nothing if the pool would have one process: decorators
+    do the same work in the current process anyway.
+    """
+    if n_processes is not None and n_processes <= 1:
+        return
+    mode = code_normalizer_implementation.normalization_mode
+    codes = [c for c in dict.fromkeys(codes) if not _is_cached(c, mode)]
+    if n_processes is None:
+        n_processes = min(os.cpu_count() or 1
+            , len(codes) // MIN_FUNCTIONS_PER_PROCESS)
+    n_processes = min(int(n_processes), len(codes))
+    if n_processes <= 1:
+        return
+
+    chunks = [codes[i::n_processes] for i in range(n_processes)]
+    with ProcessPoolExecutor(max_workers=n_processes
+            , mp_context=get_worker_context()) as executor:
+        chunk_results = list(executor.map(
+            normalize_and_analyze, chunks, [mode]*n_processes))
+    for chunk, results in zip(chunks, chunk_results):
+        for code, (normalized_source, analysis) in zip(chunk, results):
+            store_normalized_source(code, True, mode, normalized_source)
+            store_names_analysis(normalized_source, analysis)
+
+
+def register_many(functions: list
+        , decorator: Callable | None = None
+        , n_processes: int | None = None) -> list[AutonomousFn]:
+    """Register many functions at once.
+
+    Every item of functions is either a function (or its source code),
+    or a pair (decorator, function), e.g. (pth.idempotent(), f).
+    Items without a decorator are decorated with decorator
+    (pth.autonomous() by default). Functions are registered in the order
+    of the list, so validators and correctors must precede functions
+    that use them.
+
+    If n_processes is None, it is chosen based on the number of functions
+    and CPUs. Returns the decorated functions, in the same order.
+    """
+    if decorator is None:
+        decorator = autonomous()
+    items = []
+    for item in functions:
+        if isinstance(item, tuple):
+            assert len(item) == 2
+            items.append(item)
+        else:
+            items.append((decorator, item))
+
+    warm_up_caches([_get_code(f) for _, f in items], n_processes)
+
+    wrappers = [a_decorator(f) for a_decorator, f in items]
+    for wrapper in wrappers:
+        assert wrapper.perform_runtime_checks()
+    return wrappers
@@ -0,0 +1,90 @@
+import psutil
+
+
+class ExecutionResources:
+    """Resources, required to execute an idempotent function.
+
+    These are scheduling hints, they are not part of the function's identity,
+    and changing them does not invalidate cached results. They are pickled
+    together with the function (and its idempotent dependencies),
+    so that workers recreate them, also for nested calls.
+    Background workers only claim requests that fit currently free
+    resources of their node, and they respect per-function limits on
+    the number of concurrent executions, either per node or cluster-wide.
+    time_limit (seconds) and memory_limit_gb are hard limits: worker
+    supervisors kill executions that exceed them.
+    """
+    n_cpu_cores: float | None
+    memory_gb: float | None
+    max_concurrency_per_node: int | None
+    max_concurrency: int | None
+    time_limit: float | None
+    memory_limit_gb: float | None
+
+    def __init__(self
+                 , n_cpu_cores: float | None = None
+                 , memory_gb: float | None = None
+                 , max_concurrency_per_node: int | None = None
+                 , max_concurrency: int | None = None
+                 , time_limit: float | None = None
+                 , memory_limit_gb: float | None = None):
+        assert n_cpu_cores is None or n_cpu_cores > 0
+        assert memory_gb is None or memory_gb > 0
+        assert max_concurrency_per_node is None or max_concurrency_per_node > 0
+        assert max_concurrency is None or max_concurrency > 0
+        assert time_limit is None or time_limit > 0
+        assert memory_limit_gb is None or memory_limit_gb > 0
+        self.n_cpu_cores = n_cpu_cores
+        self.memory_gb = memory_gb
+        self.max_concurrency_per_node = max_concurrency_per_node
+        self.max_concurrency = max_concurrency
+        self.time_limit = time_limit
+        self.memory_limit_gb = memory_limit_gb
+
+    @classmethod
+    def from_dict(cls, d: dict | None) -> "ExecutionResources":
+        if not isinstance(d, dict):
+            return cls()
+        return cls(**d)
+
+    def as_dict(self) -> dict:
+        result = dict()
+        for key in ["n_cpu_cores", "memory_gb"
+                , "max_concurrency_per_node", "max_concurrency"
+                , "time_limit", "memory_limit_gb"]:
+            if getattr(self, key) is not None:
+                result[key] = getattr(self, key)
+        return result
+
+    @property
+    def is_empty(self) -> bool:
+        return len(self.as_dict()) == 0
+
+    @property
+    def has_concurrency_limits(self) -> bool:
+        return (self.max_concurrency_per_node is not None
+                or self.max_concurrency is not None)
+
+    def fit_current_node(self) -> bool:
+        """Check if the node currently has enough free CPU and memory."""
+        if self.memory_gb is not None:
+            available_gb = psutil.virtual_memory().available / 2**30
+            if self.memory_gb > available_gb:
+                return False
+        if self.n_cpu_cores is not None:
+            n_cores = psutil.cpu_count()
+            free_cores = n_cores - psutil.getloadavg()[0]
+            if self.n_cpu_cores > min(free_cores, n_cores):
+                return False
+        return True
+
+    def concurrency_allows(
+            self, n_running: int, n_running_on_node: int) -> bool:
+        """Check if one more execution would respect concurrency limits."""
+        if self.max_concurrency is not None:
+            if n_running >= self.max_concurrency:
+                return False
+        if self.max_concurrency_per_node is not None:
+            if n_running_on_node >= self.max_concurrency_per_node:
+                return False
+        return True
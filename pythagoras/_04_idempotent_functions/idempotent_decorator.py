@@ -1,21 +1,47 @@
 from typing import Callable
 
+from pythagoras._04_idempotent_functions.execution_resources import (
+    ExecutionResources)
 from pythagoras._04_idempotent_functions.idempotent_func_address_context import (
     IdempotentFn, SupportingFuncs)
 
 
 class idempotent:
+    """Decorator for idempotent functions.
+
+    n_cpu_cores, memory_gb, max_concurrency_per_node and max_concurrency
+    are optional scheduling hints for background workers.
+    time_limit (seconds) and memory_limit_gb are enforced by workers:
+    executions that exceed them are killed and recorded as crashes.
+    If dag_mode is True, swarmed calls are executed as DAGs:
+    nested calls that miss the cache become separate child requests.
+    """
 
     island_name: str | None
 
     def __init__(self
                  , island_name: str | None = None
                  , validators: SupportingFuncs = None
-                 , correctors: SupportingFuncs = None):
+                 , correctors: SupportingFuncs = None
+                 , n_cpu_cores: float | None = None
+                 , memory_gb: float | None = None
+                 , max_concurrency_per_node: int | None = None
+                 , max_concurrency: int | None = None
+                 , time_limit: float | None = None
+                 , memory_limit_gb: float | None = None
+                 , dag_mode: bool = False):
         assert isinstance(island_name, str) or island_name is None
         self.island_name = island_name
         self.validators = validators
         self.correctors = correctors
+        self.resources = ExecutionResources(
+            n_cpu_cores = n_cpu_cores
+            , memory_gb = memory_gb
+            , max_concurrency_per_node = max_concurrency_per_node
+            , max_concurrency = max_concurrency
+            , time_limit = time_limit
+            , memory_limit_gb = memory_limit_gb)
+        self.dag_mode = dag_mode
 
 
     def __call__(self, a_func:Callable) -> IdempotentFn:
@@ -23,6 +49,8 @@ class idempotent:
             a_func
             , island_name = self.island_name
             , validators = self.validators
-            , correctors = self.correctors)
+            , correctors = self.correctors
+            , resources = self.resources
+            , dag_mode = self.dag_mode)
         return wrapper
 
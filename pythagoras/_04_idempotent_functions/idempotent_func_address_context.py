@@ -17,40 +17,87 @@ from pythagoras._01_foundational_objects.value_addresses import ValueAddr
 
 from pythagoras._03_autonomous_functions.autonomous_funcs import (
     AutonomousFn, register_autonomous_function)
+from pythagoras._03_autonomous_functions.function_registry import (
+    lookup_registered_function, update_registered_function
+    , get_function_signatures, functions_are_unchanged)
 
 from pythagoras._02_ordinary_functions.ordinary_funcs import (
     OrdinaryFn)
 
+from pythagoras._04_idempotent_functions.execution_resources import (
+    ExecutionResources)
 from pythagoras._04_idempotent_functions.kw_args import (
     UnpackedKwArgs, PackedKwArgs, SortedKwArgs)
 from pythagoras._04_idempotent_functions.persidict_to_timeline import \
     build_timeline_from_persidict
-from pythagoras._04_idempotent_functions.process_augmented_func_src import (
-    process_augmented_func_src)
+from pythagoras._04_idempotent_functions.island_modules import (
+    load_island_module)
 from pythagoras._04_idempotent_functions.output_capturer import OutputCapturer
 from pythagoras._05_events_and_exceptions.execution_environment_summary import (
     build_execution_environment_summary, add_execution_environment_summary)
 from pythagoras._05_events_and_exceptions.global_event_loggers import (
     register_exception_globally, register_event_globally)
-
+from pythagoras._06_swarming.wakeup_signals import send_wakeup_signal
+from pythagoras._06_swarming import background_workers
+from pythagoras._06_swarming.background_workers import (
+    find_addresses_needing_execution, address_matches_islands)
+from pythagoras._06_swarming.coordinator import (
+    notify_requests_submitted, notify_requests_finished, release_requests
+    , wait_for_result)
+from pythagoras._06_swarming.heartbeats import (
+    get_current_heartbeat_tags, attempt_is_abandoned, report_current_task)
+from pythagoras._06_swarming.dead_letter_queue import RequestIsDeadLettered
+from pythagoras._06_swarming.stragglers import (
+    get_median_execution_duration, execution_is_straggling
+    , MAX_SPECULATIVE_ATTEMPTS)
+
+
+DEFAULT_EXECUTION_TIME = 10 # seconds
+MAX_EXECUTION_ATTEMPTS = 5
+SPECULATIVE_ATTEMPT_SUFFIX = "_s"
+RELEASED_ATTEMPT_SUFFIX = "_r"
+# TODO: these should not be constants
 
 ASupportingFunc:TypeAlias = str | AutonomousFn
 
 SupportingFuncs:TypeAlias = ASupportingFunc | List[ASupportingFunc] | None
 
+
+class ChildRequestsPending(BaseException):
+    """Suspends a DAG-mode execution till its child requests complete.
+
+    It is raised by the first nested call to an idempotent function
+    that misses the cache, so users' code never sees a missing result.
+    It is derived from BaseException, so that it is not
+    swallowed by `except Exception` clauses in users' code.
+    """
+    def __init__(self, children: list[IdempotentFnExecutionResultAddr]):
+        super().__init__(children)
+        self.children = children
+
+
 class IdempotentFn(AutonomousFn):
     augmented_code_checked: bool
     validators: SupportingFuncs
     correctors: SupportingFuncs
+    resources: ExecutionResources
+    dag_mode: bool
     def __init__(self, a_fn: Callable | str | OrdinaryFn
                  , island_name:str | None = None
                  , validators: SupportingFuncs = None
-                 , correctors: SupportingFuncs = None):
+                 , correctors: SupportingFuncs = None
+                 , resources: ExecutionResources | None = None
+                 , dag_mode: bool = False):
         super().__init__(a_fn, island_name)
         if validators is None:
             assert correctors is None
         self.validators = self._process_supporting_functions_arg(validators)
         self.correctors = self._process_supporting_functions_arg(correctors)
+        if resources is None:
+            resources = ExecutionResources()
+        assert isinstance(resources, ExecutionResources)
+        self.resources = resources
+        self.dag_mode = bool(dag_mode)
         self.augmented_code_checked = False
         register_idempotent_function(self)
 
@@ -150,8 +197,6 @@ class IdempotentFn(AutonomousFn):
         island = pth.all_autonomous_functions[island_name]
 
         if not self.augmented_code_checked:
-            augmented_code = ""
-
             full_dependencies = []
             if self.validators is not None:
                 full_dependencies += self.validators
@@ -159,11 +204,23 @@ class IdempotentFn(AutonomousFn):
                 full_dependencies += self.correctors
             full_dependencies += self.dependencies
 
-            for fn_name in full_dependencies:
-                f = island[fn_name]
-                augmented_code += f.decorator + "\n"
-                augmented_code += f.fn_source_code + "\n"
-                augmented_code += "\n"
+            registered = lookup_registered_function(self)
+            if "augmented_source_code" in registered and (
+                    functions_are_unchanged(island_name
+                        , registered["augmented_dependencies"])):
+                augmented_code = registered["augmented_source_code"]
+            else:
+                augmented_code = ""
+                for fn_name in full_dependencies:
+                    f = island[fn_name]
+                    augmented_code += f.decorator + "\n"
+                    augmented_code += f.fn_source_code + "\n"
+                    augmented_code += "\n"
+                update_registered_function(self
+                    , augmented_source_code=augmented_code
+                    , augmented_dependencies=get_function_signatures(
+                        island_name, full_dependencies)
+                    , fn_address=None)
 
             name = self.fn_name
             if (not hasattr(island[name], "_augmented_source_code")
@@ -177,6 +234,76 @@ class IdempotentFn(AutonomousFn):
         return True
 
 
+    @property
+    def address(self) -> ValueAddr:
+        """ValueAddr of the function, computed once per island function.
+
+        If the address is recorded in the function registry,
+        together with the same augmented source code, the function
+        is not hashed (and not stored in pth.value_store) again.
+        """
+        island = pth.all_autonomous_functions[self.island_name]
+        name = self.fn_name
+        if island[name]._address is not None:
+            return island[name]._address
+        assert self.perform_runtime_checks()
+        registered = lookup_registered_function(self)
+        if registered.get("fn_address") is not None and (
+                self.augmented_fn_source_code
+                == registered.get("augmented_source_code")):
+            prefix, hash_value = registered["fn_address"]
+            island[name]._address = ValueAddr.from_strings(
+                prefix=prefix, hash_value=hash_value, assert_readiness=False)
+        else:
+            island[name]._address = self._build_value_addr()
+            update_registered_function(self
+                , fn_address=list(island[name]._address.str_chain))
+        return island[name]._address
+
+
+    def _build_value_addr(self) -> ValueAddr:
+        """Hash the function without its scheduling hints.
+
+        Scheduling hints are not part of the function's identity:
+        changing them does not change the address of the function,
+        and does not invalidate cached results. The function is stored
+        in pth.value_store together with its hints.
+        """
+        identity = object.__new__(type(self))
+        identity.__dict__.update(self.__dict__)
+        identity._pickle_scheduling_hints = False
+        address = ValueAddr(identity, push_to_cloud=False)
+        address._invalidate_cache()
+        if address not in pth.value_store:
+            pth.value_store[address] = self
+        return address
+
+
+    @property
+    def scheduling_hints(self) -> dict[str, dict]:
+        """Scheduling hints of the function and its idempotent dependencies.
+
+        Functions, recreated from augmented source code, get empty hints,
+        so the hints are pickled separately, keyed by function names.
+        """
+        island = pth.all_autonomous_functions[self.island_name]
+        fn_names = set(self.dependencies)
+        fn_names |= set(self.validators or []) | set(self.correctors or [])
+        hints = dict()
+        for fn_name in sorted(fn_names):
+            a_fn = self if fn_name == self.fn_name else island[fn_name]
+            if not isinstance(a_fn, IdempotentFn):
+                continue
+            fn_hints = dict()
+            if not a_fn.resources.is_empty:
+                fn_hints["resources"] = a_fn.resources.as_dict()
+            if a_fn.dag_mode:
+                fn_hints["dag_mode"] = True
+            if len(fn_hints):
+                hints[fn_name] = fn_hints
+        return hints
+
+
     @property
     def augmented_fn_source_code(self) -> str:
         """The augmented source code of the function.
@@ -196,7 +323,11 @@ class IdempotentFn(AutonomousFn):
 
 
     def __getstate__(self):
-        """Return the state of the object for pickling. """
+        """Return the state of the object for pickling.
+
+        Scheduling hints are added to the state only if there are any,
+        and never when the function is hashed to get its address.
+        """
         assert self.perform_runtime_checks()
         draft_state = dict(fn_name=self.fn_name
             , fn_source_code=self.fn_source_code
@@ -206,21 +337,37 @@ class IdempotentFn(AutonomousFn):
             , validators=self.validators
             , correctors=self.correctors
             , class_name=self.__class__.__name__)
+        if getattr(self, "_pickle_scheduling_hints", True):
+            scheduling_hints = self.scheduling_hints
+            if len(scheduling_hints):
+                draft_state["scheduling_hints"] = scheduling_hints
         state = dict()
         for key in sorted(draft_state):
             state[key] = draft_state[key]
         return state
 
     def __setstate__(self, state):
-        """Set the state of the object from a pickled state."""
-        assert len(state) == 8
+        """Set the state of the object from a pickled state.
+
+        The first deserialization of a function in a process registers it
+        (with its augmented code) in its island; later deserializations
+        of the same function are a lookup in _deserialized_functions.
+        States without scheduling hints (also the ones pickled by earlier
+        versions of Pythagoras) get empty hints.
+        """
+        assert len(state) in {8, 9}
         assert state["class_name"] == IdempotentFn.__name__
-        self.fn_name = state["fn_name"]
-        self.fn_source_code = state["fn_source_code"]
-        self.island_name = state["island_name"]
-        self.strictly_autonomous = state["strictly_autonomous"]
-        self.validators = state["validators"]
-        self.correctors = state["correctors"]
+        key = _get_deserialization_key(state)
+        island = (pth.all_autonomous_functions or dict()).get(
+            state["island_name"])
+        if key in _deserialized_functions:
+            registered_island = _deserialized_functions[key]
+            if island is not None and island is registered_island:
+                self._set_deserialized_attributes(state)
+                self.augmented_code_checked = True
+                return
+
+        self._set_deserialized_attributes(state)
         self.augmented_code_checked = False
         register_idempotent_function(self)
 
@@ -229,12 +376,27 @@ class IdempotentFn(AutonomousFn):
         fn_name = self.fn_name
         if island[fn_name]._augmented_source_code is None:
             island[fn_name]._augmented_source_code = state["augmented_fn_source_code"]
-            process_augmented_func_src(state["augmented_fn_source_code"])
+            load_island_module(state["augmented_fn_source_code"])
+            _apply_scheduling_hints(
+                island, state.get("scheduling_hints", dict()))
         else:
             assert state["augmented_fn_source_code"] == (
                 island[fn_name]._augmented_source_code)
 
         self.augmented_code_checked = True
+        _deserialized_functions[key] = island
+
+
+    def _set_deserialized_attributes(self, state):
+        self.fn_name = state["fn_name"]
+        self.fn_source_code = state["fn_source_code"]
+        self.island_name = state["island_name"]
+        self.strictly_autonomous = state["strictly_autonomous"]
+        self.validators = state["validators"]
+        self.correctors = state["correctors"]
+        hints = state.get("scheduling_hints", dict()).get(self.fn_name, dict())
+        self.resources = ExecutionResources.from_dict(hints.get("resources"))
+        self.dag_mode = hints.get("dag_mode", False)
 
 
     def get_address(self, **kwargs) -> IdempotentFnExecutionResultAddr:
@@ -252,6 +414,7 @@ class IdempotentFn(AutonomousFn):
 
         result_address = self.get_address(**kwargs)
         result_address.request_execution()
+        send_wakeup_signal()
         return result_address
 
     def run(self, **kwargs) -> IdempotentFnExecutionResultAddr:
@@ -280,8 +443,12 @@ class IdempotentFn(AutonomousFn):
         _pth_f_addr_ = output_address
         if output_address.ready:
             return output_address.get()
+        if (len(_dag_mode_executions)
+                and _dag_mode_executions[-1] != output_address):
+            output_address.request_execution(dag_mode=True)
+            raise ChildRequestsPending([output_address])
         with IdempotentFnExecutionContext(output_address) as _pth_ec:
-            output_address.request_execution()
+            output_address.request_execution(skip_if_dead_lettered=True)
             _pth_ec.register_execution_attempt()
             pth.run_history.py[output_address + ["source"]] = (
                 self.fn_source_code)
@@ -316,6 +483,7 @@ class IdempotentFn(AutonomousFn):
             new_addr = IdempotentFnExecutionResultAddr(self, kwargs)
             new_addr.request_execution()
             addrs.append(new_addr)
+        send_wakeup_signal()
         return addrs
 
     def run_list(
@@ -347,6 +515,37 @@ class IdempotentFn(AutonomousFn):
 
 
 
+_deserialized_functions: dict[tuple, dict] = dict()
+
+def clear_deserialized_functions() -> None:
+    """Forget functions deserialized in previous sessions."""
+    _deserialized_functions.clear()
+
+
+def _make_hashable(value: Any) -> Any:
+    if isinstance(value, list):
+        return tuple(_make_hashable(v) for v in value)
+    if isinstance(value, dict):
+        return tuple((k, _make_hashable(v)) for k, v in sorted(value.items()))
+    return value
+
+
+def _get_deserialization_key(state: dict) -> tuple:
+    """Hashable version of a pickled state of an IdempotentFn."""
+    return tuple((key, _make_hashable(value)) for key, value in state.items())
+
+
+def _apply_scheduling_hints(island: dict, hints: dict[str, dict]) -> None:
+    """Set pickled scheduling hints on functions, recreated in an island."""
+    for fn_name, fn_hints in hints.items():
+        a_fn = island.get(fn_name)
+        if not isinstance(a_fn, IdempotentFn):
+            continue
+        a_fn.resources = ExecutionResources.from_dict(
+            fn_hints.get("resources"))
+        a_fn.dag_mode = fn_hints.get("dag_mode", False)
+
+
 def register_idempotent_function(a_fn: IdempotentFn) -> None:
     """Register an idempotent function in the Pythagoras system."""
     assert isinstance(a_fn, IdempotentFn)
@@ -356,6 +555,8 @@ def register_idempotent_function(a_fn: IdempotentFn) -> None:
     name = a_fn.fn_name
     if not hasattr(island[name], "_augmented_source_code"):
         island[name]._augmented_source_code = None
+    if not hasattr(island[name], "_address"):
+        island[name]._address = None
 
 
 class IdempotentFnCallSignature:
@@ -372,7 +573,7 @@ class IdempotentFnCallSignature:
         assert isinstance(a_fn, IdempotentFn)
         assert isinstance(arguments, SortedKwArgs)
         self.fn_name = a_fn.fn_name
-        self.fn_addr = ValueAddr(a_fn)
+        self.fn_addr = a_fn.address
         self.args_addr = ValueAddr(arguments.pack())
 
 
@@ -429,16 +630,139 @@ class IdempotentFnExecutionResultAddr(HashAddr):
         return self._result
 
 
-    def request_execution(self):
+    def execute_in_dag_mode(self) -> bool:
+        """Execute the function without executing nested calls in-process.
+
+        A nested call to an idempotent function that misses the cache
+        is swarmed as a child request (also in DAG mode), and the execution
+        is suspended right away, so that users' code never gets
+        a missing result: the request stays in the queue, and it is
+        picked up again once its child is complete.
+
+        Returns True if the result is ready, False if the execution
+        has been suspended.
+        """
+        _dag_mode_executions.append(self)
+        try:
+            self.execute()
+            return True
+        except ChildRequestsPending as e:
+            self._update_execution_request(waiting_for = [
+                list(c.str_chain) for c in e.children])
+            release_requests([self])
+            send_wakeup_signal()
+            return False
+        finally:
+            _dag_mode_executions.pop()
+
+
+    def request_execution(self, dag_mode: bool | None = None
+            , skip_if_dead_lettered: bool = False):
+        """Put the execution request into the queue.
+
+        Scheduling information (required resources, DAG mode,
+        results of other requests that must be ready before the execution)
+        is stored together with the request. If dag_mode is None,
+        it is taken from the function (if the function is already loaded).
+        Requests, whose results are passed as arguments, are requested too.
+        Raises RequestIsDeadLettered if the request is in the dead-letter
+        queue: use pth.requeue_dead_letter() to retry it.
+        If skip_if_dead_lettered is True, such a request is silently
+        left out of the queue instead (e.g. when the function is called
+        directly, to debug it).
+        """
         if self.ready:
-            pth.execution_requests.delete_if_exists(self)
+            self.drop_execution_request()
         else:
             if self not in pth.execution_requests:
-                pth.execution_requests[self] = True
+                if skip_if_dead_lettered and self.is_dead_lettered:
+                    return
+                self._assert_not_dead_lettered()
+                request = dict()
+                if hasattr(self, "_function"):
+                    resources = self._function.resources
+                    if not resources.is_empty:
+                        request["resources"] = resources.as_dict()
+                    if dag_mode is None:
+                        dag_mode = self._function.dag_mode
+                if dag_mode:
+                    request["dag_mode"] = True
+                futures = SortedKwArgs(**self.arguments).futures
+                futures = [f for f in futures if not f.ready]
+                if len(futures):
+                    request["waiting_for"] = [
+                        list(f.str_chain) for f in futures]
+                    for a_future in futures:
+                        a_future.request_execution()
+                if len(request) == 0:
+                    request = True
+                pth.execution_requests[self] = request
+                notify_requests_submitted([self])
+
+
+    @property
+    def execution_request(self) -> dict:
+        """Scheduling information, stored together with the request."""
+        try:
+            request = pth.execution_requests[self]
+        except Exception:
+            return dict()
+        if not isinstance(request, dict):
+            return dict()
+        return request
+
+
+    def _update_execution_request(self, **kwargs) -> None:
+        request = dict(self.execution_request)
+        request.update(kwargs)
+        pth.execution_requests[self] = request
+
+
+    @property
+    def required_resources(self) -> ExecutionResources:
+        """Resources, requested for the execution of the function.
+
+        The requirements are stored together with the execution request,
+        so that workers can check them without loading the function.
+        """
+        return ExecutionResources.from_dict(
+            self.execution_request.get("resources"))
+
+
+    @property
+    def waits_for_other_requests(self) -> bool:
+        """Indicates if some results, required by the request, are missing."""
+        return self._waits_for_other_requests(self.execution_request)
+
+
+    @property
+    def waits_for_dead_letters(self) -> bool:
+        """Indicates if some results, required by the request, will never
+        be available, because their requests are in the dead-letter queue.
+
+        Workers move such requests to the dead-letter queue too.
+        """
+        for chain in self.execution_request.get("waiting_for", []):
+            an_address = IdempotentFnExecutionResultAddr.from_strings(
+                prefix=chain[0], hash_value=chain[1], assert_readiness=False)
+            if an_address.is_dead_lettered and not an_address.ready:
+                return True
+        return False
+
+
+    @staticmethod
+    def _waits_for_other_requests(request: dict) -> bool:
+        for chain in request.get("waiting_for", []):
+            an_address = IdempotentFnExecutionResultAddr.from_strings(
+                prefix=chain[0], hash_value=chain[1], assert_readiness=False)
+            if not an_address.ready:
+                return True
+        return False
 
 
     def drop_execution_request(self):
         pth.execution_requests.delete_if_exists(self)
+        notify_requests_finished([self])
 
 
     @property
@@ -446,11 +770,37 @@ class IdempotentFnExecutionResultAddr(HashAddr):
         return self in pth.execution_requests
 
 
-    def get(self, timeout: int = None):
+    @property
+    def is_dead_lettered(self) -> bool:
+        return self in pth.dead_letter_queue
+
+
+    def _assert_not_dead_lettered(self) -> None:
+        if self.is_dead_lettered:
+            raise RequestIsDeadLettered(
+                f"{self.fn_name} has failed too many times; "
+                + "use pth.requeue_dead_letter() to retry it")
+
+
+    def get(self, timeout: int = None
+            , help_while_waiting: bool | None = None):
         """Retrieve value, referenced by the address.
 
         If the value is not immediately available, backoff exponentially
         till timeout is exceeded. If timeout is None, keep trying forever.
+        If a coordinator is running, the backoff periods are interrupted
+        as soon as the request is finished.
+
+        If help_while_waiting is True, instead of sleeping, the caller
+        executes pending requests from the queue, preferring the request
+        itself and the requests it depends on. By default, the caller
+        helps only if there are no background workers in the session,
+        and never inside a background worker. Workers only help with
+        requests from their islands that fit free resources of the node.
+        If the request itself fails while the caller executes it,
+        the exception is raised.
+        Raises RequestIsDeadLettered if the request is (or gets)
+        moved to the dead-letter queue.
         """
         if hasattr(self, "_result"):
             return self._result
@@ -461,6 +811,10 @@ class IdempotentFnExecutionResultAddr(HashAddr):
 
         self.request_execution()
 
+        if help_while_waiting is None:
+            help_while_waiting = (pth.n_background_workers == 0
+                and not background_workers.in_worker_process)
+
         start_time, backoff_period = time.time(), 1.0
         stop_time = (start_time + timeout) if timeout else None
         # start_time, stop_time and backoff_period are in seconds
@@ -470,8 +824,15 @@ class IdempotentFnExecutionResultAddr(HashAddr):
                 self._result = pth.value_store[pth.execution_results[self]]
                 self.drop_execution_request()
                 return self._result
+            elif not self.execution_requested:
+                self._assert_not_dead_lettered()
+                self.request_execution()
+            elif help_while_waiting and self._help_with_execution():
+                if stop_time and time.time() > stop_time:
+                    raise TimeoutError
             else:
-                time.sleep(backoff_period)
+                if wait_for_result(self, backoff_period) is None:
+                    time.sleep(backoff_period)
                 backoff_period *= 2.0
                 backoff_period += pth.entropy_infuser.uniform(-0.5, 0.5)
                 if stop_time:
@@ -482,6 +843,66 @@ class IdempotentFnExecutionResultAddr(HashAddr):
                         raise TimeoutError
                 backoff_period = max(1.0, backoff_period)
 
+    def _pending_dependencies(
+            self, max_n_addresses: int = 64
+            ) -> list[IdempotentFnExecutionResultAddr]:
+        """Requests the current request (transitively) waits for."""
+        result = []
+        to_visit = [self]
+        visited = {tuple(self.str_chain)}
+        while len(to_visit) and len(result) < max_n_addresses:
+            an_address = to_visit.pop(0)
+            for chain in an_address.execution_request.get("waiting_for", []):
+                if tuple(chain) in visited:
+                    continue
+                visited.add(tuple(chain))
+                dependency = IdempotentFnExecutionResultAddr.from_strings(
+                    prefix=chain[0], hash_value=chain[1]
+                    , assert_readiness=False)
+                result.append(dependency)
+                to_visit.append(dependency)
+        return result
+
+
+    def _help_with_execution(self) -> bool:
+        """Execute one pending request while waiting for the result.
+
+        The request itself is preferred, then the requests it depends on,
+        then a random request from the queue. Inside a background worker,
+        only requests from the worker's islands are executed.
+        Returns True if some request was executed. If the request itself
+        fails, the exception is re-raised (other failures have
+        already been registered, and those requests will be retried).
+        """
+        island_names = background_workers.worker_island_names
+        candidates = [self] + self._pending_dependencies()
+        candidates = [a for a in candidates if a.needs_execution
+            and address_matches_islands(a, island_names)
+            and a.required_resources.fit_current_node()]
+        if not len(candidates):
+            candidates = find_addresses_needing_execution(
+                16, island_names=island_names)
+        candidates = [a for a in candidates if a.can_be_executed]
+        if not len(candidates):
+            return False
+        if candidates[0] == self:
+            an_address = self
+        else:
+            an_address = pth.entropy_infuser.choice(candidates)
+        try:
+            if an_address.execution_request.get("dag_mode"):
+                an_address.execute_in_dag_mode()
+            else:
+                an_address.execute()
+        except ChildRequestsPending:
+            pass
+        except Exception:
+            if an_address == self:
+                raise
+            # the exception has already been registered
+        return True
+
+
     @property
     def function(self) -> IdempotentFn:
         if hasattr(self, "_function"):
@@ -496,6 +917,14 @@ class IdempotentFnExecutionResultAddr(HashAddr):
         return self.function
 
 
+    @property
+    def fn_addr(self) -> ValueAddr:
+        """Address of the function (including its source code version)."""
+        signature_addr = self.get_ValueAddr()
+        signature = signature_addr.get()
+        return signature.fn_addr
+
+
     @property
     def fn_name(self) -> str:
         signature_addr = self.get_ValueAddr()
@@ -543,28 +972,189 @@ class IdempotentFnExecutionResultAddr(HashAddr):
     def needs_execution(self) -> bool:
         """Indicates if the function is a good candidate for execution.
 
-        Returns False if the result is already available, or if some other
-        process is currently working on it. Otherwise, returns True.
+        Returns False if the result is already available, if some other
+        process is currently working on it, if the request waits for
+        results of other requests, or if it has exceeded
+        MAX_EXECUTION_ATTEMPTS. Otherwise, returns True.
         """
-        DEFAULT_EXECUTION_TIME = 10
-        MAX_EXECUTION_ATTEMPTS = 5
-        # TODO: these should not be constants
         if self.ready:
             return False
+        request = self.execution_request
+        if self._waits_for_other_requests(request):
+            return False
         past_attempts = self.execution_attempts
-        n_past_attempts = len(past_attempts)
-        if n_past_attempts == 0:
+        n_retired_attempts = request.get("n_retired_attempts", 0)
+        n_past_attempts = (self._count_attempts(past_attempts)
+            - n_retired_attempts)
+        if n_past_attempts <= 0:
             return True
         if n_past_attempts > MAX_EXECUTION_ATTEMPTS:
-            #TODO: log this event. Should we have DLQ?
+            return False
+        if not self._execution_lease_is_active(
+                past_attempts, n_retired_attempts):
+            return True
+        return self._last_execution_attempt_is_abandoned(past_attempts)
+
+
+    @property
+    def attempts_are_exhausted(self) -> bool:
+        """Indicates if the request has exceeded MAX_EXECUTION_ATTEMPTS.
+
+        Workers move such requests to the dead-letter queue.
+        """
+        if self.ready:
+            return False
+        n_retired_attempts = self.execution_request.get(
+            "n_retired_attempts", 0)
+        n_past_attempts = (self.count_execution_attempts()
+            - n_retired_attempts)
+        return n_past_attempts > MAX_EXECUTION_ATTEMPTS
+
+
+    @property
+    def execution_in_progress(self) -> bool:
+        """Indicates if some process is currently working on the request.
+
+        An execution attempt holds a lease on the request, which expires
+        after a period that grows exponentially with the number of attempts.
+        """
+        if self.ready:
+            return False
+        past_attempts = self.execution_attempts
+        n_retired_attempts = self.execution_request.get(
+            "n_retired_attempts", 0)
+        if not len(self._leasing_attempts(past_attempts)):
+            return False
+        if self._count_attempts(past_attempts) <= n_retired_attempts:
+            return False
+        if not self._execution_lease_is_active(
+                past_attempts, n_retired_attempts):
+            return False
+        return not self._last_execution_attempt_is_abandoned(past_attempts)
+
+
+    @property
+    def execution_start_time(self) -> float | None:
+        """Timestamp of the latest attempt that holds a lease on the request."""
+        past_attempts = self.execution_attempts
+        leasing_attempts = self._leasing_attempts(past_attempts)
+        if not len(leasing_attempts):
+            return None
+        return max(past_attempts.mtimestamp(a) for a in leasing_attempts)
+
+
+    @property
+    def is_straggling(self) -> bool:
+        """Indicates if a live execution takes much longer than usual.
+
+        Such requests are good candidates for speculative re-execution,
+        unless they already have a live speculative attempt,
+        or MAX_SPECULATIVE_ATTEMPTS of them have been made.
+        """
+        if not self.execution_in_progress:
+            return False
+        past_attempts = self.execution_attempts
+        n_retired_attempts = self.execution_request.get(
+            "n_retired_attempts", 0)
+        if (self._count_attempts(past_attempts) - n_retired_attempts
+                > MAX_EXECUTION_ATTEMPTS):
+            return False
+        if (self._count_speculative_attempts(past_attempts)
+                >= MAX_SPECULATIVE_ATTEMPTS):
+            return False
+        if len(self._live_speculative_attempts(past_attempts)):
+            return False
+        most_recent_timestamp = max(past_attempts.mtimestamp(a)
+            for a in self._leasing_attempts(past_attempts))
+        return execution_is_straggling(
+            attempt_age = time.time() - most_recent_timestamp
+            , median_duration = get_median_execution_duration(self.prefix))
+
+
+    @property
+    def holds_earliest_speculative_attempt(self) -> bool:
+        """Check if the speculative attempt, claimed by the current process,
+        is the earliest live speculative attempt of the request.
+
+        Several idle workers can pick the same straggler at the same time.
+        All of them see the same ranking, so exactly one claim survives.
+        """
+        session_id = _claimed_execution_sessions.get(tuple(self.str_chain))
+        if session_id is None:
+            return False
+        own_attempt = session_id + SPECULATIVE_ATTEMPT_SUFFIX
+        live_attempts = self._live_speculative_attempts(
+            self.execution_attempts, keep = own_attempt)
+        return len(live_attempts) > 0 and live_attempts[0][-1] == own_attempt
+
+
+    @staticmethod
+    def _count_speculative_attempts(past_attempts: PersiDict) -> int:
+        return sum(1 for k in
+            IdempotentFnExecutionResultAddr._leasing_attempts(past_attempts)
+            if k[-1].endswith(SPECULATIVE_ATTEMPT_SUFFIX))
+
+
+    def _live_speculative_attempts(self, past_attempts: PersiDict
+            , keep: str | None = None) -> list:
+        """Keys of speculative attempts that are not abandoned, earliest first.
+
+        The attempt named keep is listed even if it looks abandoned.
+        """
+        timestamps = {a: past_attempts.mtimestamp(a)
+            for a in self._leasing_attempts(past_attempts)
+            if a[-1].endswith(SPECULATIVE_ATTEMPT_SUFFIX)}
+        result = []
+        for a in sorted(timestamps, key=lambda a: (timestamps[a], a[-1])):
+            if a[-1] != keep:
+                try:
+                    attempt = past_attempts[a]
+                except KeyError:
+                    continue
+                if attempt_is_abandoned(attempt
+                        , attempt_timestamp = timestamps[a]
+                        , task = list(self.str_chain)):
+                    continue
+            result.append(a)
+        return result
+
+
+    @staticmethod
+    def _execution_lease_is_active(
+            past_attempts: PersiDict, n_retired_attempts: int = 0) -> bool:
+        n_past_attempts = (IdempotentFnExecutionResultAddr._count_attempts(
+            past_attempts) - n_retired_attempts)
+        leasing_attempts = IdempotentFnExecutionResultAddr._leasing_attempts(
+            past_attempts)
+        if not len(leasing_attempts):
             return False
         most_recent_timestamp = max(
-            past_attempts.mtimestamp(a) for a in past_attempts)
+            past_attempts.mtimestamp(a) for a in leasing_attempts)
         current_timestamp = time.time()
         if (current_timestamp - most_recent_timestamp
                 > DEFAULT_EXECUTION_TIME*(2**n_past_attempts)):
+            return False
+        return True
+
+
+    def _last_execution_attempt_is_abandoned(
+            self, past_attempts: PersiDict) -> bool:
+        """Check if the process behind the latest attempt is gone.
+
+        This is determined based on heartbeats of sessions and workers.
+        """
+        timestamps = {a: past_attempts.mtimestamp(a)
+            for a in self._leasing_attempts(past_attempts)}
+        if not len(timestamps):
             return True
-        return False
+        last_attempt_key = max(timestamps, key=timestamps.get)
+        try:
+            last_attempt = past_attempts[last_attempt_key]
+        except Exception:
+            return False
+        return attempt_is_abandoned(last_attempt
+            , attempt_timestamp = timestamps[last_attempt_key]
+            , task = list(self.str_chain))
 
 
 
@@ -572,6 +1162,8 @@ class IdempotentFnExecutionResultAddr(HashAddr):
     def execution_records(self) -> list[IdempotentFnExecutionRecord]:
         result = []
         for k in self.execution_attempts:
+            if k[-1].endswith(RELEASED_ATTEMPT_SUFFIX):
+                continue
             run_id = k[-1][:-2]
             result.append(IdempotentFnExecutionRecord(self,run_id))
         return result
@@ -583,6 +1175,33 @@ class IdempotentFnExecutionResultAddr(HashAddr):
         attempts = pth.run_history.json.get_subdict(attempts_path)
         return attempts
 
+
+    def count_execution_attempts(self) -> int:
+        """Number of execution attempts.
+
+        Speculative attempts and attempts of suspended (DAG-mode)
+        executions are not counted.
+        """
+        return self._count_attempts(self.execution_attempts)
+
+
+    @staticmethod
+    def _leasing_attempts(past_attempts: PersiDict) -> list:
+        """Keys of attempts, whose leases have not been released."""
+        keys = list(past_attempts)
+        released = {k[-1][:-len(RELEASED_ATTEMPT_SUFFIX)] for k in keys
+            if k[-1].endswith(RELEASED_ATTEMPT_SUFFIX)}
+        return [k for k in keys
+            if not k[-1].endswith(RELEASED_ATTEMPT_SUFFIX)
+                and k[-1][:-len(RELEASED_ATTEMPT_SUFFIX)] not in released]
+
+
+    @staticmethod
+    def _count_attempts(past_attempts: PersiDict) -> int:
+        return sum(1 for k in
+            IdempotentFnExecutionResultAddr._leasing_attempts(past_attempts)
+            if not k[-1].endswith(SPECULATIVE_ATTEMPT_SUFFIX))
+
     @property
     def last_execution_attempt(self) -> Any:
         attempts = self.execution_attempts
@@ -652,15 +1271,25 @@ class IdempotentFnExecutionResultAddr(HashAddr):
         return result
 
 
+_claimed_execution_sessions: dict[tuple, str] = dict()
+_dag_mode_executions: list[IdempotentFnExecutionResultAddr] = []
+
 class IdempotentFnExecutionContext:
     session_id: str
     fn_address: IdempotentFnExecutionResultAddr
     output_capturer = OutputCapturer
     exception_counter: int
     event_counter: int
+    attempt_claimed: bool
 
     def __init__(self, f_address: IdempotentFnExecutionResultAddr):
-        self.session_id = get_random_signature()
+        claimed_session_id = _claimed_execution_sessions.pop(
+            tuple(f_address.str_chain), None)
+        self.attempt_claimed = claimed_session_id is not None
+        if self.attempt_claimed:
+            self.session_id = claimed_session_id
+        else:
+            self.session_id = get_random_signature()
         self.fn_address = f_address
         self.output_capturer = OutputCapturer()
         self.exception_counter = 0
@@ -673,6 +1302,10 @@ class IdempotentFnExecutionContext:
     def __exit__(self, exc_type, exc_value, trace_back):
         self.output_capturer.__exit__(exc_type, exc_value, traceback)
 
+        if exc_type is not None and issubclass(exc_type, ChildRequestsPending):
+            self.unregister_execution_attempt()
+            return
+
         output_id = self.session_id+"_o"
         execution_outputs = self.fn_address.execution_outputs
         execution_outputs[output_id] = self.output_capturer.get_output()
@@ -681,10 +1314,81 @@ class IdempotentFnExecutionContext:
             exc_type=exc_type, exc_value=exc_value, trace_back=trace_back)
 
 
+    @staticmethod
+    def claim_execution_attempts(
+            addresses: list[IdempotentFnExecutionResultAddr]
+            , speculative: bool = False) -> None:
+        """Register execution attempts for a batch of addresses at once.
+
+        Subsequent executions of these addresses in the current process
+        reuse the claimed attempts instead of registering new ones.
+        Speculative attempts (copies of straggling executions)
+        are marked as such, and they do not count towards
+        MAX_EXECUTION_ATTEMPTS.
+        """
+        environment_summary = build_execution_environment_summary()
+        environment_summary.update(get_current_heartbeat_tags())
+        attempt_suffix = "_a"
+        if speculative:
+            environment_summary["speculative"] = True
+            attempt_suffix = SPECULATIVE_ATTEMPT_SUFFIX
+        for address in addresses:
+            session_id = get_random_signature()
+            address.execution_attempts[session_id + attempt_suffix] = (
+                environment_summary)
+            _claimed_execution_sessions[tuple(address.str_chain)] = session_id
+
+
+    @staticmethod
+    def withdraw_claimed_execution_attempts(
+            addresses: list[IdempotentFnExecutionResultAddr]) -> None:
+        """Release leases of claimed attempts that will not be executed."""
+        environment_summary = build_execution_environment_summary()
+        for address in addresses:
+            session_id = _claimed_execution_sessions.pop(
+                tuple(address.str_chain), None)
+            if session_id is None:
+                continue
+            address.execution_attempts[
+                session_id + RELEASED_ATTEMPT_SUFFIX] = environment_summary
+
+
+    @staticmethod
+    def release_claimed_execution_attempts(
+            addresses: list[IdempotentFnExecutionResultAddr] | None = None
+            ) -> None:
+        """Forget claimed attempts that have not been used by executions.
+
+        A claimed attempt is not used if, e.g., the result turned out
+        to be ready already. If addresses is None, all claims are forgotten.
+        """
+        if addresses is None:
+            _claimed_execution_sessions.clear()
+            return
+        for address in addresses:
+            _claimed_execution_sessions.pop(tuple(address.str_chain), None)
+
+
     def register_execution_attempt(self):
+        if self.attempt_claimed:
+            return
+        report_current_task(self.fn_address.str_chain)
         execution_attempts = self.fn_address.execution_attempts
         attempt_id = self.session_id+"_a"
-        execution_attempts[attempt_id] = build_execution_environment_summary()
+        environment_summary = build_execution_environment_summary()
+        environment_summary.update(get_current_heartbeat_tags())
+        execution_attempts[attempt_id] = environment_summary
+
+
+    def unregister_execution_attempt(self):
+        """Release the lease of a suspended execution.
+
+        Attempts can not be deleted from the run history,
+        so a release record is added instead.
+        """
+        release_id = self.session_id + RELEASED_ATTEMPT_SUFFIX
+        self.fn_address.execution_attempts[release_id] = (
+            build_execution_environment_summary())
 
 
     def register_exception(self,exc_type, exc_value, trace_back, **kwargs):
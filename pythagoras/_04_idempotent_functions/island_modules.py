@@ -0,0 +1,159 @@
+"""Precompiled island modules, stored under base_dir.
+
+When a worker deserializes an idempotent function, it has to recreate
+all the autonomous functions from its augmented source code: parse it,
+normalize the source of every function, explore the call graph and compile
+every function. To avoid repeating this work in every process,
+the augmented source code is materialized (once per base_dir) as
+a generated Python module, named after the hash of the augmented source.
+The module contains ready-to-compile function definitions, together with
+their normalized source code and dependencies, and Python caches its
+bytecode in __pycache__. Other processes simply import the module.
+A forkserver can import all island modules of a base_dir in advance
+(see preload_island_modules), then processes forked from it find them
+already imported.
+"""
+
+import ast
+import importlib.util
+import os
+import py_compile
+import sys
+
+from pythagoras._01_foundational_objects.hash_and_random_signatures import (
+    get_hash_signature, get_random_signature)
+from pythagoras._02_ordinary_functions.ordinary_funcs import OrdinaryFn
+from pythagoras._03_autonomous_functions.call_graph_explorer import (
+    explore_call_graph_deep)
+from pythagoras._03_autonomous_functions.pth_available_names_retriever import (
+    retrieve_objs_available_inside_autonomous_functions)
+from pythagoras._04_idempotent_functions.astkeywords_dict_convertors import (
+    convert_astkeywords_to_dict)
+
+import pythagoras as pth
+
+
+ISLAND_MODULES_DIR = "island_modules"
+
+
+def get_island_module_path(augmented_source: str) -> str:
+    module_name = "island_" + get_hash_signature(augmented_source)
+    return os.path.join(pth.base_dir, ISLAND_MODULES_DIR, module_name + ".py")
+
+
+def parse_augmented_source(augmented_source: str) -> list[dict]:
+    """Split augmented source code into descriptions of its functions."""
+    lines = augmented_source.splitlines()
+    tree = ast.parse(augmented_source)
+    functions = []
+    for node in tree.body:
+        assert isinstance(node, ast.FunctionDef), (
+            "The augmented function code can only consist of"
+            " function definitions.")
+        assert len(node.decorator_list)==1 , ("Each of the functions"
+            + " inside augmented function code must have"
+            + " exactly one decorator.")
+        decorator = node.decorator_list[0]
+        assert decorator.func.attr in pth.primary_decorators, (
+            "The only allowed decorators are: "
+            + ", ".join(["@pth." + ad +"()" for ad in pth.primary_decorators]))
+        fn_source_code = "\n".join(lines[node.lineno-1:node.end_lineno]) + "\n"
+        functions.append(dict(fn_name = node.name
+            , decorator = decorator.func.attr
+            , decorator_kwargs = convert_astkeywords_to_dict(decorator.keywords)
+            , fn_source_code = fn_source_code))
+    dependencies = explore_call_graph_deep(
+        [f["fn_source_code"] for f in functions])
+    for f in functions:
+        f["dependencies"] = sorted(dependencies[f["fn_name"]])
+    return functions
+
+
+def build_island_module_source(augmented_source: str) -> str:
+    """Generate the source code of an island module."""
+    functions = parse_augmented_source(augmented_source)
+    module_source = ('"""Island module, generated by Pythagoras.\n\n'
+        + 'Do not edit: it is named after the hash of its augmented source.\n'
+        + '"""\n\n')
+    for f in functions:
+        name = f["fn_name"]
+        module_source += "\n" + f["fn_source_code"].replace(
+            " "+name+"(", " _pth_tmp_"+name+"(", 1) + "\n"
+    module_source += "\nISLAND_FUNCTIONS = " + repr(functions) + "\n"
+    return module_source
+
+
+def save_island_module(augmented_source: str) -> str:
+    """Write an island module (and its bytecode) if it does not exist yet."""
+    path = get_island_module_path(augmented_source)
+    if os.path.isfile(path):
+        return path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + "." + get_random_signature() + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(build_island_module_source(augmented_source))
+    py_compile.compile(tmp_path
+        , cfile=importlib.util.cache_from_source(path), doraise=True)
+    os.replace(tmp_path, path)
+    return path
+
+
+def import_island_module(module_name: str, path: str):
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def preload_island_modules(base_dir: str) -> list[str]:
+    """Import all island modules, generated under base_dir, into sys.modules.
+
+    Returns names of the imported modules.
+    """
+    modules_dir = os.path.join(base_dir, ISLAND_MODULES_DIR)
+    if not os.path.isdir(modules_dir):
+        return []
+    module_names = []
+    for file_name in sorted(os.listdir(modules_dir)):
+        if not (file_name.startswith("island_") and file_name.endswith(".py")):
+            continue
+        module_name = file_name[:-3]
+        path = os.path.join(modules_dir, file_name)
+        sys.modules[module_name] = import_island_module(module_name, path)
+        module_names.append(module_name)
+    return module_names
+
+
+def load_island_module(augmented_source: str) -> None:
+    """Register all functions from augmented source via its island module.
+
+    The functions are registered with their already normalized source code,
+    precomputed dependencies, and function objects, compiled from the module.
+    A module, preloaded from the same path, is used as is.
+    """
+    path = save_island_module(augmented_source)
+    module_name = os.path.basename(path)[:-3]
+    module = sys.modules.get(module_name)
+    if module is None or getattr(module, "__file__", None) != path:
+        module = import_island_module(module_name, path)
+    namespace = module.__dict__
+    namespace.update(retrieve_objs_available_inside_autonomous_functions())
+
+    for f in module.ISLAND_FUNCTIONS:
+        normalized_fn = OrdinaryFn.__new__(OrdinaryFn)
+        normalized_fn.fn_name = f["fn_name"]
+        normalized_fn.fn_source_code = f["fn_source_code"]
+        decorator = pth.primary_decorators[f["decorator"]]
+        a_fn = decorator(**f["decorator_kwargs"])(normalized_fn)
+        island = pth.all_autonomous_functions[a_fn.island_name]
+        namespace[a_fn.fn_name] = island[a_fn.fn_name]
+
+    for f in module.ISLAND_FUNCTIONS:
+        island_name = f["decorator_kwargs"].get(
+            "island_name", pth.default_island_name)
+        island_fn = pth.all_autonomous_functions[island_name][f["fn_name"]]
+        if island_fn._dependencies is None:
+            island_fn._dependencies = f["dependencies"]
+            island_fn._runtime_checks_passed = True
+        if island_fn._compiled_fn is None:
+            island_fn._compiled_fn = namespace["_pth_tmp_" + f["fn_name"]]
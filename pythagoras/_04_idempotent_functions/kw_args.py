@@ -21,22 +21,41 @@ class SortedKwArgs(dict):
             self[k] = value
 
     def unpack(self) -> Dict[str, Any]:
-        """ Restore values based on their hash addresses."""
+        """ Restore values based on their hash addresses.
+
+        Addresses of execution results (futures) are replaced
+        with the results themselves.
+        """
         unpacked_copy = dict()
         for k,v in self.items():
             if isinstance(v, ValueAddr):
                 unpacked_copy[k] = pth.value_store[v]
+            elif isinstance(v, pth.IdempotentFnExecutionResultAddr):
+                unpacked_copy[k] = v.get()
             else:
                 unpacked_copy[k] = v
         return unpacked_copy
 
     def pack(self) -> Dict[str, ValueAddr]:
-        """ Replace values with their hash addresses."""
+        """ Replace values with their hash addresses.
+
+        Addresses of execution results (futures) are kept as they are,
+        their values are substituted only when the arguments are unpacked.
+        """
         packed_copy = dict()
         for k,v in self.items():
-            packed_copy[k] = ValueAddr(v)
+            if isinstance(v, pth.IdempotentFnExecutionResultAddr):
+                packed_copy[k] = v
+            else:
+                packed_copy[k] = ValueAddr(v)
         return packed_copy
 
+    @property
+    def futures(self) -> list:
+        """ Addresses of execution results, passed as arguments."""
+        return [v for v in self.values()
+            if isinstance(v, pth.IdempotentFnExecutionResultAddr)]
+
 
 class PackedKwArgs(SortedKwArgs):
     """ A class that encapsulates keyword arguments for a function call."""
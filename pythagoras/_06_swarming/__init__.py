@@ -1,2 +1,7 @@
 from pythagoras._06_swarming.background_workers import (
     launch_background_worker)
+from pythagoras._06_swarming.dead_letter_queue import (
+    RequestIsDeadLettered, requeue_dead_letter, requeue_dead_letters
+    , purge_dead_letters)
+from pythagoras._06_swarming.execution_limits import (
+    set_default_execution_limits)
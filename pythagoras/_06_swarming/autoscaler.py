@@ -0,0 +1,213 @@
+"""Autoscaling of background workers on the current node.
+
+The autoscaler periodically looks at the depth of the execution queue,
+recent task durations, CPU load and memory usage, and grows or shrinks
+the pool of local background workers between min_n_workers
+and max_n_workers. Each scaling decision is posted as an event
+of type "autoscaling".
+"""
+
+import math
+import threading
+
+import psutil
+
+from pythagoras._01_foundational_objects.hash_and_random_signatures import (
+    get_node_signature)
+from pythagoras._05_events_and_exceptions.global_event_loggers import (
+    register_exception_globally)
+from pythagoras._06_swarming.background_workers import (
+    launch_background_worker)
+from pythagoras._06_swarming.cpu_allocation import build_worker_cpu_policies
+from pythagoras._06_swarming.start_methods import get_worker_context
+
+import pythagoras as pth
+
+
+AUTOSCALING_PERIOD = 5 # seconds
+TARGET_BACKLOG_DURATION = 30 # seconds
+MAX_CPU_LOAD = 0.9 # fraction of logical cores
+MAX_MEMORY_LOAD = 0.85 # fraction of total RAM
+MAX_AUTOSCALING_FAILURES = 10 # consecutive ones, before the autoscaler quits
+MAX_AUTOSCALING_BACKOFF = 300 # seconds
+
+
+def decide_n_workers(
+        n_workers: int
+        , min_n_workers: int
+        , max_n_workers: int
+        , queue_depth: int
+        , cpu_load: float
+        , memory_load: float
+        , cpu_count: int
+        , median_task_duration: float | None = None) -> int:
+    """Decide how many background workers should run on the node.
+
+    cpu_load and memory_load are fractions (0.0 to 1.0) of the node's
+    logical cores and RAM that are currently in use.
+    The pool grows when the queue can not be drained within
+    TARGET_BACKLOG_DURATION seconds, while there are spare cores and memory;
+    it shrinks when the queue is empty or the node is overloaded.
+    The pool can at most double (or lose one worker) in a single step.
+    """
+    assert 0 <= min_n_workers <= max_n_workers
+    target = n_workers
+
+    if memory_load > MAX_MEMORY_LOAD or cpu_load > 1.0:
+        target = n_workers - 1
+    elif queue_depth == 0:
+        target = n_workers - 1
+    elif queue_depth > n_workers:
+        if median_task_duration is None:
+            n_needed = queue_depth
+        else:
+            backlog = queue_depth * median_task_duration
+            n_needed = math.ceil(backlog / TARGET_BACKLOG_DURATION)
+        if n_needed > n_workers and cpu_load < MAX_CPU_LOAD:
+            spare_cores = math.floor(cpu_count * (MAX_CPU_LOAD - cpu_load))
+            n_extra = min(n_needed - n_workers
+                , max(n_workers, 1), max(spare_cores, 1))
+            target = n_workers + n_extra
+
+    target = max(target, min_n_workers)
+    target = min(target, max_n_workers)
+    return target
+
+
+def get_autoscaling_delay(n_failures: int) -> float:
+    """Pause before the next scaling step, after n consecutive failures."""
+    assert n_failures >= 0
+    if n_failures == 0:
+        return AUTOSCALING_PERIOD
+    return min(AUTOSCALING_PERIOD * 2**n_failures, MAX_AUTOSCALING_BACKOFF)
+
+
+def get_median_task_duration() -> float | None:
+    """Median task duration, reported by workers on the current node."""
+    node_id = get_node_signature()
+    durations = []
+    try:
+        all_stats = pth.compute_nodes.json.get_subdict(
+            [node_id, "worker_stats"])
+        for k in all_stats:
+            duration = all_stats[k].get("median_task_duration")
+            if duration is not None:
+                durations.append(duration)
+    except Exception:
+        return None
+    if not len(durations):
+        return None
+    durations.sort()
+    return durations[len(durations)//2]
+
+
+class BackgroundWorkersAutoscaler:
+    """Grows and shrinks the pool of background workers on the node.
+
+    CPU policies (thread limits and optional CPU sets) are derived
+    from max_n_workers, and assigned to new workers in a round-robin way.
+    """
+    def __init__(self, min_n_workers: int, max_n_workers: int
+            , pin_workers: bool = False):
+        assert 0 <= min_n_workers <= max_n_workers
+        self.min_n_workers = min_n_workers
+        self.max_n_workers = max_n_workers
+        self.cpu_policies = build_worker_cpu_policies(
+            max(max_n_workers, 1), pin_workers)
+        self.n_launched_workers = 0
+        self.workers = [] # (process, stop_event) pairs
+        self.ctx = get_worker_context()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def n_workers(self) -> int:
+        self.workers = [(p, e) for (p, e) in self.workers if p.is_alive()]
+        return len(self.workers)
+
+    def _add_worker(self) -> None:
+        stop_event = self.ctx.Event()
+        cpu_policy = self.cpu_policies[
+            self.n_launched_workers % len(self.cpu_policies)]
+        self.n_launched_workers += 1
+        p = launch_background_worker(
+            stop_event=stop_event, cpu_policy=cpu_policy)
+        self.workers.append((p, stop_event))
+
+    def _remove_worker(self) -> None:
+        p, stop_event = self.workers.pop()
+        stop_event.set()
+
+    def scale(self) -> int:
+        """Evaluate the load and adjust the number of workers once."""
+        n_workers = self.n_workers
+        target = decide_n_workers(
+            n_workers = n_workers
+            , min_n_workers = self.min_n_workers
+            , max_n_workers = self.max_n_workers
+            , queue_depth = len(pth.execution_requests)
+            , cpu_load = psutil.getloadavg()[0] / psutil.cpu_count()
+            , memory_load = psutil.virtual_memory().percent / 100
+            , cpu_count = psutil.cpu_count()
+            , median_task_duration = get_median_task_duration())
+        if target != n_workers:
+            pth.post_event["autoscaling"](
+                n_workers_before = n_workers
+                , n_workers_after = target
+                , queue_depth = len(pth.execution_requests))
+        while self.n_workers < target:
+            self._add_worker()
+        while self.n_workers > target:
+            self._remove_worker()
+        return target
+
+    def _run(self) -> None:
+        """Scale periodically; back off, and eventually quit, on failures.
+
+        Every failure is recorded in pth.crash_history.
+        """
+        n_failures = 0
+        while not self._stop.is_set():
+            try:
+                self.scale()
+                n_failures = 0
+            except Exception:
+                if not pth.is_correctly_initialized():
+                    return
+                n_failures += 1
+                register_exception_globally(
+                    autoscaler_failures_in_a_row=n_failures)
+                if n_failures >= MAX_AUTOSCALING_FAILURES:
+                    return
+            self._stop.wait(get_autoscaling_delay(n_failures))
+
+    def start(self) -> None:
+        for n in range(self.min_n_workers):
+            self._add_worker()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        while len(self.workers):
+            self._remove_worker()
+
+
+_autoscaler: BackgroundWorkersAutoscaler | None = None
+
+def start_autoscaler(min_n_workers: int, max_n_workers: int
+        , pin_workers: bool = False) -> None:
+    global _autoscaler
+    stop_autoscaler()
+    _autoscaler = BackgroundWorkersAutoscaler(
+        min_n_workers, max_n_workers, pin_workers)
+    _autoscaler.start()
+
+def stop_autoscaler() -> None:
+    global _autoscaler
+    if _autoscaler is not None:
+        _autoscaler.stop()
+        _autoscaler = None
@@ -1,14 +1,48 @@
-from time import sleep
+import signal
+import socket
+import threading
+import time
 from copy import deepcopy
-from multiprocessing import get_context
 
 from pythagoras._01_foundational_objects.hash_and_random_signatures import (
-    get_node_signature)
+    get_node_signature, get_random_signature)
 
+from pythagoras._06_swarming import heartbeats
+from pythagoras._06_swarming.cpu_allocation import apply_cpu_policy
+from pythagoras._06_swarming.start_methods import (
+    set_worker_start_method, get_worker_context, get_worker_start_settings)
+from pythagoras._06_swarming.heartbeats import HeartbeatWriter
 from pythagoras._06_swarming.output_suppressor import OutputSuppressor
+from pythagoras._06_swarming.execution_limits import (
+    LIMITS_CHECKING_PERIOD, ExecutionLimitsGuard, get_execution_limits
+    , register_limit_violation, start_new_process_group, kill_process_tree)
+from pythagoras._06_swarming.coordinator import (
+    get_pending_requests, lease_requests, release_requests, wait_for_work)
+from pythagoras._06_swarming.dead_letter_queue import (
+    move_to_dead_letter_queue)
+from pythagoras._06_swarming.stragglers import register_execution_duration
+from pythagoras._06_swarming.wakeup_signals import (
+    IdleBackoff, WakeupSignalReceiver)
+from pythagoras._06_swarming.worker_stats import WorkerStats
 import pythagoras as pth
 
 
+WORKER_STATS_SAVING_PERIOD = 10 # seconds
+TARGET_BATCH_DURATION = 2.0 # seconds
+MAX_BATCH_SIZE = 64
+STRAGGLERS_SCANNING_PERIOD = 10 # seconds
+
+# Islands a process may execute requests for, if the process executes
+# requests on behalf of a background worker (None for all islands)
+worker_island_names: list[str] | None = None
+in_worker_process: bool = False
+
+
+def forget_worker_process_settings() -> None:
+    """Mark the current process as not executing requests for a worker."""
+    global in_worker_process, worker_island_names
+    in_worker_process, worker_island_names = False, None
+
 
 def parent_runtime_is_live():
     node_id = get_node_signature()
@@ -21,68 +55,529 @@ def parent_runtime_is_live():
         return False
 
 
-def process_random_execution_request(pth_init_params:dict):
+def list_executions_in_progress(prefix: str) -> list[tuple]:
+    """List requests with a given prefix that are being executed right now.
+
+    Returns (start time, address key, runs on the current node) tuples,
+    sorted by the start time of the executions.
+    """
+    hostname = socket.gethostname()
+    result = []
+    for addr in pth.execution_requests:
+        if addr[0] != prefix:
+            continue
+        an_address = pth.IdempotentFnExecutionResultAddr.from_strings(
+            prefix=addr[0], hash_value=addr[1], assert_readiness=False)
+        start_time = an_address.execution_start_time
+        if start_time is None or not an_address.execution_in_progress:
+            continue
+        last_attempt = an_address.last_execution_attempt
+        on_node = (isinstance(last_attempt, dict)
+            and last_attempt.get("hostname") == hostname)
+        result.append((start_time, tuple(addr), on_node))
+    return sorted(result)
+
+
+def count_executions_in_progress(prefix: str) -> tuple[int, int]:
+    """Count requests with a given prefix that are being executed right now.
+
+    Returns a pair of numbers: executions in progress cluster-wide,
+    and executions in progress on the current node (host).
+    """
+    executions = list_executions_in_progress(prefix)
+    return len(executions), sum(1 for e in executions if e[2])
+
+
+def find_excess_claims(addresses: list) -> list:
+    """Find claimed requests that exceed concurrency limits.
+
+    Several workers can check concurrency limits and claim requests
+    at the same time. So, after claiming, executions in progress
+    are ranked by their start time, and claims ranked beyond the limits
+    are returned, to be withdrawn. All workers see the same ranking,
+    so exactly the earliest claims survive.
+    """
+    excess_claims = []
+    executions_cache = dict()
+    for address in addresses:
+        resources = address.required_resources
+        if not resources.has_concurrency_limits:
+            continue
+        if address.prefix not in executions_cache:
+            executions_cache[address.prefix] = list_executions_in_progress(
+                address.prefix)
+        n_running, n_running_on_node = 0, 0
+        for _, key, on_node in executions_cache[address.prefix]:
+            if key == tuple(address.str_chain):
+                break
+            n_running += 1
+            n_running_on_node += int(on_node)
+        if not resources.concurrency_allows(n_running, n_running_on_node):
+            excess_claims.append(address)
+    return excess_claims
+
+
+def find_excess_speculative_claims(addresses: list) -> list:
+    """Find claimed speculative attempts that duplicate other live ones.
+
+    Only the earliest live speculative attempt of a request survives.
+    """
+    return [a for a in addresses if not a.holds_earliest_speculative_attempt]
+
+
+def prefix_matches_islands(
+        prefix: str, island_names: list[str] | None) -> bool:
+    """Check if an address prefix may belong to one of the islands.
+
+    Address prefixes have a form of function name + "_" + island name.
+    """
+    if island_names is None:
+        return True
+    return any(prefix.endswith("_" + i) for i in island_names)
+
+
+def address_matches_islands(
+        address, island_names: list[str] | None) -> bool:
+    """Check if a request is for a function from one of the islands.
+
+    Both function names and island names may contain underscores,
+    so a prefix alone is ambiguous: the function name is taken from
+    the call signature of the request (the function is not loaded).
+    """
+    if not prefix_matches_islands(address.prefix, island_names):
+        return False
+    if island_names is None:
+        return True
+    return any(address.prefix == address.fn_name + "_" + i
+        for i in island_names)
+
+
+def iterate_queued_requests(page_size: int | None = None
+        , use_coordinator: bool = True):
+    """Keys of queued requests.
+
+    If a coordinator is running, its requests that are not leased
+    are fetched page by page (all at once if page_size is None);
+    otherwise the whole queue on disk is iterated.
+    """
+    offset = 0
+    while use_coordinator:
+        page = get_pending_requests(page_size, offset)
+        if page is None:
+            if offset == 0:
+                break
+            return
+        yield from page
+        if page_size is None or len(page) < page_size:
+            return
+        offset += len(page)
+    yield from pth.execution_requests
+
+
+def find_addresses_needing_execution(
+        max_n_addresses:int|None = None
+        , island_names:list[str]|None = None
+        , include_stragglers:bool = False):
+    """Scan the execution queue for requests that need to be executed.
+
+    Only requests that fit currently free resources of the node,
+    and do not exceed their concurrency limits, are returned.
+    If island_names is provided, only requests for functions
+    from these islands are returned.
+    The scan does not load (unpickle) any functions,
+    so it is safe to run it from a worker's supervising process.
+    If a coordinator is running, only requests that it has not leased
+    to other workers are scanned; otherwise the whole queue on disk is.
+    The scan continues till max_n_addresses candidates are found,
+    or the queue is exhausted.
+    If include_stragglers is True, straggling executions (candidates for
+    speculative re-execution) are returned as well.
+    Requests that have exceeded MAX_EXECUTION_ATTEMPTS, or that wait
+    for results of dead letters, are moved to the dead-letter queue.
+    """
+    candidate_addresses = []
+    n_running_cache = dict()
+    page_size = None
+    if max_n_addresses is not None:
+        page_size = max(64, 4*max_n_addresses)
+    for addr in iterate_queued_requests(
+            page_size, use_coordinator = not include_stragglers):
+        if not prefix_matches_islands(addr[0], island_names):
+            continue
+        new_address = pth.IdempotentFnExecutionResultAddr.from_strings(
+            prefix=addr[0], hash_value=addr[1], assert_readiness=False)
+        if not address_matches_islands(new_address, island_names):
+            continue
+        if not new_address.needs_execution:
+            if new_address.attempts_are_exhausted:
+                if new_address.execution_requested:
+                    move_to_dead_letter_queue(new_address)
+                continue
+            if new_address.waits_for_dead_letters:
+                if new_address.execution_requested:
+                    move_to_dead_letter_queue(
+                        new_address, reason="waits_for_dead_letters")
+                continue
+            if not (include_stragglers and new_address.is_straggling):
+                continue
+        resources = new_address.required_resources
+        if not resources.fit_current_node():
+            continue
+        if resources.has_concurrency_limits:
+            if addr[0] not in n_running_cache:
+                n_running_cache[addr[0]] = count_executions_in_progress(
+                    addr[0])
+            if not resources.concurrency_allows(*n_running_cache[addr[0]]):
+                continue
+        candidate_addresses.append(new_address)
+        if max_n_addresses is not None:
+            if len(candidate_addresses) >= max_n_addresses:
+                break
+    return candidate_addresses
+
+
+def choose_batch_size(median_task_duration: float | None) -> int:
+    """Decide how many requests a worker should claim in one go.
+
+    Short tasks are claimed in batches, so that the overhead of
+    spawning a process, initializing Pythagoras and loading the function
+    is shared by many executions; long tasks are claimed one by one.
+    """
+    if median_task_duration is None:
+        return 1
+    if median_task_duration <= 0:
+        return MAX_BATCH_SIZE
+    batch_size = int(TARGET_BATCH_DURATION / median_task_duration)
+    return max(1, min(batch_size, MAX_BATCH_SIZE))
+
+
+def process_random_execution_request(
+        pth_init_params:dict
+        , stats_queue = None
+        , max_batch_size:int = 1
+        , heartbeat_id:str|None = None
+        , island_names:list[str]|None = None
+        , standalone:bool = False
+        , speculative:bool = False) -> bool:
+    """Execute a randomly chosen batch of requests from the execution queue.
+
+    The batch consists of one randomly chosen request plus
+    up to max_batch_size-1 other requests for the same function.
+    All requests in the batch are claimed together, and then executed
+    back-to-back in the current process. Requests, swarmed in DAG mode,
+    are executed with execute_in_dag_mode().
+
+    Returns True if any request was executed, False if there was nothing to do.
+    If stats_queue is provided, the claimed batch, the start of each
+    execution together with its limits, attempts of nested calls,
+    as well as the pickup latency and the duration of each executed
+    request, are reported through it. heartbeat_id links execution attempts
+    to the heartbeat of the supervising worker. If island_names is provided,
+    only functions from these islands are executed. Standalone workers
+    do not depend on a parent runtime, and they ignore SIGINT.
+    If speculative is True, a single straggling execution
+    may be picked up and executed again.
+    """
+    if standalone:
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
     pth_init_params["n_background_workers"] = 0
     pth_init_params["return_summary_dataframe"] = False
     pth.initialize(**pth_init_params)
+    global in_worker_process, worker_island_names
+    in_worker_process, worker_island_names = True, island_names
+    if heartbeat_id is not None:
+        heartbeats.current_heartbeat_id = heartbeat_id
+    if stats_queue is not None:
+        heartbeats.task_listener = lambda task: stats_queue.put(
+            dict(nested=task))
 
     with OutputSuppressor():
+        if not standalone and not parent_runtime_is_live():
+            return False
 
         candidate_addresses = []
-        while len(candidate_addresses) == 0:
-            random_delay = pth.entropy_infuser.uniform(0.5, 1.5)
-            sleep(random_delay)
-            if not parent_runtime_is_live():
-                return
-            for addr in pth.execution_requests:
-                new_addresses = pth.IdempotentFnExecutionResultAddr.from_strings(
-                    prefix=addr[0], hash_value=addr[1], assert_readiness=False)
-                if not new_addresses.needs_execution:
+        if speculative:
+            max_batch_size = 1
+        for new_address in find_addresses_needing_execution(
+                max(256, 2*max_batch_size), island_names=island_names
+                , include_stragglers=speculative):
+            #TODO: randomize the max number of candidates
+            if not new_address.can_be_executed:
+                continue
+            candidate_addresses.append(new_address)
+
+        if len(candidate_addresses) == 0:
+            return False
+
+        random_address = pth.entropy_infuser.choice(candidate_addresses)
+        batch = [random_address]
+        if random_address.required_resources.is_empty and max_batch_size > 1:
+            fn_addr = random_address.fn_addr
+            for an_address in candidate_addresses:
+                if len(batch) >= max_batch_size:
+                    break
+                if an_address == random_address:
+                    continue
+                if an_address.prefix != random_address.prefix:
                     continue
-                if not new_addresses.can_be_executed:
+                if an_address.fn_addr != fn_addr:
                     continue
+                batch.append(an_address)
 
-                candidate_addresses.append(new_addresses)
-                if len(candidate_addresses) > 256: #TODO: randomize this
-                    break
+        leased = None
+        if not speculative:
+            leased = lease_requests(batch, heartbeat_id)
+        if leased is not None:
+            batch = [a for a in batch if tuple(a.str_chain) in leased]
+            if len(batch) == 0:
+                return False
+
+        pickup_time = time.time()
+        pickup_latencies = []
+        for an_address in batch:
+            try:
+                pickup_latencies.append(pickup_time
+                    - pth.execution_requests.mtimestamp(an_address))
+            except Exception:
+                pickup_latencies.append(None)
+
+        if stats_queue is not None:
+            stats_queue.put(dict(claimed=[list(a.str_chain) for a in batch]))
+        pth.IdempotentFnExecutionContext.claim_execution_attempts(
+            batch, speculative=speculative)
+        excess_claims = find_excess_claims(batch)
+        if speculative:
+            excess_claims += [a for a in find_excess_speculative_claims(batch)
+                if a not in excess_claims]
+        if len(excess_claims):
+            pth.IdempotentFnExecutionContext.withdraw_claimed_execution_attempts(
+                excess_claims)
+            release_requests(excess_claims)
+            kept = [a not in excess_claims for a in batch]
+            pickup_latencies = [l for l, k in zip(pickup_latencies, kept) if k]
+            batch = [a for a, k in zip(batch, kept) if k]
+            if len(batch) == 0:
+                return False
+
+        try:
+            for an_address, pickup_latency in zip(batch, pickup_latencies):
+                if stats_queue is not None:
+                    stats_queue.put(dict(started=list(an_address.str_chain)
+                        , limits=get_execution_limits(
+                            an_address.required_resources)))
+                task_start = time.time()
+                finished = False
+                try:
+                    if an_address.execution_request.get("dag_mode"):
+                        finished = an_address.execute_in_dag_mode()
+                    else:
+                        an_address.execute()
+                        finished = True
+                except Exception:
+                    if len(batch) == 1:
+                        raise
+                    # the exception has already been registered,
+                    # the request will be retried later
+                duration = time.time() - task_start
+                if finished:
+                    register_execution_duration(an_address.prefix, duration)
+                if stats_queue is not None:
+                    stats_queue.put(dict(pickup_latency=pickup_latency
+                        , duration=duration))
+        finally:
+            pth.IdempotentFnExecutionContext.release_claimed_execution_attempts(
+                batch)
+        return True
 
-        random_address = pth.entropy_infuser.choice(candidate_addresses)
-        random_address.execute()
 
+def execute_requests_in_process_group(**kwargs) -> bool:
+    """Run process_random_execution_request() as a process group leader.
 
-def background_worker(pth_init_params:dict):
+    It is the target of executor subprocesses of background workers:
+    if an execution violates its limits, the worker kills the whole group.
+    """
+    start_new_process_group()
+    return process_random_execution_request(**kwargs)
+
+
+def read_executor_messages(stats_queue, current_tasks: list | None
+        , limits_guard: ExecutionLimitsGuard, stats: WorkerStats
+        ) -> tuple[list | None, bool]:
+    """Read all messages, sent by a worker's executor subprocess so far.
+
+    Returns the updated list of tasks the subprocess is working on
+    (None while the subprocess has not reported its claimed batch yet),
+    and whether the subprocess has finished executing any task.
+    Must be called right before every heartbeat of the worker, otherwise
+    a heartbeat could miss attempts that have already been claimed.
+    """
+    task_executed = False
+    while not stats_queue.empty():
+        message = stats_queue.get()
+        if "claimed" in message:
+            current_tasks = message["claimed"]
+        elif "nested" in message:
+            current_tasks = list(current_tasks or []) + [message["nested"]]
+        elif "started" in message:
+            limits_guard.start_task(message["started"], message["limits"])
+        else:
+            stats.register_task(**message)
+            task_executed = True
+    return current_tasks, task_executed
+
+
+def background_worker(pth_init_params:dict
+        , stop_event = None
+        , island_names:list[str]|None = None
+        , standalone:bool = False
+        , cpu_policy:dict|None = None
+        , start_settings:dict|None = None):
+    """Keep spawning subprocesses that execute requests from the queue.
+
+    While there is work in the queue, requests are picked up immediately.
+    If there is nothing else to do, the worker starts speculative copies
+    of straggling executions.
+    When the queue is empty, the worker backs off exponentially,
+    and wakes up early if it receives a signal from swarm()
+    (or a notification from the coordinator, if one is running).
+    The worker exits once stop_event (if provided) is set.
+
+    Executions that exceed their time or memory limits are killed.
+    A regular worker exits when its parent session ends. A standalone
+    worker does not depend on any parent session; it finishes
+    its current task and exits when it receives SIGTERM. It ignores
+    SIGINT (e.g. Ctrl-C, which is sent to the whole process group):
+    its parent handles it and sets stop_event.
+
+    cpu_policy contains thread limits and (optionally) a CPU set
+    for the worker, see apply_cpu_policy(). start_settings define
+    how the worker starts its subprocesses, see set_worker_start_method().
+    """
+    if standalone:
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if cpu_policy is not None:
+        apply_cpu_policy(**cpu_policy)
+    if start_settings is not None:
+        set_worker_start_method(**start_settings)
     pth_init_params["n_background_workers"] = 0
     pth_init_params["return_summary_dataframe"] = False
     pth.initialize(**pth_init_params)
-    subpr_kwargs = dict(pth_init_params=pth_init_params)
 
-    ctx = get_context("spawn")
+    ctx = get_worker_context()
+    stats_queue = ctx.SimpleQueue()
+    node_id = get_node_signature()
+    worker_id = get_random_signature()
+    subpr_kwargs = dict(pth_init_params=pth_init_params
+        , stats_queue=stats_queue, heartbeat_id=worker_id
+        , island_names=island_names, standalone=standalone)
+
+    terminating = threading.Event()
+    if standalone:
+        signal.signal(signal.SIGTERM, lambda *_: terminating.set())
 
-    with OutputSuppressor():
-        while True:
-            random_delay = pth.entropy_infuser.uniform(0.1, 0.5)
-            sleep(random_delay)
-            if not parent_runtime_is_live():
-                return
-            p = ctx.Process(
-                target=process_random_execution_request
-                , kwargs=subpr_kwargs)
-            p.start()
-            p.join()
+    heartbeat = HeartbeatWriter(role="worker", heartbeat_id=worker_id)
+    stats = WorkerStats()
+    backoff = IdleBackoff()
+    last_saving_time = time.time()
+    last_stragglers_scan = time.time()
+
+    with OutputSuppressor(), WakeupSignalReceiver() as wakeup_receiver:
+        try:
+            while True:
+                if not standalone and not parent_runtime_is_live():
+                    return
+                if stop_event is not None and stop_event.is_set():
+                    return
+                if terminating.is_set():
+                    return
+                heartbeat.beat(current_tasks=[])
+                task_executed = False
+                work_found = len(find_addresses_needing_execution(
+                    1, island_names=island_names)) > 0
+                speculative = False
+                if not work_found and (time.time() - last_stragglers_scan
+                        > STRAGGLERS_SCANNING_PERIOD):
+                    last_stragglers_scan = time.time()
+                    speculative = len(find_addresses_needing_execution(1
+                        , island_names=island_names
+                        , include_stragglers=True)) > 0
+                if work_found or speculative:
+                    subpr_kwargs["speculative"] = speculative
+                    subpr_kwargs["max_batch_size"] = choose_batch_size(
+                        stats.median_task_duration)
+                    p = ctx.Process(
+                        target=execute_requests_in_process_group
+                        , kwargs=subpr_kwargs)
+                    p.start()
+                    current_tasks = None # unknown till the subprocess reports
+                    limits_guard = ExecutionLimitsGuard()
+                    while True:
+                        p.join(LIMITS_CHECKING_PERIOD)
+                        current_tasks, executed = read_executor_messages(
+                            stats_queue, current_tasks, limits_guard, stats)
+                        task_executed |= executed
+                        if not p.is_alive():
+                            current_tasks, executed = read_executor_messages(
+                                stats_queue, current_tasks, limits_guard, stats)
+                            task_executed |= executed
+                            break
+                        violation = limits_guard.find_violation(p.pid)
+                        if violation is not None:
+                            kill_process_tree(p)
+                            p.join()
+                            register_limit_violation(
+                                limits_guard.task, violation)
+                            task_executed = True
+                            break
+                        current_tasks, executed = read_executor_messages(
+                            stats_queue, current_tasks, limits_guard, stats)
+                        task_executed |= executed
+                        heartbeat.beat_if_due(current_tasks=current_tasks)
+
+                if task_executed:
+                    backoff.reset()
+                else:
+                    idle_start = time.time()
+                    delay = backoff.next_delay()
+                    woken_up = wait_for_work(delay)
+                    if woken_up is None:
+                        woken_up = wakeup_receiver.wait(delay)
+                    stats.register_idle_period(
+                        time.time() - idle_start, woken_up=woken_up)
+                    if woken_up:
+                        backoff.reset()
+
+                if (time.time() - last_saving_time
+                        > WORKER_STATS_SAVING_PERIOD):
+                    pth.compute_nodes.json[
+                        node_id, "worker_stats", worker_id] = stats.as_dict()
+                    last_saving_time = time.time()
+        finally:
+            heartbeat.remove()
 
 
 
-def launch_background_worker(pth_init_params:dict | None = None):
+def launch_background_worker(
+        pth_init_params:dict | None = None
+        , stop_event = None
+        , island_names:list[str] | None = None
+        , standalone:bool = False
+        , cpu_policy:dict | None = None):
     if pth_init_params is None:
         pth_init_params = deepcopy(pth.initialization_parameters)
 
     pth_init_params["n_background_workers"] = 0
     pth_init_params["runtime_id"] = pth.runtime_id
 
-    ctx = get_context("spawn")
+    ctx = get_worker_context()
 
     subpr_kwargs = dict(
-        pth_init_params = pth_init_params)
+        pth_init_params = pth_init_params
+        , stop_event = stop_event
+        , island_names = island_names
+        , standalone = standalone
+        , cpu_policy = cpu_policy
+        , start_settings = get_worker_start_settings())
     p = ctx.Process(target=background_worker, kwargs=subpr_kwargs)
     p.start()
-    return p
\ No newline at end of file
+    return p
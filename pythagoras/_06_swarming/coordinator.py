@@ -0,0 +1,450 @@
+"""Optional coordinator: a low-latency broker for execution requests.
+
+Without a coordinator, sessions and background workers communicate
+only through the filesystem: workers poll pth.execution_requests,
+and get() polls pth.execution_results. A coordinator is a process that
+keeps the queue of pending requests, short-term leases and readiness
+notifications in memory, and serves them over a Unix or TCP socket:
+
+    python -m pythagoras.coordinator --base-dir /shared/pth
+    python -m pythagoras.coordinator --base-dir /shared/pth --address 0.0.0.0:7077
+    python -m pythagoras.coordinator --base-dir /shared/pth \
+        --address 0.0.0.0:7077 --advertise-address pth-head.example.com
+
+The filesystem stays the source of truth. Requests and results
+are still persisted to the usual stores before the coordinator
+is notified, and the coordinator re-synchronizes its queue
+with pth.execution_requests every RESYNC_PERIOD seconds.
+A running coordinator registers itself in pth.compute_nodes;
+sessions and workers discover it there. A coordinator that listens
+on all interfaces (0.0.0.0) registers the routable address of its host,
+unless an advertised address is provided. If there is no coordinator,
+or it can not be reached, they fall back to the filesystem.
+
+The registration does not contain the coordinator's secret key,
+as everyone who can read base_dir can read the registration.
+The key is kept in a file in the user's home directory (AUTHKEY_PATH),
+readable only by the user; it is created on first use. Nodes that
+do not share the home directory need a copy of this file.
+"""
+
+import os
+import signal
+import socket
+import tempfile
+import threading
+import time
+from multiprocessing.connection import Listener, Client
+
+from pythagoras._01_foundational_objects.hash_and_random_signatures import (
+    get_hash_signature, get_random_signature)
+
+import pythagoras as pth
+
+
+COORDINATOR_LEASE_DURATION = 60 # seconds
+FINISHED_RETENTION_PERIOD = 60 # seconds
+RESYNC_PERIOD = 30 # seconds
+DISCOVERY_PERIOD = 10 # seconds
+
+REGISTRATION_KEY = ["coordinator"]
+AUTHKEY_PATH = os.path.join(
+    os.path.expanduser("~"), ".pythagoras", "coordinator_authkey")
+
+
+def _as_key(address) -> tuple[str, ...]:
+    if hasattr(address, "str_chain"):
+        return tuple(address.str_chain)
+    return tuple(address)
+
+
+def get_coordinator_authkey() -> bytes:
+    """Secret key for connections to coordinators, see AUTHKEY_PATH."""
+    if not os.path.exists(AUTHKEY_PATH):
+        os.makedirs(os.path.dirname(AUTHKEY_PATH), mode=0o700, exist_ok=True)
+        tmp_path = AUTHKEY_PATH + "." + get_random_signature() + ".tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(os.urandom(32).hex())
+        try:
+            os.link(tmp_path, AUTHKEY_PATH) # fails if another process won
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(tmp_path)
+    assert os.stat(AUTHKEY_PATH).st_mode & 0o077 == 0, (
+        f"{AUTHKEY_PATH} must be readable only by its owner")
+    with open(AUTHKEY_PATH) as f:
+        return bytes.fromhex(f.read().strip())
+
+
+class CoordinatorState:
+    """In-memory queue of pending requests, leases and readiness events.
+
+    Keys are tuples of strings (str_chain-s of execution result addresses).
+    All methods are thread-safe; wait_* methods block the calling thread.
+    """
+    def __init__(self):
+        self.pending = dict() # key -> submission time
+        self.leases = dict() # key -> (holder, expiration time)
+        self.finished = dict() # key -> finishing time
+        self.n_submissions = 0
+        self._condition = threading.Condition()
+
+    def _lease_is_active(self, key, now) -> bool:
+        return key in self.leases and self.leases[key][1] > now
+
+    def _prune_finished(self, now) -> None:
+        expired = [k for k, t in self.finished.items()
+            if now - t > FINISHED_RETENTION_PERIOD]
+        for k in expired:
+            del self.finished[k]
+
+    def submit(self, keys: list) -> int:
+        """Add requests to the queue, return the number of new ones."""
+        now = time.time()
+        n_new = 0
+        with self._condition:
+            for key in keys:
+                key = _as_key(key)
+                self.finished.pop(key, None)
+                if key not in self.pending:
+                    self.pending[key] = now
+                    n_new += 1
+            if n_new:
+                self.n_submissions += 1
+                self._condition.notify_all()
+        return n_new
+
+    def finish(self, keys: list) -> None:
+        """Remove requests from the queue and notify those who wait."""
+        now = time.time()
+        with self._condition:
+            for key in keys:
+                key = _as_key(key)
+                self.pending.pop(key, None)
+                self.leases.pop(key, None)
+                self.finished[key] = now
+            self._prune_finished(now)
+            self._condition.notify_all()
+
+    def get_pending(self, max_n: int | None = None, offset: int = 0) -> list:
+        """Pending requests that are not leased, oldest first.
+
+        The first offset of such requests are skipped,
+        so that the queue can be scanned page by page.
+        """
+        now = time.time()
+        result = []
+        with self._condition:
+            for key in self.pending:
+                if self._lease_is_active(key, now):
+                    continue
+                if offset > 0:
+                    offset -= 1
+                    continue
+                result.append(key)
+                if max_n is not None and len(result) >= max_n:
+                    break
+        return result
+
+    def lease(self, keys: list, holder: str | None
+            , duration: float = COORDINATOR_LEASE_DURATION) -> list:
+        """Lease requests to a holder, return the keys actually leased."""
+        now = time.time()
+        result = []
+        with self._condition:
+            for key in keys:
+                key = _as_key(key)
+                if key not in self.pending:
+                    continue
+                if (self._lease_is_active(key, now)
+                        and self.leases[key][0] != holder):
+                    continue
+                self.leases[key] = (holder, now + duration)
+                result.append(key)
+        return result
+
+    def release(self, keys: list) -> None:
+        """Drop leases, so that the requests can be picked up again."""
+        with self._condition:
+            for key in keys:
+                self.leases.pop(_as_key(key), None)
+
+    def wait_for_work(self, timeout: float) -> bool:
+        """Wait till new requests are submitted or timeout expires."""
+        with self._condition:
+            n_submissions = self.n_submissions
+            return self._condition.wait_for(
+                lambda: self.n_submissions != n_submissions, timeout)
+
+    def wait_for_result(self, key, timeout: float) -> bool:
+        """Wait till a request is finished or timeout expires."""
+        key = _as_key(key)
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: key in self.finished, timeout)
+
+    def resync(self, keys_on_disk: list) -> None:
+        """Align the queue with the requests persisted on disk."""
+        keys_on_disk = [_as_key(k) for k in keys_on_disk]
+        on_disk = set(keys_on_disk)
+        self.submit([k for k in keys_on_disk if k not in self.pending])
+        self.finish([k for k in list(self.pending) if k not in on_disk])
+
+    def stats(self) -> dict:
+        now = time.time()
+        with self._condition:
+            n_leased = sum(1 for k in self.pending
+                if self._lease_is_active(k, now))
+            return dict(n_pending = len(self.pending)
+                , n_leased = n_leased
+                , n_recently_finished = len(self.finished))
+
+
+_CALLABLE_METHODS = {"submit", "finish", "get_pending", "lease", "release"
+    , "wait_for_work", "wait_for_result", "stats"}
+
+
+def parse_coordinator_address(address: str | None) -> tuple[str, object]:
+    """Convert "host:port" or a socket path into a (family, address) pair.
+
+    If address is None, a node-local Unix socket is used.
+    """
+    if address is None:
+        dir_suffix = get_hash_signature(pth.base_dir)[:12]
+        address = os.path.join(tempfile.gettempdir()
+            , "pth_coordinator_" + dir_suffix + ".sock")
+    if os.sep not in address and ":" in address:
+        host, port = address.rsplit(":", 1)
+        return "AF_INET", (host, int(port))
+    return "AF_UNIX", address
+
+
+def get_routable_host() -> str:
+    """IP address of the current host, as seen by other nodes."""
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("10.255.255.255", 1)) # no packets are sent
+            return s.getsockname()[0]
+    except OSError:
+        return socket.gethostbyname(socket.gethostname())
+
+
+class CoordinatorServer:
+    """Serves a CoordinatorState over a socket, one thread per connection.
+
+    advertise_address ("host" or "host:port") is the TCP address
+    that other nodes should use to connect to the coordinator.
+    """
+    def __init__(self, address: str | None = None
+            , state: CoordinatorState | None = None
+            , advertise_address: str | None = None):
+        if state is None:
+            state = CoordinatorState()
+        self.state = state
+        self.family, address = parse_coordinator_address(address)
+        if self.family == "AF_UNIX" and os.path.exists(address):
+            os.remove(address)
+        assert advertise_address is None or self.family == "AF_INET"
+        self.advertise_address = advertise_address
+        self.authkey = get_coordinator_authkey()
+        self.listener = Listener(
+            address, family=self.family, authkey=self.authkey)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _build_record(self, wildcard_host: str) -> dict:
+        address = self.listener.address
+        if self.family == "AF_INET":
+            host, port = address
+            if host in ("0.0.0.0", ""):
+                host = wildcard_host
+            address = [host, port]
+        return dict(family = self.family
+            , address = address
+            , pid = os.getpid())
+
+    @property
+    def registration_record(self) -> dict:
+        """Connection details, published for other nodes."""
+        record = self._build_record(wildcard_host = get_routable_host())
+        if self.advertise_address is not None:
+            host, port = self.advertise_address, record["address"][1]
+            if ":" in host:
+                host, port = host.rsplit(":", 1)
+            record["address"] = [host, int(port)]
+        return record
+
+    def _serve_connection(self, connection) -> None:
+        with connection:
+            while not self._stop.is_set():
+                try:
+                    method, args = connection.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    assert method in _CALLABLE_METHODS
+                    response = ("ok", getattr(self.state, method)(*args))
+                except Exception as e:
+                    response = ("error", repr(e))
+                try:
+                    connection.send(response)
+                except OSError:
+                    return
+
+    def _accept_connections(self) -> None:
+        while not self._stop.is_set():
+            try:
+                connection = self.listener.accept()
+            except Exception:
+                continue
+            if self._stop.is_set():
+                connection.close()
+                return
+            threading.Thread(target=self._serve_connection
+                , args=(connection,), daemon=True).start()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._accept_connections, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        try: # unblock accept()
+            CoordinatorClient(self._build_record(
+                wildcard_host = "127.0.0.1")).close()
+        except Exception:
+            pass
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.listener.close()
+
+
+class CoordinatorClient:
+    """A connection to a coordinator, described by its registration record."""
+    def __init__(self, record: dict):
+        address = record["address"]
+        if record["family"] == "AF_INET":
+            address = tuple(address)
+        self.connection = Client(address, family=record["family"]
+            , authkey=get_coordinator_authkey())
+        self._lock = threading.Lock()
+
+    def call(self, method: str, *args):
+        with self._lock:
+            self.connection.send((method, args))
+            status, result = self.connection.recv()
+        assert status == "ok", result
+        return result
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+_client: CoordinatorClient | None = None
+_client_base_dir: str | None = None
+_last_discovery_time: float = 0
+
+def get_coordinator_client() -> CoordinatorClient | None:
+    """Connect to the coordinator, registered for the current base_dir.
+
+    Returns None if no coordinator is available. Discovery is attempted
+    at most once every DISCOVERY_PERIOD seconds.
+    """
+    global _client, _client_base_dir, _last_discovery_time
+    if pth.compute_nodes is None:
+        return None
+    if _client is not None and _client_base_dir == pth.base_dir:
+        return _client
+    forget_coordinator_client()
+    if time.time() - _last_discovery_time < DISCOVERY_PERIOD:
+        return None
+    _last_discovery_time = time.time()
+    try:
+        record = pth.compute_nodes.json[REGISTRATION_KEY]
+        _client = CoordinatorClient(record)
+        _client_base_dir = pth.base_dir
+    except Exception:
+        _client = None
+    return _client
+
+def forget_coordinator_client() -> None:
+    global _client, _client_base_dir
+    if _client is not None:
+        try:
+            _client.close()
+        except Exception:
+            pass
+    _client = None
+    _client_base_dir = None
+
+def reset_coordinator_discovery() -> None:
+    """Forget the current connection and allow immediate re-discovery."""
+    global _last_discovery_time
+    forget_coordinator_client()
+    _last_discovery_time = 0
+
+
+def _call_coordinator(method: str, *args):
+    """Call the coordinator; return None if it is not available."""
+    client = get_coordinator_client()
+    if client is None:
+        return None
+    try:
+        return client.call(method, *args)
+    except Exception:
+        forget_coordinator_client()
+        return None
+
+def notify_requests_submitted(addresses: list) -> None:
+    _call_coordinator("submit", [_as_key(a) for a in addresses])
+
+def notify_requests_finished(addresses: list) -> None:
+    _call_coordinator("finish", [_as_key(a) for a in addresses])
+
+def get_pending_requests(max_n: int | None = None
+        , offset: int = 0) -> list | None:
+    return _call_coordinator("get_pending", max_n, offset)
+
+def lease_requests(addresses: list, holder: str | None) -> list | None:
+    return _call_coordinator("lease", [_as_key(a) for a in addresses], holder)
+
+def release_requests(addresses: list) -> None:
+    _call_coordinator("release", [_as_key(a) for a in addresses])
+
+def wait_for_work(timeout: float) -> bool | None:
+    return _call_coordinator("wait_for_work", timeout)
+
+def wait_for_result(address, timeout: float) -> bool | None:
+    return _call_coordinator("wait_for_result", _as_key(address), timeout)
+
+
+def run_coordinator(base_dir: str
+        , address: str | None = None
+        , cloud_type: str = "local"
+        , advertise_address: str | None = None) -> None:
+    """Run a coordinator for base_dir till SIGTERM / SIGINT is received."""
+    pth.initialize(base_dir = base_dir
+        , cloud_type = cloud_type
+        , n_background_workers = 0
+        , runtime_id = get_random_signature()
+        , return_summary_dataframe = False)
+
+    server = CoordinatorServer(
+        address, advertise_address = advertise_address)
+    server.state.resync(list(pth.execution_requests))
+    server.start()
+    pth.compute_nodes.json[REGISTRATION_KEY] = server.registration_record
+
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopping.set())
+    signal.signal(signal.SIGINT, lambda *_: stopping.set())
+    try:
+        while not stopping.wait(RESYNC_PERIOD):
+            server.state.resync(list(pth.execution_requests))
+    finally:
+        pth.compute_nodes.json.delete_if_exists(REGISTRATION_KEY)
+        server.stop()
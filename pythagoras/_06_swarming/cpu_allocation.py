@@ -0,0 +1,87 @@
+"""Thread limits and CPU affinity for background workers.
+
+Numerical libraries (OpenMP, MKL, OpenBLAS, torch, ...) start
+as many threads as there are cores. With N workers on a node, this results
+in N x cores busy threads, and throughput collapses. Each worker
+therefore limits the thread pools of its executions to its share
+of the node's cores. Optionally, workers are pinned to disjoint sets
+of CPUs.
+
+The limits are applied in the supervising process of a worker, before
+it spawns subprocesses that execute requests, so that these subprocesses
+inherit the environment variables and the CPU affinity at startup,
+before numerical libraries are loaded.
+"""
+
+import os
+
+import psutil
+
+
+THREAD_LIMIT_ENV_VARIABLES = ["OMP_NUM_THREADS", "MKL_NUM_THREADS"
+    , "OPENBLAS_NUM_THREADS", "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS"]
+
+
+def get_available_cpus() -> list[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(psutil.cpu_count()))
+
+
+def choose_n_threads_per_worker(n_cpus: int, n_workers: int) -> int:
+    """Share of CPUs, available to each worker's thread pools."""
+    return max(1, n_cpus // max(n_workers, 1))
+
+
+def choose_cpu_sets(cpus: list[int], n_workers: int) -> list[list[int]]:
+    """Split CPUs into n_workers disjoint contiguous sets.
+
+    If there are fewer CPUs than workers, some workers share CPUs.
+    """
+    assert len(cpus) >= 1
+    assert n_workers >= 1
+    if n_workers >= len(cpus):
+        return [[cpus[i % len(cpus)]] for i in range(n_workers)]
+    set_size, n_larger_sets = divmod(len(cpus), n_workers)
+    cpu_sets, start = [], 0
+    for i in range(n_workers):
+        end = start + set_size + (1 if i < n_larger_sets else 0)
+        cpu_sets.append(cpus[start:end])
+        start = end
+    return cpu_sets
+
+
+def apply_cpu_policy(n_threads: int | None = None
+        , cpu_set: list[int] | None = None) -> None:
+    """Limit thread pools and (optionally) pin the current process.
+
+    Thread limits, explicitly set by users via environment variables,
+    are respected.
+    """
+    if cpu_set is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpu_set)
+        if n_threads is None:
+            n_threads = len(cpu_set)
+    if n_threads is None:
+        return
+    for variable in THREAD_LIMIT_ENV_VARIABLES:
+        os.environ.setdefault(variable, str(n_threads))
+    try:
+        import torch
+        torch.set_num_threads(int(os.environ["OMP_NUM_THREADS"]))
+    except Exception:
+        pass
+
+
+def build_worker_cpu_policies(n_workers: int
+        , pin_workers: bool = False) -> list[dict]:
+    """Thread limits and CPU sets for n_workers workers on the current node.
+
+    Returns a list of kwargs for apply_cpu_policy(), one per worker.
+    """
+    cpus = get_available_cpus()
+    n_threads = choose_n_threads_per_worker(len(cpus), n_workers)
+    if not pin_workers:
+        return [dict(n_threads=n_threads) for _ in range(n_workers)]
+    return [dict(n_threads=min(n_threads, len(cpu_set)), cpu_set=cpu_set)
+        for cpu_set in choose_cpu_sets(cpus, n_workers)]
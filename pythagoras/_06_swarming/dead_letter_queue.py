@@ -0,0 +1,129 @@
+"""Dead-letter queue for execution requests that keep failing.
+
+A request that exceeds MAX_EXECUTION_ATTEMPTS is moved from
+pth.execution_requests into pth.dead_letter_queue, together with
+a short summary of its failures. So is a request that waits for
+results of dead letters (e.g. a DAG-mode parent of a failing child),
+otherwise it would wait forever. Workers do this when they scan
+the queue for requests to claim. This keeps the live queue small,
+so that workers do not re-evaluate poison requests on every scan.
+
+Dead letters can be inspected, put back into the execution queue
+(with a fresh budget of attempts), or purged. Requesting execution
+of a dead letter in any other way (e.g. via swarm() or get())
+raises RequestIsDeadLettered. Calling the function directly still
+executes it in the current process (e.g. to debug it), without putting
+the request back into the queue.
+"""
+
+import time
+
+from pythagoras._06_swarming.coordinator import (
+    notify_requests_submitted, notify_requests_finished)
+from pythagoras._06_swarming.wakeup_signals import send_wakeup_signal
+
+import pythagoras as pth
+
+
+class RequestIsDeadLettered(Exception):
+    """Execution of a request from the dead-letter queue was requested."""
+    pass
+
+
+def build_failure_summary(address, reason: str) -> dict:
+    """Summarize failed execution attempts of a request."""
+    request = address.execution_request
+    last_crash = address.last_crash
+    if isinstance(last_crash, dict):
+        last_crash = repr(last_crash.get("exc_value"))
+    elif last_crash is not None:
+        last_crash = repr(last_crash)
+    return dict(
+        fn_name = address.fn_name
+        , reason = reason
+        , n_attempts = len(address.execution_attempts)
+        , n_crashes = len(address.crashes)
+        , last_crash = last_crash
+        , request = request
+        , moved_at = time.time())
+
+
+def move_to_dead_letter_queue(
+        address, reason: str = "attempts_exhausted") -> None:
+    """Remove a request from the execution queue, keep it as a dead letter.
+
+    reason is either "attempts_exhausted" or "waits_for_dead_letters".
+    """
+    pth.dead_letter_queue[address] = build_failure_summary(address, reason)
+    pth.execution_requests.delete_if_exists(address)
+    notify_requests_finished([address])
+    pth.post_event["dead_letter"](
+        address = list(address.str_chain)
+        , reason = reason
+        , n_attempts = len(address.execution_attempts))
+
+
+def _select_dead_letters(fn_name: str | None = None) -> list:
+    selected = []
+    for key in pth.dead_letter_queue:
+        if fn_name is not None:
+            if pth.dead_letter_queue[key].get("fn_name") != fn_name:
+                continue
+        selected.append(key)
+    return selected
+
+
+def _requeue(address) -> bool:
+    try:
+        summary = pth.dead_letter_queue[address]
+    except KeyError:
+        return False
+    request = summary.get("request")
+    request = dict(request) if isinstance(request, dict) else dict()
+    request["n_retired_attempts"] = address.count_execution_attempts()
+    pth.execution_requests[address] = request
+    pth.dead_letter_queue.delete_if_exists(address)
+    return True
+
+
+def requeue_dead_letter(address) -> bool:
+    """Put one dead letter back into the execution queue.
+
+    Past attempts of the request are retired, so it gets
+    MAX_EXECUTION_ATTEMPTS more attempts.
+    Returns False if the address is not in the dead-letter queue.
+    """
+    if not _requeue(address):
+        return False
+    notify_requests_submitted([address])
+    send_wakeup_signal()
+    return True
+
+
+def requeue_dead_letters(fn_name: str | None = None) -> int:
+    """Put dead letters back into the execution queue.
+
+    If fn_name is provided, only requests for this function are requeued.
+    Returns the number of requeued requests.
+    """
+    requeued = []
+    for key in _select_dead_letters(fn_name):
+        address = pth.IdempotentFnExecutionResultAddr.from_strings(
+            prefix=key[0], hash_value=key[1], assert_readiness=False)
+        if _requeue(address):
+            requeued.append(address)
+    if len(requeued):
+        notify_requests_submitted(requeued)
+        send_wakeup_signal()
+    return len(requeued)
+
+
+def purge_dead_letters(fn_name: str | None = None) -> int:
+    """Delete dead letters; return the number of deleted requests.
+
+    If fn_name is provided, only requests for this function are deleted.
+    """
+    selected = _select_dead_letters(fn_name)
+    for key in selected:
+        pth.dead_letter_queue.delete_if_exists(key)
+    return len(selected)
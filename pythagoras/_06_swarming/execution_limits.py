@@ -0,0 +1,167 @@
+"""Wall-clock and memory limits for executions in background workers.
+
+Limits are set per function (time_limit and memory_limit_gb parameters
+of the idempotent decorator), or globally for the whole base_dir
+via set_default_execution_limits(). Function-level limits take precedence.
+
+Limits are enforced from outside: the supervising process of a worker
+watches the process that executes requests, and kills it once the current
+execution runs for too long, or once the process (with its children)
+uses too much memory. The process that executes requests leads its own
+process group, so that processes started by the executed functions
+are killed too. The violation is recorded as a crash of the request,
+and the request is retried like after any other crash.
+Standalone workers are regular background workers, so the same limits
+apply to them.
+"""
+
+import os
+import signal
+import time
+
+import psutil
+
+from pythagoras._01_foundational_objects.hash_and_random_signatures import (
+    get_random_signature)
+from pythagoras._05_events_and_exceptions.current_date_gmt_str import (
+    current_date_gmt_string)
+from pythagoras._05_events_and_exceptions.execution_environment_summary import (
+    add_execution_environment_summary)
+
+import pythagoras as pth
+
+
+LIMITS_CHECKING_PERIOD = 1 # seconds
+
+DEFAULT_LIMITS_KEY = ["default_execution_limits"]
+
+
+def set_default_execution_limits(time_limit: float | None = None
+        , memory_limit_gb: float | None = None) -> None:
+    """Set limits for all functions that do not define their own ones."""
+    assert time_limit is None or time_limit > 0
+    assert memory_limit_gb is None or memory_limit_gb > 0
+    limits = dict()
+    if time_limit is not None:
+        limits["time_limit"] = time_limit
+    if memory_limit_gb is not None:
+        limits["memory_limit_gb"] = memory_limit_gb
+    if len(limits):
+        pth.compute_nodes.json[DEFAULT_LIMITS_KEY] = limits
+    else:
+        pth.compute_nodes.json.delete_if_exists(DEFAULT_LIMITS_KEY)
+
+
+def get_default_execution_limits() -> dict:
+    try:
+        return dict(pth.compute_nodes.json[DEFAULT_LIMITS_KEY])
+    except Exception:
+        return dict()
+
+
+def get_execution_limits(resources) -> dict:
+    """Combine limits of a function (ExecutionResources) with global ones."""
+    limits = get_default_execution_limits()
+    if resources.time_limit is not None:
+        limits["time_limit"] = resources.time_limit
+    if resources.memory_limit_gb is not None:
+        limits["memory_limit_gb"] = resources.memory_limit_gb
+    return limits
+
+
+def get_process_memory_gb(pid: int) -> float:
+    """Resident memory of a process and all its children."""
+    process = psutil.Process(pid)
+    rss = process.memory_info().rss
+    for child in process.children(recursive=True):
+        try:
+            rss += child.memory_info().rss
+        except psutil.Error:
+            pass
+    return rss / 2**30
+
+
+def start_new_process_group() -> None:
+    """Make the current process a leader of a new session / process group.
+
+    All processes it starts join the group (unless they leave it
+    on purpose), so that kill_process_tree() can kill all of them.
+    """
+    if hasattr(os, "setsid"):
+        try:
+            os.setsid()
+        except OSError:
+            pass # already a group leader
+
+
+def kill_process_tree(process) -> None:
+    """Kill a process, together with its process group and descendants."""
+    try:
+        descendants = psutil.Process(process.pid).children(recursive=True)
+    except psutil.Error:
+        descendants = []
+    if hasattr(os, "killpg"):
+        try:
+            if os.getpgid(process.pid) == process.pid:
+                os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            pass
+    process.kill()
+    for descendant in descendants:
+        try:
+            descendant.kill()
+        except psutil.Error:
+            pass
+
+
+class ExecutionLimitsGuard:
+    """Watches the execution, currently running in a worker's subprocess."""
+    def __init__(self):
+        self.task = None
+        self.start_time = None
+        self.limits = dict()
+
+    def start_task(self, task: list[str], limits: dict) -> None:
+        self.task = task
+        self.start_time = time.time()
+        self.limits = limits
+
+    def find_violation(self, pid: int) -> str | None:
+        """Describe a violated limit, or return None if all limits hold."""
+        if self.task is None:
+            return None
+        time_limit = self.limits.get("time_limit")
+        if time_limit is not None:
+            duration = time.time() - self.start_time
+            if duration > time_limit:
+                return (f"Execution time limit of {time_limit} seconds"
+                    + f" exceeded ({duration:.1f} seconds)")
+        memory_limit_gb = self.limits.get("memory_limit_gb")
+        if memory_limit_gb is not None:
+            try:
+                memory_gb = get_process_memory_gb(pid)
+            except psutil.Error:
+                return None
+            if memory_gb > memory_limit_gb:
+                return (f"Memory limit of {memory_limit_gb} GB"
+                    + f" exceeded ({memory_gb:.2f} GB)")
+        return None
+
+
+class ExecutionLimitExceeded(Exception):
+    """A killed execution, as recorded in crash logs."""
+    pass
+
+
+def register_limit_violation(task: list[str], description: str) -> None:
+    """Record a violation of execution limits as a crash of the request."""
+    address = pth.IdempotentFnExecutionResultAddr.from_strings(
+        prefix=task[0], hash_value=task[1], assert_readiness=False)
+    exc_value = ExecutionLimitExceeded(description)
+    crash_id = get_random_signature() + "_c_0"
+    address.crashes[crash_id] = add_execution_environment_summary(
+        exc_value=exc_value)
+    exception_id = (address.prefix + "_" + ExecutionLimitExceeded.__name__
+        + "_" + crash_id)
+    pth.crash_history[current_date_gmt_string(), exception_id] = (
+        add_execution_environment_summary(exc_value=exc_value))
@@ -0,0 +1,195 @@
+"""Heartbeats of sessions and background workers.
+
+Every Pythagoras session and every background worker periodically writes
+a heartbeat record into pth.compute_nodes.json, under the key
+[node_id, "heartbeats", heartbeat_id]. A record contains a timestamp,
+the current load of the node, and the list of tasks the process
+is working on (None if unknown).
+
+Execution attempts are tagged with the node_id and heartbeat_id
+of the process that made them. If the heartbeat of that process is older
+than HEARTBEAT_TIMEOUT, or if a fresh heartbeat does not list the task,
+the attempt is considered abandoned, and the request can be reclaimed
+immediately. Inside a worker's executor process, attempts of nested
+calls are reported through task_listener, so that the worker lists
+them in its heartbeats too.
+"""
+
+import os
+import socket
+import threading
+import time
+from typing import Callable
+
+import psutil
+
+from pythagoras._01_foundational_objects.hash_and_random_signatures import (
+    get_node_signature, get_random_signature)
+
+import pythagoras as pth
+
+
+HEARTBEAT_PERIOD = 5 # seconds
+HEARTBEAT_TIMEOUT = 30 # seconds
+
+current_heartbeat_id: str | None = None
+task_listener: Callable[[list[str]], None] | None = None
+
+
+def report_current_task(task: list[str]) -> None:
+    """Tell the supervising worker (if any) about a newly started task."""
+    if task_listener is not None:
+        task_listener(list(task))
+
+
+def build_heartbeat_record(role: str, current_tasks: list | None) -> dict:
+    cpu_count = psutil.cpu_count()
+    record = dict(
+        timestamp = time.time()
+        , role = role
+        , runtime_id = pth.runtime_id
+        , hostname = socket.gethostname()
+        , pid = os.getpid()
+        , cpu_load = psutil.getloadavg()[0] / cpu_count
+        , memory_load = psutil.virtual_memory().percent / 100
+        , current_tasks = current_tasks)
+    return record
+
+
+class HeartbeatWriter:
+    """Writes heartbeat records on behalf of a process."""
+    def __init__(self, role: str, heartbeat_id: str | None = None):
+        if heartbeat_id is None:
+            heartbeat_id = get_random_signature()
+        self.role = role
+        self.heartbeat_id = heartbeat_id
+        self.node_id = get_node_signature()
+        self.last_beat_time = None
+
+    @property
+    def key(self) -> list[str]:
+        return [self.node_id, "heartbeats", self.heartbeat_id]
+
+    def beat(self, current_tasks: list | None = None) -> None:
+        pth.compute_nodes.json[self.key] = build_heartbeat_record(
+            self.role, current_tasks)
+        self.last_beat_time = time.time()
+
+    def beat_if_due(self, current_tasks: list | None = None) -> None:
+        if (self.last_beat_time is None
+                or time.time() - self.last_beat_time > HEARTBEAT_PERIOD):
+            self.beat(current_tasks)
+
+    def remove(self) -> None:
+        try:
+            pth.compute_nodes.json.delete_if_exists(self.key)
+        except Exception:
+            pass
+
+
+class _SessionHeartbeats:
+    def __init__(self):
+        self.writer = HeartbeatWriter(role="session")
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.writer.beat()
+            except Exception:
+                return
+            self._stop.wait(HEARTBEAT_PERIOD)
+
+    def start(self):
+        self.writer.beat()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.writer.remove()
+
+
+_session_heartbeats: _SessionHeartbeats | None = None
+
+def start_session_heartbeats() -> None:
+    global _session_heartbeats, current_heartbeat_id
+    stop_session_heartbeats()
+    _session_heartbeats = _SessionHeartbeats()
+    _session_heartbeats.start()
+    current_heartbeat_id = _session_heartbeats.writer.heartbeat_id
+
+def stop_session_heartbeats() -> None:
+    global _session_heartbeats, current_heartbeat_id
+    if _session_heartbeats is not None:
+        _session_heartbeats.stop()
+        _session_heartbeats = None
+        current_heartbeat_id = None
+
+
+def get_current_heartbeat_tags() -> dict:
+    """Tags that link an execution attempt to the current process' heartbeat."""
+    return dict(
+        node_id = get_node_signature()
+        , heartbeat_id = current_heartbeat_id)
+
+
+def heartbeat_is_fresh(node_id: str, heartbeat_id: str) -> bool | None:
+    """Check if a heartbeat is younger than HEARTBEAT_TIMEOUT.
+
+    Returns None if there is no such heartbeat record.
+    """
+    key = [node_id, "heartbeats", heartbeat_id]
+    try:
+        timestamp = pth.compute_nodes.json.mtimestamp(key)
+    except Exception:
+        return None
+    return time.time() - timestamp <= HEARTBEAT_TIMEOUT
+
+
+def attempt_is_abandoned(
+        attempt: dict, attempt_timestamp: float, task: list[str]) -> bool:
+    """Check if the process that made an execution attempt is gone.
+
+    An attempt is abandoned if its process' heartbeat has expired,
+    or if a heartbeat, written after the attempt had started,
+    does not list the task among the tasks the process is working on.
+    Attempts without heartbeat information are never considered abandoned.
+    """
+    if not isinstance(attempt, dict):
+        return False
+    node_id = attempt.get("node_id")
+    heartbeat_id = attempt.get("heartbeat_id")
+    if node_id is None or heartbeat_id is None:
+        return False
+    key = [node_id, "heartbeats", heartbeat_id]
+    try:
+        heartbeat_timestamp = pth.compute_nodes.json.mtimestamp(key)
+        heartbeat = pth.compute_nodes.json[key]
+    except Exception:
+        return True
+    if time.time() - heartbeat_timestamp > HEARTBEAT_TIMEOUT:
+        return True
+    current_tasks = heartbeat.get("current_tasks")
+    if current_tasks is None:
+        return False
+    if list(task) in [list(t) for t in current_tasks]:
+        return False
+    return heartbeat_timestamp > attempt_timestamp
+
+
+def get_live_heartbeats() -> dict[str, list[dict]]:
+    """Fresh heartbeat records, grouped by node_id."""
+    result = dict()
+    for key in pth.compute_nodes.json:
+        if len(key) != 3 or key[1] != "heartbeats":
+            continue
+        if not heartbeat_is_fresh(key[0], key[2]):
+            continue
+        try:
+            record = pth.compute_nodes.json[key]
+        except Exception:
+            continue
+        result.setdefault(key[0], []).append(record)
+    return result
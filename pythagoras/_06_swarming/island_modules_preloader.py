@@ -0,0 +1,19 @@
+"""Preloading of island modules by a forkserver.
+
+The forkserver imports this module (see start_methods) before forking
+worker processes. Importing it imports all island modules, found in
+the base_dir that is named in the PYTHAGORAS_PRELOAD_BASE_DIR variable.
+"""
+
+import os
+
+from pythagoras._04_idempotent_functions.island_modules import (
+    preload_island_modules)
+from pythagoras._06_swarming.start_methods import PRELOAD_BASE_DIR_VARIABLE
+
+
+preloaded_island_modules: list[str] = []
+
+if os.environ.get(PRELOAD_BASE_DIR_VARIABLE):
+    preloaded_island_modules = preload_island_modules(
+        os.environ[PRELOAD_BASE_DIR_VARIABLE])
@@ -0,0 +1,98 @@
+"""Standalone background workers.
+
+Standalone workers do not belong to any interactive Pythagoras session.
+They can be started on any node that mounts the same base_dir,
+which allows swarming to scale past a single machine:
+
+    python -m pythagoras.worker --base-dir /shared/pth --processes 8
+
+Workers keep running till the main process receives SIGTERM (or SIGINT);
+then it asks each of them to finish its current task and exit.
+Worker processes ignore SIGINT, so that Ctrl-C, which is sent to
+the whole process group, does not interrupt tasks in progress.
+"""
+
+import os
+import signal
+import threading
+from copy import deepcopy
+
+from pythagoras._01_foundational_objects.hash_and_random_signatures import (
+    get_random_signature)
+from pythagoras._06_swarming.background_workers import (
+    launch_background_worker)
+from pythagoras._06_swarming.cpu_allocation import build_worker_cpu_policies
+from pythagoras._06_swarming.start_methods import get_worker_context
+from pythagoras._06_swarming.wakeup_signals import send_wakeup_signal
+
+import pythagoras as pth
+
+
+SUPERVISION_PERIOD = 5 # seconds
+
+
+def run_standalone_workers(base_dir: str
+        , n_processes: int = 1
+        , island_names: list[str] | None = None
+        , cloud_type: str = "local"
+        , pin_cpus: bool = False
+        , start_method: str = "spawn") -> None:
+    """Run standalone background workers till SIGTERM / SIGINT is received.
+
+    Workers that die unexpectedly are restarted.
+    If island_names is provided, the workers only execute functions
+    from these islands. If pin_cpus is True, workers are pinned
+    to disjoint sets of CPUs. start_method is either "spawn"
+    or "forkserver". Execution limits are enforced by every worker,
+    see background_worker().
+    """
+    n_processes = int(n_processes)
+    assert n_processes >= 1
+    if island_names is not None:
+        island_names = list(island_names)
+        assert len(island_names) >= 1
+        for island_name in island_names:
+            assert isinstance(island_name, str)
+
+    pth_init_params = dict(
+        base_dir = os.path.abspath(base_dir)
+        , cloud_type = cloud_type
+        , n_background_workers = 0
+        , runtime_id = get_random_signature())
+    pth.initialize(**pth_init_params, worker_start_method=start_method
+        , return_summary_dataframe=False)
+
+    ctx = get_worker_context()
+    stopping = threading.Event()
+
+    def stop_workers(*_):
+        stopping.set()
+
+    signal.signal(signal.SIGTERM, stop_workers)
+    signal.signal(signal.SIGINT, stop_workers)
+
+    cpu_policies = build_worker_cpu_policies(n_processes, pin_cpus)
+    workers = []
+    def start_worker(cpu_policy):
+        stop_event = ctx.Event()
+        p = launch_background_worker(
+            pth_init_params = deepcopy(pth_init_params)
+            , stop_event = stop_event
+            , island_names = island_names
+            , standalone = True
+            , cpu_policy = cpu_policy)
+        return p, stop_event
+
+    for cpu_policy in cpu_policies:
+        workers.append(start_worker(cpu_policy))
+
+    while not stopping.wait(SUPERVISION_PERIOD):
+        for i, (p, stop_event) in enumerate(workers):
+            if not p.is_alive():
+                workers[i] = start_worker(cpu_policies[i])
+
+    for p, stop_event in workers:
+        stop_event.set()
+    send_wakeup_signal()
+    for p, stop_event in workers:
+        p.join()
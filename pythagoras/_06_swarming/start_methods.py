@@ -0,0 +1,67 @@
+"""Start methods for background worker processes.
+
+By default, worker processes are started with the "spawn" method:
+every process pays for a fresh interpreter and for importing Pythagoras
+with all its heavy dependencies. With the "forkserver" method,
+a server process imports Pythagoras (plus any additionally requested
+modules) once, and new worker processes are forked from it,
+which makes them start in milliseconds. "spawn" remains the default,
+as it is the only method that is supported on every platform.
+The forkserver also preloads island modules (precompiled functions,
+see island_modules) that exist in base_dir when it starts.
+"""
+
+import multiprocessing
+import os
+
+import pythagoras as pth
+
+
+SUPPORTED_START_METHODS = ["spawn", "forkserver"]
+DEFAULT_PRELOADED_MODULES = ["pythagoras"]
+ISLAND_MODULES_PRELOADER = "pythagoras._06_swarming.island_modules_preloader"
+PRELOAD_BASE_DIR_VARIABLE = "PYTHAGORAS_PRELOAD_BASE_DIR"
+
+worker_start_method: str = "spawn"
+preloaded_modules: list[str] = list(DEFAULT_PRELOADED_MODULES)
+
+
+def set_worker_start_method(start_method: str = "spawn"
+        , preload_modules: list[str] | None = None) -> None:
+    """Choose how worker processes are started in the current process.
+
+    preload_modules lists modules (in addition to pythagoras) that the
+    forkserver imports once, before forking worker processes.
+    """
+    global worker_start_method, preloaded_modules
+    assert start_method in SUPPORTED_START_METHODS
+    assert start_method in multiprocessing.get_all_start_methods(), (
+        f"Start method {start_method} is not supported on this platform")
+    worker_start_method = start_method
+    preloaded_modules = list(DEFAULT_PRELOADED_MODULES)
+    for module_name in (preload_modules or []):
+        assert isinstance(module_name, str)
+        if module_name not in preloaded_modules:
+            preloaded_modules.append(module_name)
+
+
+def get_worker_context():
+    """Multiprocessing context for starting worker processes.
+
+    base_dir is passed to the forkserver through an environment variable,
+    so that the forkserver can preload island modules from it.
+    """
+    ctx = multiprocessing.get_context(worker_start_method)
+    if worker_start_method == "forkserver":
+        if pth.base_dir is not None:
+            os.environ[PRELOAD_BASE_DIR_VARIABLE] = pth.base_dir
+        ctx.set_forkserver_preload(
+            preloaded_modules + [ISLAND_MODULES_PRELOADER])
+    return ctx
+
+
+def get_worker_start_settings() -> dict:
+    """Settings to pass to worker processes, so that they start
+    their own subprocesses the same way."""
+    return dict(start_method = worker_start_method
+        , preload_modules = preloaded_modules[len(DEFAULT_PRELOADED_MODULES):])
@@ -0,0 +1,80 @@
+"""Detection of straggling executions.
+
+Pythagoras guarantees "at least once" execution, so a slow request
+can safely be executed again. Background workers record durations
+of successful executions per function (per address prefix)
+in pth.compute_nodes, each duration in a separate record, so that
+workers never overwrite each other's records, and executions
+themselves do not touch the records.
+An execution is straggling if its latest attempt is still alive
+(according to heartbeats), but it has been running for more than
+STRAGGLER_FACTOR times the median duration of the function.
+Idle workers start speculative copies of straggling executions;
+the first result to be saved wins. Speculative attempts do not count
+towards MAX_EXECUTION_ATTEMPTS of a request, but a request can have
+at most one live speculative attempt at a time, and at most
+MAX_SPECULATIVE_ATTEMPTS of them in total.
+"""
+
+import time
+
+from pythagoras._01_foundational_objects.hash_and_random_signatures import (
+    get_random_signature)
+
+import pythagoras as pth
+
+
+DURATION_HISTORY_SIZE = 50
+STRAGGLER_FACTOR = 3.0
+MIN_STRAGGLER_AGE = 30 # seconds
+MEDIAN_CACHE_PERIOD = 10 # seconds
+MAX_SPECULATIVE_ATTEMPTS = 2
+
+
+def register_execution_duration(prefix: str, duration: float) -> None:
+    """Add a duration of a successful execution to the function's history.
+
+    Record names start with a timestamp, so they are sorted by age.
+    """
+    record_id = f"{int(time.time()*1000):015d}_{get_random_signature()}"
+    pth.compute_nodes.json[
+        ["execution_durations", prefix, record_id]] = duration
+
+
+_median_cache: dict[tuple, tuple[float, float | None]] = dict()
+
+def get_median_execution_duration(prefix: str) -> float | None:
+    """Median duration of recent successful executions of a function.
+
+    Only the latest DURATION_HISTORY_SIZE records are used,
+    older records are deleted.
+    """
+    cache_key = (pth.base_dir, prefix)
+    if cache_key in _median_cache:
+        cache_time, median = _median_cache[cache_key]
+        if time.time() - cache_time < MEDIAN_CACHE_PERIOD:
+            return median
+    durations = []
+    history = pth.compute_nodes.json.get_subdict(
+        ["execution_durations", prefix])
+    record_ids = sorted(history.keys(), key=lambda k: k[0])
+    for record_id in record_ids[:-DURATION_HISTORY_SIZE]:
+        history.delete_if_exists(record_id)
+    for record_id in record_ids[-DURATION_HISTORY_SIZE:]:
+        try:
+            durations.append(history[record_id])
+        except KeyError:
+            continue # deleted by another process
+    durations.sort()
+    median = durations[len(durations)//2] if len(durations) else None
+    _median_cache[cache_key] = (time.time(), median)
+    return median
+
+
+def execution_is_straggling(
+        attempt_age: float, median_duration: float | None) -> bool:
+    """Check if an attempt has been running for much longer than usual."""
+    if median_duration is None:
+        return False
+    threshold = max(STRAGGLER_FACTOR * median_duration, MIN_STRAGGLER_AGE)
+    return attempt_age > threshold
@@ -0,0 +1,149 @@
+"""Idle backoff and wakeup signals for background workers.
+
+An idle background worker does not poll the execution queue at a constant
+rate. Instead, it waits with an exponentially growing delay between
+consecutive scans of the queue. While waiting, it listens on a local
+(Unix domain) datagram socket, so that swarm() calls made on the same node
+can wake it up immediately.
+
+Sockets are created in a node-local temporary directory, which is
+derived from Pythagoras' base_dir. If Unix domain sockets are not supported
+by the platform, workers simply sleep through the backoff period.
+"""
+
+import os
+import socket
+import tempfile
+import time
+
+from pythagoras._01_foundational_objects.hash_and_random_signatures import (
+    get_hash_signature, get_random_signature)
+
+import pythagoras as pth
+
+
+class IdleBackoff:
+    """Exponential backoff for a worker that finds no work to do.
+
+    The first delay is min_delay; each subsequent delay is multiplied
+    by factor, till it reaches max_delay. reset() should be called
+    as soon as the worker picks up a task.
+    """
+    def __init__(self
+                 , min_delay: float = 0.05
+                 , max_delay: float = 8.0
+                 , factor: float = 2.0):
+        assert 0 < min_delay <= max_delay
+        assert factor >= 1
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.current_delay = min_delay
+
+    def reset(self) -> None:
+        self.current_delay = self.min_delay
+
+    def next_delay(self) -> float:
+        """Return the next waiting period (in seconds), with some jitter."""
+        delay = self.current_delay
+        self.current_delay = min(self.current_delay * self.factor
+                                 , self.max_delay)
+        if pth.entropy_infuser is not None:
+            delay *= pth.entropy_infuser.uniform(0.9, 1.1)
+        return delay
+
+
+def get_wakeup_signals_dir() -> str:
+    """Node-local directory that contains sockets of idle workers."""
+    dir_suffix = get_hash_signature(pth.base_dir)[:12]
+    return os.path.join(tempfile.gettempdir(), "pth_wakeup_" + dir_suffix)
+
+
+def send_wakeup_signal() -> int:
+    """Wake up all idle background workers on the current node.
+
+    Returns the number of workers that have been notified.
+    Sockets of workers that are no longer alive are removed.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return 0
+    signals_dir = get_wakeup_signals_dir()
+    try:
+        socket_names = os.listdir(signals_dir)
+    except OSError:
+        return 0
+    n_notified = 0
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sender:
+        sender.setblocking(False)
+        for socket_name in socket_names:
+            socket_path = os.path.join(signals_dir, socket_name)
+            try:
+                sender.sendto(b"1", socket_path)
+                n_notified += 1
+            except BlockingIOError:
+                n_notified += 1 # the worker has already been notified
+            except (ConnectionRefusedError, FileNotFoundError):
+                try:
+                    os.remove(socket_path)
+                except OSError:
+                    pass
+            except OSError:
+                pass
+    return n_notified
+
+
+class WakeupSignalReceiver:
+    """A socket an idle worker listens on while waiting for new work."""
+    def __init__(self):
+        self.socket = None
+        self.socket_path = None
+        if not hasattr(socket, "AF_UNIX"):
+            return
+        signals_dir = get_wakeup_signals_dir()
+        socket_path = os.path.join(signals_dir, get_random_signature())
+        try:
+            os.makedirs(signals_dir, exist_ok=True)
+            receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            receiver.bind(socket_path)
+        except OSError:
+            return
+        self.socket = receiver
+        self.socket_path = socket_path
+
+    def wait(self, timeout: float) -> bool:
+        """Wait till a wakeup signal arrives or timeout (seconds) expires.
+
+        Returns True if the worker was woken up by a signal.
+        """
+        if self.socket is None:
+            time.sleep(timeout)
+            return False
+        self.socket.settimeout(timeout)
+        try:
+            self.socket.recv(16)
+        except (socket.timeout, OSError):
+            return False
+        self.socket.setblocking(False)
+        try:
+            while True:
+                self.socket.recv(16)
+        except OSError:
+            pass
+        return True
+
+    def close(self) -> None:
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+        if self.socket_path is not None:
+            try:
+                os.remove(self.socket_path)
+            except OSError:
+                pass
+            self.socket_path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
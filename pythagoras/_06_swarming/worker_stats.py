@@ -0,0 +1,66 @@
+import time
+
+
+class WorkerStats:
+    """Runtime metrics of a background worker.
+
+    Pickup latency is the time between the moment an execution request
+    was created and the moment a worker started executing it.
+    Idle IOPS is the number of execution queue scans per second,
+    performed by the worker while there was no work to do.
+    """
+    def __init__(self):
+        self.start_time = time.time()
+        self.n_tasks = 0
+        self.n_idle_scans = 0
+        self.n_wakeups = 0
+        self.idle_time = 0.0
+        self.pickup_latencies = []
+        self.task_durations = []
+
+    def register_task(self
+            , pickup_latency: float | None
+            , duration: float | None = None) -> None:
+        self.n_tasks += 1
+        if pickup_latency is not None:
+            self.pickup_latencies.append(pickup_latency)
+            self.pickup_latencies = self.pickup_latencies[-1000:]
+        if duration is not None:
+            self.task_durations.append(duration)
+            self.task_durations = self.task_durations[-1000:]
+
+    def register_idle_period(self, duration: float, woken_up: bool) -> None:
+        self.n_idle_scans += 1
+        self.idle_time += duration
+        if woken_up:
+            self.n_wakeups += 1
+
+    @property
+    def median_task_duration(self) -> float | None:
+        durations = sorted(self.task_durations[-100:])
+        if not len(durations):
+            return None
+        return durations[len(durations)//2]
+
+    @property
+    def idle_iops(self) -> float:
+        if self.idle_time <= 0:
+            return 0.0
+        return self.n_idle_scans / self.idle_time
+
+    def as_dict(self) -> dict:
+        latencies = sorted(self.pickup_latencies)
+        result = dict(
+            uptime = time.time() - self.start_time
+            , n_tasks = self.n_tasks
+            , n_idle_scans = self.n_idle_scans
+            , n_wakeups = self.n_wakeups
+            , idle_time = self.idle_time
+            , idle_iops = self.idle_iops
+            , median_pickup_latency = None
+            , max_pickup_latency = None
+            , median_task_duration = self.median_task_duration)
+        if len(latencies):
+            result["median_pickup_latency"] = latencies[len(latencies)//2]
+            result["max_pickup_latency"] = latencies[-1]
+        return result
@@ -6,12 +6,24 @@ from persidict import FileDirDict, PersiDict
 from pythagoras._01_foundational_objects.hash_and_random_signatures import (
     get_node_signature, get_random_signature)
 from pythagoras._01_foundational_objects.multipersidict import MultiPersiDict
+from pythagoras._02_ordinary_functions.code_normalizer_implementation import (
+    set_normalization_mode, NORMALIZATION_MODE_KEY)
+from pythagoras._04_idempotent_functions.idempotent_func_address_context import (
+    IdempotentFnExecutionContext, clear_deserialized_functions)
 from pythagoras._05_events_and_exceptions.execution_environment_summary import (
     build_execution_environment_summary)
 from pythagoras._05_events_and_exceptions.uncaught_exception_handlers import (
     register_exception_handlers, unregister_exception_handlers, pth_excepthook)
 from pythagoras._05_events_and_exceptions.notebook_checker import (
     is_executed_in_notebook)
+from pythagoras._06_swarming.autoscaler import (
+    start_autoscaler, stop_autoscaler)
+from pythagoras._06_swarming.background_workers import (
+    forget_worker_process_settings)
+from pythagoras._06_swarming.cpu_allocation import build_worker_cpu_policies
+from pythagoras._06_swarming.start_methods import set_worker_start_method
+from pythagoras._06_swarming.heartbeats import (
+    start_session_heartbeats, stop_session_heartbeats)
 from pythagoras._07_mission_control.summary import summary
 
 import pythagoras as pth
@@ -26,8 +38,46 @@ def initialize(base_dir:str
                , cloud_type:str = "local"
                , default_island_name:str = "Samos"
                , runtime_id: str|None = None
-               , return_summary_dataframe:bool = True):
+               , return_summary_dataframe:bool = True
+               , max_background_workers:int|None = None
+               , pin_background_workers:bool = False
+               , worker_start_method:str|None = None
+               , preload_modules:list[str]|None = None
+               , persistent_source_cache:bool = True
+               , persistent_function_registry:bool = True
+               , source_normalization:str|None = None):
     """ Initialize Pythagoras.
+
+    If max_background_workers is greater than n_background_workers,
+    the pool of background workers is autoscaled between
+    n_background_workers and max_background_workers.
+
+    Thread pools of numerical libraries in background workers are limited
+    to each worker's share of the node's CPUs. If pin_background_workers
+    is True, workers are also pinned to disjoint sets of CPUs.
+
+    worker_start_method is either "spawn" (default) or "forkserver".
+    With "forkserver", Pythagoras and preload_modules are imported once
+    by a server process, and worker processes are forked from it.
+    If worker_start_method is None, the start method that is already
+    set (e.g. by the parent of a background worker) is kept.
+
+    If persistent_source_cache is True, normalized sources of functions
+    are cached under base_dir and shared across sessions and workers.
+
+    If persistent_function_registry is True, results of checks
+    and analysis of functions are recorded under base_dir, so that
+    other sessions and workers do not repeat them (until Pythagoras
+    or its names analyzer is upgraded).
+
+    source_normalization is "compatible" (autopep8-based, preserves
+    existing addresses), "ast" (faster), or "alpha" (like "ast", plus
+    canonical names of local variables and sorted in-body imports,
+    so that cosmetic edits do not change addresses). The mode is recorded
+    in base_dir: all processes, working with the same base_dir, must use
+    the same mode. If source_normalization is None, the recorded mode
+    is used ("compatible" for new base_dirs); an explicit mode that
+    differs from the recorded one is an error.
     """
     assert pth.is_fully_unitialized(), (
         "You can only initialize pythagoras once.")
@@ -43,29 +93,58 @@ def initialize(base_dir:str
 
     n_background_workers = int(n_background_workers)
     assert n_background_workers >= 0
-    pth.n_background_workers = n_background_workers
 
-    pth.entropy_infuser = random.Random()
+    if max_background_workers is None:
+        max_background_workers = n_background_workers
+    max_background_workers = int(max_background_workers)
+    assert max_background_workers >= n_background_workers
 
     assert not os.path.isfile(base_dir)
     if not os.path.isdir(base_dir):
         os.mkdir(base_dir)
     assert os.path.isdir(base_dir)
 
-    pth.base_dir = os.path.abspath(base_dir)
-
-    value_store_dir = os.path.join(base_dir, "value_store")
-    pth.value_store = dict_type(
-        value_store_dir, digest_len=0, immutable_items=True)
-
     compute_nodes_dir = os.path.join(base_dir, "compute_nodes")
-    pth.compute_nodes = MultiPersiDict(
+    compute_nodes = MultiPersiDict(
         dict_type = dict_type
         , dir_name = compute_nodes_dir
         , pkl = dict(digest_len=0, immutable_items=False)
         , json = dict(digest_len=0, immutable_items=False)
         )
 
+    # checked before any global state is changed,
+    # so that a rejected call leaves Pythagoras uninitialized
+    recorded_normalization = compute_nodes.json.get(
+        NORMALIZATION_MODE_KEY, None)
+    if source_normalization is None:
+        source_normalization = recorded_normalization or "compatible"
+    assert recorded_normalization in {None, source_normalization}, (
+        f"base_dir {base_dir} uses source_normalization="
+        + f"'{recorded_normalization}', it can not be changed to"
+        + f" '{source_normalization}': all processes, working with"
+        + f" the same base_dir, must use the same mode.")
+
+    assert worker_start_method is not None or preload_modules is None, (
+        "preload_modules require worker_start_method")
+
+    if worker_start_method is not None:
+        set_worker_start_method(worker_start_method, preload_modules)
+    set_normalization_mode(source_normalization)
+    if recorded_normalization is None:
+        compute_nodes.json[NORMALIZATION_MODE_KEY] = source_normalization
+
+    pth.n_background_workers = n_background_workers
+
+    pth.entropy_infuser = random.Random()
+
+    pth.base_dir = os.path.abspath(base_dir)
+
+    value_store_dir = os.path.join(base_dir, "value_store")
+    pth.value_store = dict_type(
+        value_store_dir, digest_len=0, immutable_items=True)
+
+    pth.compute_nodes = compute_nodes
+
     if runtime_id is None:
         node_id = get_node_signature()
         runtime_id = get_random_signature()
@@ -74,6 +153,7 @@ def initialize(base_dir:str
         atexit.register(clean_runtime_id)
         summary = build_execution_environment_summary()
         pth.compute_nodes.json[node_id, "execution_environment"] = summary
+        start_session_heartbeats()
     else:
         pth.runtime_id = runtime_id
 
@@ -118,6 +198,24 @@ def initialize(base_dir:str
         execution_requests_dir, digest_len=0
         , immutable_items=False)
 
+    dead_letter_queue_dir = os.path.join(
+        base_dir, "dead_letter_queue")
+    pth.dead_letter_queue = dict_type(
+        dead_letter_queue_dir, digest_len=0
+        , file_type="json", immutable_items=False)
+
+    if persistent_source_cache:
+        source_cache_dir = os.path.join(base_dir, "source_cache")
+        pth.source_cache = dict_type(
+            source_cache_dir, digest_len=0
+            , file_type="json", immutable_items=True)
+
+    if persistent_function_registry:
+        function_registry_dir = os.path.join(base_dir, "function_registry")
+        pth.function_registry = dict_type(
+            function_registry_dir, digest_len=0
+            , file_type="json", immutable_items=False)
+
     pth.default_island_name = default_island_name
     pth.all_autonomous_functions = dict()
     pth.all_autonomous_functions[default_island_name] = dict()
@@ -126,14 +224,22 @@ def initialize(base_dir:str
         ,cloud_type=cloud_type
         ,n_background_workers=n_background_workers
         ,default_island_name=default_island_name
-        , runtime_id=pth.runtime_id)
+        , runtime_id=pth.runtime_id
+        , persistent_source_cache=persistent_source_cache
+        , persistent_function_registry=persistent_function_registry)
 
     pth.initialization_parameters = parameters
 
     register_exception_handlers()
 
-    for n in range(n_background_workers):
-        pth.launch_background_worker()
+    if max_background_workers > n_background_workers:
+        start_autoscaler(n_background_workers, max_background_workers
+            , pin_workers = pin_background_workers)
+    elif n_background_workers > 0:
+        cpu_policies = build_worker_cpu_policies(
+            n_background_workers, pin_background_workers)
+        for cpu_policy in cpu_policies:
+            pth.launch_background_worker(cpu_policy=cpu_policy)
 
     if return_summary_dataframe:
         return PythagorasContextWithSummary()
@@ -147,6 +253,9 @@ def is_fully_unitialized():
     result &= pth.value_store is None
     result &= pth.execution_results is None
     result &= pth.execution_requests is None
+    result &= pth.dead_letter_queue is None
+    result &= pth.source_cache is None
+    result &= pth.function_registry is None
     result &= pth.run_history is None
     result &= pth.crash_history is None
     result &= pth.event_log is None
@@ -169,6 +278,14 @@ def is_correctly_initialized():
         return False
     if not isinstance(pth.execution_requests, PersiDict):
         return False
+    if not isinstance(pth.dead_letter_queue, PersiDict):
+        return False
+    if not (pth.source_cache is None
+            or isinstance(pth.source_cache, PersiDict)):
+        return False
+    if not (pth.function_registry is None
+            or isinstance(pth.function_registry, PersiDict)):
+        return False
     if not isinstance(pth.crash_history, PersiDict):
         return False
     if not isinstance(pth.event_log, PersiDict):
@@ -226,10 +343,15 @@ def clean_runtime_id():
         pass
 
 def _clean_global_state():
+    stop_autoscaler()
+    stop_session_heartbeats()
     clean_runtime_id()
     pth.value_store = None
     pth.execution_results = None
     pth.execution_requests = None
+    pth.dead_letter_queue = None
+    pth.source_cache = None
+    pth.function_registry = None
     pth.run_history = None
     pth.crash_history = None
     pth.event_log = None
@@ -240,6 +362,11 @@ def _clean_global_state():
     pth.entropy_infuser = None
     pth.n_background_workers = None
     pth.runtime_id = None
+    clear_deserialized_functions()
+    forget_worker_process_settings()
+    set_worker_start_method()
+    IdempotentFnExecutionContext.release_claimed_execution_attempts()
+    set_normalization_mode()
     unregister_exception_handlers()
     assert pth.is_fully_unitialized()
     assert pth.is_global_state_correct()
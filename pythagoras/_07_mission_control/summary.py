@@ -1,8 +1,11 @@
 import pythagoras as pth
 import pandas as pd
 
+from pythagoras._02_ordinary_functions.normalized_source_cache import (
+    get_normalized_source_cache_stats)
 from pythagoras._05_events_and_exceptions.current_date_gmt_str import \
     current_date_gmt_string
+from pythagoras._06_swarming.heartbeats import get_live_heartbeats
 
 
 def persistent(param, val) -> pd.DataFrame:
@@ -50,7 +53,14 @@ def summary(print_result:bool = False):
     all_params.append(persistent(
         "Execution queue size", len(pth.execution_requests)))
     all_params.append(persistent(
-        "# of currently active nodes", len(pth.compute_nodes.pkl)))
+        "Dead-letter queue size", len(pth.dead_letter_queue)))
+    live_heartbeats = get_live_heartbeats()
+    all_params.append(persistent(
+        "# of currently active nodes", len(live_heartbeats)))
+    n_live_workers = sum(1 for records in live_heartbeats.values()
+        for r in records if r.get("role") == "worker")
+    all_params.append(persistent(
+        "# of currently active background workers", n_live_workers))
 
     all_params.append(runtime(
         "# of background workers on the current node"
@@ -63,6 +73,11 @@ def summary(print_result:bool = False):
     all_params.append(runtime(
         "All available islands"
         , ", ".join(list(pth.all_autonomous_functions))))
+    cache_stats = get_normalized_source_cache_stats()
+    all_params.append(runtime(
+        "Normalized source cache hit rate"
+        , f"{cache_stats['hit_rate']:.1%} of {cache_stats['n_lookups']}"
+            + " lookups"))
     for island_name, island in pth.all_autonomous_functions.items():
         n_functions = len(island)
         all_params.append(runtime(
@@ -24,6 +24,9 @@ base_dir:Optional[str] = None
 value_store:Optional[PersiDict] = None
 execution_results:Optional[PersiDict] = None
 execution_requests:Optional[PersiDict] = None
+dead_letter_queue:Optional[PersiDict] = None
+source_cache:Optional[PersiDict] = None
+function_registry:Optional[PersiDict] = None
 
 crash_history: Optional[PersiDict] = None
 event_log: Optional[PersiDict] = None
@@ -0,0 +1,35 @@
+"""Command line entry point for the coordinator.
+
+Usage:
+
+    python -m pythagoras.coordinator --base-dir DIR [--address ADDRESS]
+        [--advertise-address HOST[:PORT]]
+
+ADDRESS is either HOST:PORT (TCP) or a path to a Unix socket.
+By default, a node-local Unix socket is used.
+The advertised address is published for other nodes; by default,
+it is the routable address of the host if ADDRESS is 0.0.0.0:PORT.
+"""
+
+import argparse
+
+from pythagoras._06_swarming.coordinator import run_coordinator
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog = "python -m pythagoras.coordinator"
+        , description = "Run a Pythagoras coordinator.")
+    parser.add_argument("--base-dir", required=True
+        , help="Pythagoras base directory, shared with other nodes.")
+    parser.add_argument("--address", default=None
+        , help="HOST:PORT to listen on, or a path to a Unix socket.")
+    parser.add_argument("--advertise-address", default=None
+        , help="HOST[:PORT], under which other nodes reach the coordinator.")
+    args = parser.parse_args(argv)
+    run_coordinator(base_dir = args.base_dir, address = args.address
+        , advertise_address = args.advertise_address)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Command line entry point for standalone background workers.
+
+Usage:
+
+    python -m pythagoras.worker --base-dir DIR [--processes N]
+        [--island ISLAND_NAME ...] [--pin-cpus]
+        [--start-method {spawn,forkserver}]
+"""
+
+import argparse
+
+from pythagoras._06_swarming.standalone_workers import run_standalone_workers
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog = "python -m pythagoras.worker"
+        , description = "Run standalone Pythagoras background workers.")
+    parser.add_argument("--base-dir", required=True
+        , help="Pythagoras base directory, shared with other nodes.")
+    parser.add_argument("--processes", type=int, default=1
+        , help="Number of worker processes to run on this node.")
+    parser.add_argument("--island", action="append", dest="island_names"
+        , help="Only execute functions from this island"
+               " (can be repeated).")
+    parser.add_argument("--pin-cpus", action="store_true"
+        , help="Pin worker processes to disjoint sets of CPUs.")
+    parser.add_argument("--start-method", default="spawn"
+        , choices=["spawn", "forkserver"]
+        , help="How worker processes are started.")
+    args = parser.parse_args(argv)
+    run_standalone_workers(base_dir = args.base_dir
+        , n_processes = args.processes
+        , island_names = args.island_names
+        , pin_cpus = args.pin_cpus
+        , start_method = args.start_method)
+
+
+if __name__ == "__main__":
+    main()